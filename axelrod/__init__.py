@@ -5,7 +5,9 @@ from .actions import Actions
 from .random_ import random_choice
 from .plot import Plot
 from .game import DefaultGame, Game
-from .player import is_basic, obey_axelrod, update_histories, Player
+from .player import (
+    is_basic, obey_axelrod, update_histories, Player, strategy_caller,
+    call_strategy)
 from .mock_player import MockPlayer, simulate_play
 from .round_robin import RoundRobin
 from .strategies import *
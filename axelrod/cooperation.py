@@ -1,6 +1,8 @@
 from math import sqrt
+import numpy
 from . import eigen
 from axelrod import Actions
+from .payoff import _ordered_sum
 
 C, D = Actions.C, Actions.D
 
@@ -118,7 +120,7 @@ def cooperation(results):
         and column (j) represents an individual player and the the value Cij
         is the number of times player i cooperated against opponent j.
     """
-    return[[sum(element) for element in row] for row in results]
+    return cooperation_array(numpy.asarray(results)).tolist()
 
 
 def normalised_cooperation(cooperation, turns, repetitions):
@@ -143,10 +145,8 @@ def normalised_cooperation(cooperation, turns, repetitions):
 
         where t is the total number of turns played in the tournament.
     """
-    turns = turns * repetitions
-    return[
-        [1.0 * element / turns for element in row]
-        for row in cooperation]
+    return normalised_cooperation_array(
+        numpy.asarray(cooperation), turns, repetitions).tolist()
 
 
 def vengeful_cooperation(cooperation):
@@ -165,7 +165,7 @@ def vengeful_cooperation(cooperation):
 
             Dij = 2(Cij -0.5)
     """
-    return [[2 * (element - 0.5) for element in row] for row in cooperation]
+    return vengeful_cooperation_array(numpy.asarray(cooperation)).tolist()
 
 
 def cooperating_rating(cooperation, nplayers, turns, repetitions):
@@ -188,8 +188,8 @@ def cooperating_rating(cooperation, nplayers, turns, repetitions):
     list
         a list of cooperation rates ordered by player index
     """
-    total_turns = turns * repetitions * nplayers
-    return [1.0 * sum(row) / total_turns for row in cooperation]
+    return cooperating_rating_array(
+        numpy.asarray(cooperation), nplayers, turns, repetitions).tolist()
 
 
 def null_matrix(nplayers):
@@ -249,13 +249,7 @@ def good_partner_matrix(results, nplayers, repetitions):
         is the sum of the number of repetitions where player i cooperated as
         often or more than opponent j.
     """
-    matrix = null_matrix(nplayers)
-    for r in range(repetitions):
-        for i in range(nplayers):
-            for j in range(nplayers):
-                if i != j and results[i][j][r] >= results[j][i][r]:
-                    matrix[i][j] += 1
-    return matrix
+    return good_partner_matrix_array(numpy.asarray(results)).tolist()
 
 
 def n_interactions(nplayers, repetitions):
@@ -295,8 +289,8 @@ def good_partner_rating(good_partner_matrix, nplayers, repetitions):
     list
         A list of good partner ratings ordered by player index.
     """
-    return [1.0 * sum(row) / n_interactions(nplayers, repetitions)
-            for row in good_partner_matrix]
+    return good_partner_rating_array(
+        numpy.asarray(good_partner_matrix), nplayers, repetitions).tolist()
 
 
 def eigenvector(cooperation_matrix):
@@ -317,3 +311,78 @@ def eigenvector(cooperation_matrix):
         cooperation_matrix, 1000, 1e-3
     )
     return eigenvector.tolist()
+
+
+def eigenvectors(cooperation_matrices, initial=None):
+    """
+    The principal eigenvectors of several cooperation matrices, computed
+    together
+
+    Parameters
+    ----------
+    cooperation_matrices : list
+        A list of cooperation matrices (for instance one per repetition)
+    initial : list, None
+        A starting point for each eigenvector, such as the eigenvector of the
+        cooperation matrix over all repetitions
+
+    Returns
+    -------
+    list
+        The principal eigenvector of each cooperation matrix.
+    """
+    return eigenvectors_array(
+        numpy.asarray(cooperation_matrices), initial).tolist()
+
+
+# The functions below compute the same values as those above, but take and
+# return numpy arrays: results is a (n, n, repetitions) array indexed by
+# player, opponent and repetition (as ResultSet.result_arrays holds) and
+# cooperation a (n, n) array.
+
+
+def cooperation_array(results):
+    """The (n, n) total cooperation array (see cooperation)."""
+    return _ordered_sum(results, 2)
+
+
+def normalised_cooperation_array(cooperation, turns, repetitions):
+    """The per-turn normalised cooperation array (see
+    normalised_cooperation)."""
+    return cooperation / float(turns * repetitions)
+
+
+def vengeful_cooperation_array(cooperation):
+    """The vengeful cooperation array (see vengeful_cooperation)."""
+    return 2 * (cooperation - 0.5)
+
+
+def cooperating_rating_array(cooperation, nplayers, turns, repetitions):
+    """The cooperation rating of each player (see cooperating_rating)."""
+    total_turns = turns * repetitions * nplayers
+    return _ordered_sum(cooperation, 1) / float(total_turns)
+
+
+def good_partner_matrix_array(results):
+    """The (n, n) good partner array (see good_partner_matrix)."""
+    matched = results >= results.transpose(1, 0, 2)
+    matrix = matched.sum(axis=2)
+    numpy.fill_diagonal(matrix, 0)
+    return matrix
+
+
+def good_partner_rating_array(good_partner_matrix, nplayers, repetitions):
+    """The good partner rating of each player (see good_partner_rating)."""
+    return (_ordered_sum(good_partner_matrix, 1) /
+            float(n_interactions(nplayers, repetitions)))
+
+
+def eigenvectors_array(cooperation_matrices, initial=None):
+    """The (k, n) array of principal eigenvectors of a (k, n, n) array of
+    cooperation matrices (see eigenvectors)."""
+    if initial is not None:
+        initial = numpy.broadcast_to(
+            initial, cooperation_matrices.shape[:2])
+    vectors, eigenvalues = eigen.principal_eigenvectors(
+        cooperation_matrices, 1000, 1e-3, initial)
+    return vectors
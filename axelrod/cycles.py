@@ -0,0 +1,210 @@
+"""
+Playing matches between finite memory deterministic strategies.
+
+If neither player is stochastic and both have a finite memory depth, each
+player's next move depends only on the last few joint moves and on its own
+attributes. As soon as this joint state repeats, the play in between repeats
+for the rest of the match, so the remaining moves are written into the
+histories directly instead of being played.
+
+Not every classifier is accurate (GoByMajority(0) declares a memory depth of
+0 but counts the whole history), so each configuration of a strategy is also
+checked against scripted opponents before its matches are shortened, and a
+cycle is only repeated once one more period of it has been played.
+
+Players which draw random numbers, even if their moves do not depend on them
+(as WinStayLoseShift), are left out: the turns which are not played would
+not draw them, changing the rest of a seeded tournament.
+"""
+
+import random
+
+from axelrod import Actions
+from .player import Player, update_histories
+
+C, D = Actions.C, Actions.D
+
+# Probabilities of defection of the scripted opponents used to check that
+# the memory depth of a strategy is respected.
+_SCRIPT_DEFECTION_PROBABILITIES = (0, 0.2, 0.5, 0.8, 1)
+_SCRIPT_TURNS = 60
+
+# Whether each configuration (class and init args) of a strategy respects its
+# memory depth, as found by _respects_memory_depth.
+_checked = {}
+
+# Attributes of every player which do not influence its next move beyond
+# what the recent moves already say.
+_PLAYER_ATTRIBUTES = frozenset([
+    'history', 'cooperations', 'defections', 'classifier', 'init_args',
+    'tournament_attributes', 'name'])
+
+
+def hashable(value):
+    """A hashable equivalent of a value (lists become tuples and
+    dictionaries tuples of their items), or raises TypeError."""
+    if isinstance(value, (list, tuple)):
+        return tuple(hashable(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted(
+            (key, hashable(item)) for key, item in value.items()))
+    hash(value)
+    return value
+
+
+def finite_memory(player):
+    """Whether a player is deterministic with a finite memory depth, so that
+    its matches can be played with play_with_cycles."""
+    classifier = player.classifier
+    if (classifier['stochastic'] or
+            not 0 <= classifier['memory_depth'] < float('inf') or
+            classifier['inspects_source'] or
+            classifier['manipulates_source'] or
+            classifier['manipulates_state']):
+        return False
+    try:
+        key = (player.__class__, hashable(player.init_args),
+               classifier['memory_depth'])
+    except TypeError:
+        return False
+    if key not in _checked:
+        # Probing calls the strategy: the random state is restored so that
+        # seeded tournaments are repeatable, and players which drew random
+        # numbers are rejected.
+        state = random.getstate()
+        try:
+            _checked[key] = (_respects_memory_depth(player) and
+                             random.getstate() == state)
+        finally:
+            random.setstate(state)
+    return _checked[key]
+
+
+def _respects_memory_depth(player):
+    """
+    Plays a clone of the player against scripted opponents and checks that
+    whenever the last memory_depth joint moves and the player's attributes
+    are the same, so is its next move.
+    """
+    memory = int(player.classifier['memory_depth'])
+    moves = {}
+    for script in opponent_scripts(memory):
+        clone, opponent = player.clone(), Player()
+        attributes = _AttributeState(clone)
+        for opponent_move in script:
+            try:
+                state = (clone.history.tail_bytes(memory),
+                         opponent.history.tail_bytes(memory), attributes())
+            except TypeError:
+                return False
+            move = clone.strategy(opponent)
+            if moves.setdefault(state, move) != move:
+                return False
+            update_histories(clone, opponent, move, opponent_move)
+    return True
+
+
+def opponent_scripts(memory):
+    """The moves of the scripted opponents against which strategies with
+    the given memory depth are checked: always the same, from cooperating
+    throughout to defecting throughout."""
+    generator = random.Random(0)
+    return [[D if generator.random() < probability else C
+             for turn in range(_SCRIPT_TURNS + 2 * memory)]
+            for probability in _SCRIPT_DEFECTION_PROBABILITIES]
+
+
+def attribute_state(player):
+    """A hashable state of the attributes of a player which could influence
+    its moves (see finite_memory), or raises TypeError."""
+    return _AttributeState(player)()
+
+
+class _AttributeState(object):
+    """The attributes of a player which could influence its moves."""
+
+    def __init__(self, player):
+        self._attributes = vars(player)
+        self._size = None
+
+    def __call__(self):
+        attributes = self._attributes
+        if len(attributes) != self._size:
+            self._size = len(attributes)
+            self._names = sorted(
+                name for name in attributes if name not in _PLAYER_ATTRIBUTES)
+        return hashable([attributes[name] for name in self._names])
+
+
+def play_with_cycles(player1, player2, turns):
+    """
+    Plays a match of the given number of turns between two players for which
+    finite_memory is true, leaving their histories (and counts of
+    cooperations and defections) as if every turn had been played.
+
+    Once the joint state repeats, one more period is played and the rest of
+    the match is filled in only if that period repeated the previous one and
+    led back to the same state; otherwise the match is played out.
+
+    Returns
+    -------
+    integer
+        The number of turns which were actually played.
+    """
+    memory = int(max(player1.classifier['memory_depth'],
+                     player2.classifier['memory_depth']))
+    history1, history2 = player1.history, player2.history
+    attributes1, attributes2 = _AttributeState(player1), _AttributeState(player2)
+
+    def joint_state():
+        # Raises TypeError if an attribute cannot be hashed.
+        return (history1.tail_bytes(memory), history2.tail_bytes(memory),
+                attributes1(), attributes2())
+
+    seen = {}
+    turn = 0
+    while turn < turns:
+        try:
+            state = joint_state()
+        except TypeError:
+            # An attribute cannot be hashed: play the match out.
+            break
+        if state in seen:
+            period = turn - seen[state]
+            end = min(turn + period, turns)
+            while turn < end:
+                turn += 1
+                player1.play(player2)
+            try:
+                confirmed = (turn < turns and _repeated(history1, period) and
+                             _repeated(history2, period) and
+                             joint_state() == state)
+            except TypeError:
+                confirmed = False
+            if confirmed:
+                _repeat(player1, period, turns - turn)
+                _repeat(player2, period, turns - turn)
+                return turn
+            break
+        seen[state] = turn
+        turn += 1
+        player1.play(player2)
+    while turn < turns:
+        turn += 1
+        player1.play(player2)
+    return turn
+
+
+def _repeated(history, period):
+    """Whether the last period moves of a history repeat the period
+    before."""
+    tail = history.tail_bytes(2 * period)
+    return tail[:period] == tail[period:]
+
+
+def _repeat(player, period, n):
+    history = player.history
+    cooperations, defections = history.count(C), history.count(D)
+    history.repeat_tail(period, n)
+    player.cooperations += history.count(C) - cooperations
+    player.defections += history.count(D) - defections
@@ -0,0 +1,170 @@
+"""
+The deterministic cache and its on-disk store.
+
+Results are kept in an SQLite database (in write-ahead logging mode, so
+that any number of processes can read it while one of them writes). Each
+result is committed as soon as it is added to the cache, so a run that
+crashes keeps everything computed up to that point, and a tournament loads
+only the entries for its own pairs of players.
+"""
+
+import json
+import os
+import sqlite3
+
+# Stored as the database's user_version and bumped whenever the way keys or
+# results are stored changes.
+FORMAT_VERSION = 1
+
+_SQLITE_VARIABLE_LIMIT = 500
+
+
+def _jsonable(value):
+    if isinstance(value, type):
+        return {'class': '%s.%s' % (value.__module__, value.__name__)}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+def _unstorable(value):
+    raise TypeError(
+        '%r cannot be written to a cache file: only classes, numbers, '
+        'strings, booleans, None and lists or tuples of these can' % (value,))
+
+
+def encode_key(key):
+    """
+    The text under which a cache key (see RoundRobin._cache_key) is
+    stored: player classes are written by their qualified name.
+
+    Raises TypeError if the key holds anything else that JSON cannot
+    represent, as such an object would not be written the same way in
+    another run.
+    """
+    return json.dumps(_jsonable(key), default=_unstorable)
+
+
+def _encode_keys(keys):
+    """The keys which can be stored, as a dictionary indexed by their
+    text."""
+    texts = {}
+    for key in keys:
+        try:
+            texts[encode_key(key)] = key
+        except TypeError:
+            pass
+    return texts
+
+
+class CacheStore(object):
+    """
+    An SQLite database of deterministic match results.
+
+    Each process should open its own CacheStore: connections are not shared
+    across processes.
+    """
+
+    def __init__(self, file_name):
+        """
+        Opens (creating it if needed) the store in the given file.
+
+        Raises ValueError if the file holds a store in another format
+        version, and sqlite3.DatabaseError if it is not a database.
+        """
+        self.file_name = file_name
+        self._connection = sqlite3.connect(file_name, timeout=30)
+        try:
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            version = self._connection.execute(
+                'PRAGMA user_version').fetchone()[0]
+            if version == 0:
+                self._create_tables()
+            elif version != FORMAT_VERSION:
+                raise ValueError(
+                    'Cache file %s has format version %d, expected %d' %
+                    (file_name, version, FORMAT_VERSION))
+        except Exception:
+            self._connection.close()
+            raise
+
+    @classmethod
+    def create(cls, file_name):
+        """An empty store in the given file, replacing whatever was there."""
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(file_name + suffix):
+                os.remove(file_name + suffix)
+        return cls(file_name)
+
+    def _create_tables(self):
+        with self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'key TEXT PRIMARY KEY, scores TEXT, cooperation_rates TEXT)')
+            self._connection.execute(
+                'PRAGMA user_version = %d' % FORMAT_VERSION)
+
+    def __len__(self):
+        return self._connection.execute(
+            'SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def load(self, keys):
+        """The entries held for any of the given keys, as a dictionary."""
+        texts = _encode_keys(keys)
+        names = list(texts)
+        entries = {}
+        for start in range(0, len(names), _SQLITE_VARIABLE_LIMIT):
+            batch = names[start:start + _SQLITE_VARIABLE_LIMIT]
+            rows = self._connection.execute(
+                'SELECT key, scores, cooperation_rates FROM results '
+                'WHERE key IN (%s)' % ', '.join('?' * len(batch)), batch)
+            for text, scores, cooperation_rates in rows:
+                entries[texts[text]] = {
+                    'scores': tuple(json.loads(scores)),
+                    'cooperation_rates': tuple(json.loads(cooperation_rates))}
+        return entries
+
+    def save(self, entries):
+        """Adds (or replaces) entries given as a dictionary, in one
+        transaction. Entries whose keys cannot be stored (see encode_key)
+        are left out."""
+        texts = _encode_keys(entries)
+        if not texts:
+            return
+        with self._connection:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?)',
+                [(text, json.dumps(list(entries[key]['scores'])),
+                  json.dumps(list(entries[key]['cooperation_rates'])))
+                 for text, key in texts.items()])
+
+    def close(self):
+        self._connection.close()
+
+
+class DeterministicCache(dict):
+    """
+    The cache of deterministic match results shared by round robins.
+
+    If it has a store, every entry added to the cache is also written to the
+    store straight away.
+    """
+
+    def __init__(self, store=None):
+        super(DeterministicCache, self).__init__()
+        self.store = store
+
+    def __setitem__(self, key, value):
+        super(DeterministicCache, self).__setitem__(key, value)
+        if self.store is not None:
+            self.store.save({key: value})
+
+    def load(self, keys):
+        """Reads the entries held in the store for any of the given keys
+        which are not cached yet, returning how many were found."""
+        missing = [key for key in keys if key not in self]
+        if self.store is None or not missing:
+            return 0
+        entries = self.store.load(missing)
+        dict.update(self, entries)
+        return len(entries)
@@ -1,21 +1,34 @@
 
 import random
 
+import numpy
+
 
 class Ecosystem(object):
     """Create an ecosystem based on the payoff matrix from an Axelrod tournament."""
 
-    def __init__(self, results, fitness=None, population=None):
+    def __init__(self, results, fitness=None, population=None,
+                 replicates=None):
 
         self.results = results
         self.nplayers = self.results.nplayers
         self.payoff_matrix = self.results.payoff_matrix
         self.payoff_stddevs = self.results.payoff_stddevs
+        self._payoff_averages = numpy.array(self.payoff_matrix, dtype=float)
+        self._payoff_deviations = numpy.array(
+            self.payoff_stddevs, dtype=float)
+
+        # Any number of independent ecosystems can evolve side by side: with
+        # replicates=None there is a single one, and the populations array
+        # below has no replicate axis.
+        self.replicates = replicates
+        count = 1 if replicates is None else replicates
 
-        # Population sizes will be recorded in this nested list, with each internal
-        # list containing strategy populations for a given turn. The first list,
-        # representing the starting populations, will by default have all equal
-        # values, and all population lists will be normalized to one.
+        # Population sizes will be recorded in the populations array, with
+        # each row containing the strategy populations for a given turn. The
+        # first row, representing the starting populations, will by default
+        # have all equal values, and all population rows will be normalized
+        # to one.
         # An initial population vector can also be passed. This will be
         # normalised, but must be of the correct size and have all
         # non-negative values.
@@ -26,45 +39,267 @@ class Ecosystem(object):
                 raise TypeError("Population vector must be same size as number of players")
             else:
                 norm = float(sum(population))
-                self.population_sizes = [[p / norm for p in population]]
+                initial = [p / norm for p in population]
         else:
-            self.population_sizes = [[1.0 / self.nplayers for i in range(self.nplayers)]]
+            initial = [1.0 / self.nplayers for i in range(self.nplayers)]
+        self._populations = numpy.empty((1, count, self.nplayers))
+        self._populations[0] = initial
+        self._generations = 1
 
         # This function is quite arbitrary and probably only influences the kinetics
         # for the current code.
         if fitness:
             self.fitness = fitness
         else:
-            self.fitness = lambda p: p
+            self.fitness = _identity
+
+    @property
+    def populations(self):
+        """The population sizes after each turn, as a (turns, nplayers)
+        array, or a (turns, replicates, nplayers) array if there are
+        replicates. Assigning an array (or nested lists) of either shape
+        replaces the population history, from which reproduction then
+        continues."""
+        populations = self._populations[:self._generations]
+        if self.replicates is None:
+            return populations[:, 0]
+        return populations
+
+    @populations.setter
+    def populations(self, populations):
+        populations = numpy.array(populations, dtype=float)
+        if populations.ndim == 2:
+            populations = populations[:, numpy.newaxis]
+        self._populations = numpy.empty(
+            (len(populations),) + self._populations.shape[1:])
+        self._populations[:] = populations
+        self._generations = len(populations)
+
+    @property
+    def population_sizes(self):
+        """The population sizes after each turn as nested lists, one list
+        per turn, averaged over the replicates if there are any (as plotted
+        by Plot.stackplot). Assigning to it sets the populations."""
+        populations = self.populations
+        if self.replicates is not None:
+            populations = populations.mean(axis=1)
+        return populations.tolist()
+
+    @population_sizes.setter
+    def population_sizes(self, population_sizes):
+        self.populations = population_sizes
+
+    def _vectorised_fitness(self):
+        """The fitness function applying to arrays of payoffs, or None if
+        the fitness is the payoff itself."""
+        if self.fitness is _identity:
+            return None
+        return numpy.vectorize(self.fitness, otypes=[float])
+
+    def _extend(self, turns):
+        """Makes room in the populations array for the given number of
+        turns after the current ones, and returns it."""
+        populations = numpy.empty(
+            (self._generations + turns,) + self._populations.shape[1:])
+        populations[:self._generations] = (
+            self._populations[:self._generations])
+        self._populations = populations
+        return populations
 
     def reproduce(self, turns):
+        """
+        Runs the given number of turns of reproduction.
 
-        for iturn in range(turns):
+        The payoff noise is drawn with numpy, from a generator seeded from the
+        random module, so that seeding random makes the populations
+        repeatable.
+        """
+        generator = numpy.random.RandomState(random.getrandbits(32))
+        vectorised_fitness = self._vectorised_fitness()
+        start = self._generations
+        populations = self._extend(turns)
 
-            plist = list(range(self.nplayers))
-            pops = self.population_sizes[-1]
+        shape = populations.shape[1:] + (self.nplayers,)
+        for iturn in range(start, start + turns):
+            pops = populations[iturn - 1]
 
             # The unit payoff for each player in this turn is the sum of the payoffs
             # obtained from playing with all other players, scaled by the size of the
             # opponent's population. Note that we sample the normal distribution
             # based on the payoff matrix and its standard deviations obtained from
             # the iterated PD tournament run previously.
-            payoffs = [0 for ip in plist]
-            for ip in plist:
-                for jp in plist:
-                    avg = self.payoff_matrix[ip][jp]
-                    dev = self.payoff_stddevs[ip][jp]
-                    p = random.normalvariate(avg, dev)
-                    payoffs[ip] += p * pops[jp]
+            noisy_payoffs = generator.normal(
+                self._payoff_averages, self._payoff_deviations, size=shape)
+            payoffs = numpy.matmul(
+                noisy_payoffs, pops[:, :, numpy.newaxis])[:, :, 0]
 
             # The fitness should determine how well a strategy reproduces. The new populations
             # should be multiplied by something that is proportional to the fitness, but we are
             # normalizing anyway so just multiply times fitness.
-            fitness = [self.fitness(p) for p in payoffs]
-            newpops = [p * f for p, f in zip(pops, fitness)]
+            if vectorised_fitness is None:
+                fitness = payoffs
+            else:
+                fitness = vectorised_fitness(payoffs)
+            newpops = pops * fitness
 
             # Make sure the new populations are normalized to one.
-            norm = sum(newpops)
-            newpops = [p / norm for p in newpops]
+            newpops /= newpops.sum(axis=1)[:, numpy.newaxis]
+
+            populations[iturn] = newpops
+            self._generations = iturn + 1
+
+    def reproduce_expected(self, turns, tolerance=1e-8, extinction=1e-12,
+                           step_tolerance=1e-6):
+        """
+        Runs up to the given number of turns of reproduction with the expected
+        payoffs (the payoff matrix, without noise), stopping early once the
+        populations have reached a fixed point.
+
+        A turn multiplies each population by its fitness, so the logarithm of
+        a population grows by the logarithm of its fitness. Over several
+        turns these growth rates change slowly, and are taken to change
+        linearly over as many turns at a time as keeps the estimated error
+        within step_tolerance, all those turns being filled in at once. A
+        single turn is played exactly.
+
+        The populations are at a fixed point, and reproduction stops, once
+        the fitness of every population of at least extinction is within a
+        relative tolerance of the mean fitness and no smaller population is
+        fitter than the mean (so can invade). The smaller populations then
+        die out, as do populations whose fitness is not positive. Each
+        replicate starts from its own populations, and one reaching a fixed
+        point before the others stays there.
+
+        Returns
+        -------
+        integer
+            The number of turns which were run.
+        """
+        vectorised_fitness = self._vectorised_fitness()
+        start = self._generations
+        populations = self._extend(turns)
+        stops = [self._integrate_expected(
+                     populations[:, replicate], start, start + turns,
+                     vectorised_fitness, tolerance, extinction,
+                     step_tolerance)
+                 for replicate in range(populations.shape[1])]
+        end = max(stops)
+        for replicate, stop in enumerate(stops):
+            populations[stop:end, replicate] = populations[stop - 1, replicate]
+        self._generations = end
+        return end - start
+
+    def _integrate_expected(self, populations, turn, end, vectorised_fitness,
+                            tolerance, extinction, step_tolerance):
+        """Fills in the (turns, nplayers) populations of one replicate from
+        the given turn for reproduce_expected, and returns the turn at which
+        it stopped."""
+        first = turn
+        pops = populations[turn - 1].copy()
+        growth = self._expected_growth(pops, vectorised_fitness)
+
+        step = 1
+        while turn < end:
+            alive = pops > 0
+            rates = growth[alive]
+            if not numpy.isfinite(rates).any():
+                # Every population dies out.
+                break
+            fitness = numpy.exp(rates)
+            relative = fitness / numpy.dot(pops[alive], fitness) - 1
+            established = pops[alive] >= extinction
+            if (numpy.abs(relative[established]).max() < tolerance and
+                    (relative[~established] < tolerance).all()):
+                # The populations below extinction can no longer invade.
+                if turn > first and not established.all():
+                    pops[pops < extinction] = 0
+                    pops /= pops.sum()
+                    populations[turn - 1] = pops
+                break
+            logs = numpy.log(pops[alive])
+            if not numpy.isfinite(rates).all():
+                # Some populations die out this turn.
+                step = 1
+            step = min(step, end - turn)
+            if step == 1:
+                exponents = (logs + rates)[numpy.newaxis]
+                error = 0
+            else:
+                # The growth rates are taken to change linearly over the
+                # step: predict their change from the rates at its start,
+                # then correct it from the populations this leads to. The
+                # difference estimates the error.
+                change = self._step_change(
+                    logs, rates, alive, logs + step * rates,
+                    vectorised_fitness)
+                corrected = self._step_change(
+                    logs, rates, alive, _exponents(logs, rates, change, step),
+                    vectorised_fitness)
+                error = step * numpy.ptp(corrected - change) / 2
+                if not error <= step_tolerance:
+                    step //= 2
+                    continue
+                exponents = _exponents(logs, rates, change, step,
+                                       numpy.arange(1, step + 1))
+            rows = numpy.zeros((len(exponents), self.nplayers))
+            rows[:, alive] = _normalised_exp(exponents)
+            populations[turn:turn + len(rows)] = rows
+
+            turn += len(rows)
+            pops = rows[-1]
+            growth = self._expected_growth(pops, vectorised_fitness)
+            if error < step_tolerance / 4:
+                step *= 2
+        return turn
+
+    def _step_change(self, logs, rates, alive, exponents,
+                     vectorised_fitness):
+        """The change in the growth rates of the players alive between the
+        populations whose logarithms are given and those with the given
+        exponents."""
+        pops = numpy.zeros(self.nplayers)
+        pops[alive] = _normalised_exp(exponents)
+        return self._expected_growth(pops, vectorised_fitness)[alive] - rates
+
+    def _expected_growth(self, pops, vectorised_fitness):
+        """The logarithm of the fitness of each player with the expected
+        payoffs against the given populations (minus infinity where the
+        fitness is not positive)."""
+        payoffs = numpy.dot(self._payoff_averages, pops)
+        if vectorised_fitness is None:
+            fitness = payoffs
+        else:
+            fitness = vectorised_fitness(payoffs)
+        growth = numpy.full(self.nplayers, -numpy.inf)
+        positive = fitness > 0
+        growth[positive] = numpy.log(fitness[positive])
+        return growth
+
+
+def _identity(payoff):
+    """The default fitness: the payoff itself."""
+    return payoff
+
+
+def _exponents(logs, rates, change, step, elapsed=None):
+    """
+    The logarithms of the populations (up to a constant) after the given
+    numbers of turns (by default the whole step), when the growth rates
+    change linearly by the given change over the step.
+
+    Turn t adds the rates reached after t turns, so after n turns the
+    rates have been added n times and the change n (n - 1) / 2 / step times.
+    """
+    if elapsed is None:
+        return logs + step * rates + (step - 1) / 2. * change
+    elapsed = elapsed[:, numpy.newaxis]
+    return (logs + elapsed * rates +
+            elapsed * (elapsed - 1) / (2. * step) * change)
+
 
-            self.population_sizes.append(newpops)
+def _normalised_exp(exponents):
+    """The exponentials of the exponents along the last axis, scaled to add
+    up to one."""
+    values = numpy.exp(
+        exponents - exponents.max(axis=-1)[..., numpy.newaxis])
+    return values / values.sum(axis=-1)[..., numpy.newaxis]
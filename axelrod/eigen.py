@@ -1,8 +1,10 @@
 """
 Compute the principal eigenvector of a matrix using power iteration.
 
-See also numpy.linalg.eig which calculates all the eigenvalues and
-eigenvectors.
+Power iteration can be started from a previous solution, is run on a whole
+stack of matrices at once, and hands over to numpy.linalg.eig (which
+calculates all the eigenvalues and eigenvectors) for matrices on which it
+converges slowly.
 """
 
 import numpy
@@ -39,7 +41,21 @@ def power_iteration(mat, initial):
         vec = normalise(numpy.dot(mat, vec))
         yield vec
 
-def principal_eigenvector(mat, maximum_iterations=None, max_error=1e-8):
+# Matrices of at most this size which power iteration has not settled after
+# DIRECT_SOLVER_ITERATIONS steps are solved directly, which costs less than
+# the steps it saves. Larger ones are only solved directly once
+# maximum_iterations is reached.
+DIRECT_SOLVER_SIZE = 100
+DIRECT_SOLVER_ITERATIONS = 20
+# The number of steps used when maximum_iterations is None
+DEFAULT_MAXIMUM_ITERATIONS = 1000
+# Eigenvalues whose modulus is within this relative distance of the largest
+# one also count as dominant.
+DEGENERACY_TOLERANCE = 1e-8
+
+
+def principal_eigenvector(mat, maximum_iterations=None, max_error=1e-8,
+                          initial=None):
     """
     Computes the (normalised) principal eigenvector of the given matrix.
 
@@ -47,31 +63,139 @@ def principal_eigenvector(mat, maximum_iterations=None, max_error=1e-8):
     ------
     mat: numpy.matrix
         The matrix to use for multiplication iteration
-    initial: numpy.array, None
-        The initial state. Will be set to numpy.array([1, 1, ...]) if None
     maximum_iterations: int, None
-        The maximum number of iterations of the approximation
+        The maximum number of iterations of the approximation, after which
+        the matrix is solved directly
     max_error: float, 1e-8
         Exit criterion -- error threshold of the difference of successive steps
+    initial: numpy.array, None
+        The initial state, for instance the eigenvector of a similar matrix.
+        Will be set to numpy.array([1, 1, ...]) if None
+
+    Returns
+    -------
+    The eigenvector (a numpy array) and its eigenvalue
     """
+    if initial is not None:
+        initial = numpy.asarray(initial)[numpy.newaxis]
+    vectors, eigenvalues = principal_eigenvectors(
+        numpy.asarray(mat)[numpy.newaxis], maximum_iterations, max_error,
+        initial)
+    return vectors[0], float(eigenvalues[0])
 
-    mat_ = numpy.matrix(mat)
-    size = mat_.shape[0]
-    initial = numpy.ones(size)
 
-    # Power iteration
+def principal_eigenvectors(matrices, maximum_iterations=None, max_error=1e-8,
+                           initial=None):
+    """
+    Computes the principal eigenvectors of a stack of matrices at once.
+
+    Each matrix is first run through power iteration, all of them together.
+    Those which have not converged after maximum_iterations steps (or after
+    DIRECT_SOLVER_ITERATIONS steps, for matrices of at most
+    DIRECT_SOLVER_SIZE) are solved directly with numpy.linalg, keeping the
+    part of the last approximation which lies in the dominant eigenspace:
+    this is where power iteration would have gone on to converge, if it
+    converges at all.
+
+    Params
+    ------
+    matrices: numpy.array
+        A (k, n, n) array of k matrices
+    maximum_iterations: int, None
+        The maximum number of iterations of the approximation. Will be set to
+        DEFAULT_MAXIMUM_ITERATIONS if None
+    max_error: float, 1e-8
+        Exit criterion -- error threshold of the difference of successive steps
+    initial: numpy.array, None
+        The (k, n) initial states, for instance the eigenvectors found for
+        similar matrices. Will be set to numpy.array([1, 1, ...]) if None
+
+    Returns
+    -------
+    A (k, n) array of eigenvectors and a (k,) array of their eigenvalues
+    """
+    matrices = numpy.asarray(matrices, dtype=float)
+    count, size = matrices.shape[:2]
+    if initial is None:
+        vectors = numpy.ones((count, size))
+    else:
+        vectors = numpy.array(initial, dtype=float)
     if not maximum_iterations:
-        maximum_iterations = float('inf')
-    last = initial
-    for i, vector in enumerate(power_iteration(mat, initial=initial)):
-        if i > maximum_iterations:
-            break
-        if squared_error(vector, last) < max_error:
+        maximum_iterations = DEFAULT_MAXIMUM_ITERATIONS
+    iterations = maximum_iterations
+    if size <= DIRECT_SOLVER_SIZE:
+        iterations = min(iterations, DIRECT_SOLVER_ITERATIONS)
+
+    vectors, converged = _power_iteration(
+        matrices, vectors, iterations, max_error)
+    pending = numpy.flatnonzero(~converged)
+    if len(pending):
+        vectors[pending] = _dominant_projections(
+            matrices[pending], vectors[pending])
+
+    # Compute the eigenvalues (Rayleigh quotients)
+    products = numpy.einsum('kij,kj->ki', matrices, vectors)
+    eigenvalues = (numpy.einsum('ki,ki->k', products, vectors) /
+                   numpy.einsum('ki,ki->k', vectors, vectors))
+    return vectors, eigenvalues
+
+
+def _power_iteration(matrices, vectors, iterations, max_error):
+    """
+    Runs up to the given number of steps of power iteration on a stack of
+    matrices, from the given (k, n) vectors, each matrix stopping as soon as
+    two successive steps are within max_error of each other.
+
+    Returns
+    -------
+    The (k, n) approximations and a (k,) boolean array of whether each
+    has converged.
+    """
+    following = numpy.empty_like(vectors)
+    difference = numpy.empty_like(vectors)
+    converged = numpy.zeros(len(vectors), dtype=bool)
+    for iteration in range(iterations):
+        numpy.matmul(matrices, vectors[:, :, numpy.newaxis],
+                     out=following[:, :, numpy.newaxis])
+        following /= numpy.sqrt(numpy.einsum(
+            'ki,ki->k', following, following))[:, numpy.newaxis]
+        numpy.subtract(following, vectors, out=difference)
+        errors = numpy.sqrt(numpy.einsum('ki,ki->k', difference, difference))
+        # Matrices which had already converged keep their vector.
+        following[converged] = vectors[converged]
+        vectors, following = following, vectors
+        converged |= errors < max_error
+        if converged.all():
             break
-        last = vector
-    # Compute the eigenvalue (Rayleigh quotient)
-    eigenvalue = numpy.dot(
-        numpy.dot(mat_, vector), vector) / numpy.dot(vector, vector)
-    # Liberate the eigenvalue from numpy
-    eigenvalue = float(eigenvalue)
-    return (vector, eigenvalue)
+    return vectors, converged
+
+
+def _dominant_projections(matrices, vectors):
+    """
+    The normalised orthogonal projections of the (k, n) vectors on the
+    dominant eigenspaces of the (k, n, n) matrices, found with numpy.linalg.
+    A vector with no component in the dominant eigenspace is left as it is.
+    """
+    symmetric = (matrices == matrices.transpose(0, 2, 1)).all()
+    if symmetric:
+        eigenvalues, eigenvectors = numpy.linalg.eigh(matrices)
+    else:
+        eigenvalues, eigenvectors = numpy.linalg.eig(matrices)
+    projections = numpy.array(vectors)
+    for index, vector in enumerate(vectors):
+        moduli = numpy.abs(eigenvalues[index])
+        dominant = moduli >= moduli.max() * (1 - DEGENERACY_TOLERANCE)
+        basis = eigenvectors[index][:, dominant]
+        # The real and imaginary parts of complex eigenvectors span the
+        # dominant real invariant subspace; an orthonormal basis of it also
+        # merges the near parallel eigenvectors of a defective eigenvalue.
+        basis = numpy.hstack([basis.real, basis.imag])
+        left, singular_values, right = numpy.linalg.svd(
+            basis, full_matrices=False)
+        rank = numpy.sum(singular_values > singular_values[0] * 1e-8)
+        left = left[:, :rank]
+        projection = numpy.dot(left, numpy.dot(left.T, vector))
+        norm = numpy.sqrt(numpy.dot(projection, projection))
+        if norm > 1e-8 * numpy.sqrt(numpy.dot(vector, vector)):
+            projections[index] = projection / norm
+    return projections
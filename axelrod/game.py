@@ -1,7 +1,22 @@
+import numpy
+
 from axelrod import Actions
 
 C, D = Actions.C, Actions.D
 
+# The integer code of each move, used to index the payoff array.
+MOVE_CODES = {C: 0, D: 1}
+
+
+def encode(history):
+    """A history of moves as a numpy array of move codes."""
+    try:
+        return history.codes()
+    except AttributeError:
+        return numpy.array([MOVE_CODES[move] for move in history],
+                           dtype=numpy.intp)
+
+
 class Game(object):
     """A class to hold the game matrix and to score a game accordingly."""
 
@@ -12,6 +27,10 @@ class Game(object):
             (C, D): (s, t),
             (D, C): (t, s),
         }
+        # The payoff to the row player indexed by the codes of both moves.
+        self.payoff_array = numpy.array([[r, s], [t, p]])
+        # The payoffs to each player for each joint outcome (CC, CD, DC, DD).
+        self._outcome_payoffs = numpy.array([[r, s, t, p], [r, t, s, p]])
 
     def RPST(self):
         """Return the values in the game matrix in the Press and Dyson notation."""
@@ -30,4 +49,28 @@ class Game(object):
         """
         return self.scores[pair]
 
+    def score_histories(self, history1, history2):
+        """Score a whole match in one vectorized pass over both histories.
+
+        Parameters
+        ----------
+        history1, history2 : History or sequence of moves
+            The moves of the two players (any turns beyond the length of the
+            shorter history are ignored)
+
+        Returns
+        -------
+        tuple
+            The scores of the two players, their numbers of cooperations and
+            the numbers of turns ending in each joint outcome (CC, CD, DC, DD)
+            from the point of view of the first player.
+        """
+        codes1, codes2 = encode(history1), encode(history2)
+        turns = min(len(codes1), len(codes2))
+        counts = numpy.bincount(
+            2 * codes1[:turns] + codes2[:turns], minlength=4)
+        scores = tuple(numpy.dot(self._outcome_payoffs, counts).tolist())
+        cc, cd, dc, dd = counts.tolist()
+        return scores, (cc + cd, cc + dc), (cc, cd, dc, dd)
+
 DefaultGame = Game()
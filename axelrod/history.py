@@ -0,0 +1,300 @@
+"""
+A compact record of the moves played by a player.
+
+Histories are stored one byte per move in a bytearray, keep running counts of
+cooperations and defections and give cheap read only views of their tail or of
+any window, while still behaving like the list of moves strategies expect.
+
+Strategies which look at the last n moves every turn can ask for
+tail_count(n, move): the history then keeps counts over that sliding window
+up to date as moves are appended or popped.
+"""
+
+import numpy
+
+from axelrod import Actions
+
+C, D = Actions.C, Actions.D
+
+_C_BYTES = bytearray([ord(C)])
+_D_BYTES = bytearray([ord(D)])
+_C_CODE, _D_CODE = ord(C), ord(D)
+
+
+def _as_bytes(move):
+    """The single byte search pattern for a move."""
+    if move == C:
+        return _C_BYTES
+    if move == D:
+        return _D_BYTES
+    return bytearray([ord(move)])
+
+
+class History(object):
+    """A list like sequence of moves backed by a bytearray.
+
+    Indexing with an integer returns a move, and slicing returns a list of
+    moves, so existing code written against lists keeps working. The tail and
+    window methods return HistoryView objects which do not copy the moves.
+    """
+
+    def __init__(self, moves=()):
+        if isinstance(moves, History):
+            self._moves = bytearray(moves._moves)
+        else:
+            self._moves = bytearray(ord(move) for move in moves)
+        self._cooperations = self._moves.count(_C_BYTES)
+        self._defections = self._moves.count(_D_BYTES)
+        # Counts of cooperations and defections over the last n moves, for
+        # each n passed to tail_count
+        self._windows = {}
+
+    def append(self, move):
+        self._moves.append(ord(move))
+        if move == C:
+            self._cooperations += 1
+        elif move == D:
+            self._defections += 1
+        if self._windows:
+            self._slide(len(self._moves) - 1, 1)
+
+    def extend(self, moves):
+        if isinstance(moves, History):
+            moves = moves._moves
+        else:
+            moves = bytearray(ord(move) for move in moves)
+        self._moves.extend(moves)
+        self._cooperations += moves.count(_C_BYTES)
+        self._defections += moves.count(_D_BYTES)
+        self._recount_windows()
+
+    def repeat_tail(self, period, n):
+        """Appends n moves which continue the last period moves as a cycle."""
+        cycle = self._moves[-period:]
+        repeats, remainder = divmod(n, period)
+        moves = cycle * repeats + cycle[:remainder]
+        self._moves.extend(moves)
+        self._cooperations += moves.count(_C_BYTES)
+        self._defections += moves.count(_D_BYTES)
+        self._recount_windows()
+
+    def pop(self, index=-1):
+        last = index in (-1, len(self._moves) - 1)
+        if self._windows and last:
+            self._slide(len(self._moves) - 1, -1)
+        move = chr(self._moves.pop(index))
+        if move == C:
+            self._cooperations -= 1
+        elif move == D:
+            self._defections -= 1
+        if not last:
+            self._recount_windows()
+        return move
+
+    def truncate(self, length):
+        """Removes the moves after the first length moves."""
+        while len(self._moves) > length:
+            self.pop()
+
+    def count(self, move):
+        if move == C:
+            return self._cooperations
+        if move == D:
+            return self._defections
+        return self[:].count(move)
+
+    def tail_count(self, n, move):
+        """
+        The number of times move was played in the last n moves (all moves if
+        n > len), as tail(n).count(move).
+
+        The first call for a given n counts the window; from then on the
+        history keeps the counts over its last n moves up to date at constant
+        cost per move appended or popped.
+        """
+        if n <= 0 or move not in (C, D):
+            return self.tail(n).count(move)
+        window = self._windows.get(n)
+        if window is None:
+            window = self._windows[n] = self._count_window(n)
+        return window[move == D]
+
+    def _count_window(self, n):
+        tail = self._moves[-n:]
+        return [tail.count(_C_BYTES), tail.count(_D_BYTES)]
+
+    def _recount_windows(self):
+        for n in self._windows:
+            self._windows[n] = self._count_window(n)
+
+    def _slide(self, position, step):
+        """Moves every window by one move, onto the move at position when step
+        is 1 and off it (before it is popped) when step is -1."""
+        moves = self._moves
+        for n, window in self._windows.items():
+            _add(window, moves[position], step)
+            if position >= n:
+                _add(window, moves[position - n], -step)
+
+    def index(self, move):
+        position = self._moves.find(_as_bytes(move))
+        if position == -1:
+            raise ValueError('%r is not in history' % (move,))
+        return position
+
+    def codes(self):
+        """The moves as a numpy array of 0 (cooperate) and 1 (defect)."""
+        moves = numpy.frombuffer(bytes(self._moves), dtype=numpy.uint8)
+        return (moves == ord(D)).astype(numpy.intp)
+
+    def tail(self, n):
+        """A read only view of the last n moves (all moves if n > len)."""
+        length = len(self._moves)
+        return HistoryView(self._moves, max(length - n, 0), length)
+
+    def tail_bytes(self, n):
+        """The last n moves as bytes, for use as a dictionary key."""
+        if n <= 0:
+            return b''
+        return bytes(self._moves[-n:])
+
+    def window(self, start, stop):
+        """A read only view of the moves history[start:stop]."""
+        start, stop, _ = slice(start, stop).indices(len(self._moves))
+        return HistoryView(self._moves, start, max(start, stop))
+
+    def __len__(self):
+        return len(self._moves)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._moves[index].decode('ascii'))
+        return chr(self._moves[index])
+
+    def __iter__(self):
+        return iter(self._moves.decode('ascii'))
+
+    def __reversed__(self):
+        return reversed(self._moves.decode('ascii'))
+
+    def __contains__(self, move):
+        try:
+            return self._moves.find(_as_bytes(move)) != -1
+        except TypeError:
+            return False
+
+    def __eq__(self, other):
+        if isinstance(other, History):
+            return self._moves == other._moves
+        if isinstance(other, (list, HistoryView)):
+            return self[:] == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    __hash__ = None
+
+    def __add__(self, other):
+        return self[:] + list(other)
+
+    def __radd__(self, other):
+        return list(other) + self[:]
+
+    def __copy__(self):
+        return History(self)
+
+    def __deepcopy__(self, memo):
+        return History(self)
+
+    def __reduce__(self):
+        return (History, (self._moves.decode('ascii'),))
+
+    def __repr__(self):
+        return repr(self[:])
+
+
+def _add(window, code, step):
+    if code == _C_CODE:
+        window[0] += step
+    elif code == _D_CODE:
+        window[1] += step
+
+
+class HistoryView(object):
+    """A read only window onto a History which does not copy its moves.
+
+    A view covers the moves that were in its window when it was taken; it is
+    not meant to outlive any later shortening of the history.
+    """
+
+    def __init__(self, moves, start, stop):
+        self._moves = moves
+        self._start = start
+        self._stop = stop
+
+    def count(self, move):
+        return self._moves.count(_as_bytes(move), self._start, self._stop)
+
+    def tolist(self):
+        return list(self._moves[self._start:self._stop].decode('ascii'))
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.tolist()[index]
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('history view index out of range')
+        return chr(self._moves[self._start + index])
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __contains__(self, move):
+        try:
+            return self._moves.find(
+                _as_bytes(move), self._start, self._stop) != -1
+        except TypeError:
+            return False
+
+    def __eq__(self, other):
+        if isinstance(other, (list, History, HistoryView)):
+            return self.tolist() == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+
+class HistoryAttribute(object):
+    """An attribute which stores any sequence of moves assigned to it as a
+    History.
+
+    Only assignment is intercepted: the History lives in the instance
+    dictionary under the same name, so reading the attribute is as fast as
+    reading any other.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __set__(self, instance, moves):
+        if not isinstance(moves, History):
+            moves = History(moves)
+        instance.__dict__[self.name] = moves
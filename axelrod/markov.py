@@ -0,0 +1,159 @@
+"""
+Exact expected outcomes for matches between two memory one players.
+
+The play of two memory one players is a Markov chain on the four joint states
+(CC, CD, DC, DD) of the previous round, so rather than simulating every turn
+the expected payoffs and cooperation counts can be computed from powers of
+the 4 x 4 transition matrix.
+"""
+
+from __future__ import division
+
+import numpy
+
+from axelrod import Actions
+
+C, D = Actions.C, Actions.D
+
+# The joint states from the point of view of the first player.
+STATES = [(C, C), (C, D), (D, C), (D, D)]
+
+
+def is_memory_one(player):
+    """Whether the player's play is fully described by a four vector."""
+    # Imported here to avoid a circular import: the strategies package
+    # itself depends on the classes defined alongside this module.
+    from .strategies.memoryone import MemoryOnePlayer
+    return (isinstance(player, MemoryOnePlayer) and
+            hasattr(player, '_four_vector'))
+
+
+def _with_noise(p, noise):
+    """The probability of cooperating once an intended move may be flipped."""
+    return p * (1 - noise) + (1 - p) * noise
+
+
+def transition_matrix(four_vector_1, four_vector_2, noise=0):
+    """
+    The transition matrix of the joint play of two memory one players.
+
+    Parameters
+    ----------
+    four_vector_1, four_vector_2 : dict
+        Cooperation probabilities keyed by (own move, opponent move) as held
+        in MemoryOnePlayer._four_vector.
+    noise : float
+        The probability that any intended move is flipped.
+
+    Returns
+    -------
+    numpy.ndarray
+        A 4 x 4 matrix (M) where Mij is the probability of moving from joint
+        state i to joint state j, with states ordered as in STATES.
+    """
+    matrix = numpy.zeros((4, 4))
+    for row, (move_1, move_2) in enumerate(STATES):
+        x = _with_noise(four_vector_1[(move_1, move_2)], noise)
+        y = _with_noise(four_vector_2[(move_2, move_1)], noise)
+        matrix[row] = [x * y, x * (1 - y), (1 - x) * y, (1 - x) * (1 - y)]
+    return matrix
+
+
+def initial_distribution(initial_1, initial_2, noise=0):
+    """The distribution of the joint state after the first turn."""
+    x = _with_noise(1 if initial_1 == C else 0, noise)
+    y = _with_noise(1 if initial_2 == C else 0, noise)
+    return numpy.array(
+        [x * y, x * (1 - y), (1 - x) * y, (1 - x) * (1 - y)])
+
+
+def geometric_sum(matrix, n):
+    """
+    The sum I + M + M^2 + ... + M^(n - 1) computed by repeated squaring.
+
+    Uses S(2k) = S(k) + M^k S(k) and S(k + 1) = S(k) + M^k so that only
+    O(log n) matrix products are required.
+    """
+    size = matrix.shape[0]
+    power = numpy.identity(size)
+    total = numpy.zeros((size, size))
+    for bit in bin(n)[2:]:
+        total = total + numpy.dot(power, total)
+        power = numpy.dot(power, power)
+        if bit == '1':
+            total = total + power
+            power = numpy.dot(power, matrix)
+    return total
+
+
+def stationary_distribution(matrix):
+    """
+    A stationary distribution (v such that vM = v) of a transition matrix.
+
+    When the chain has more than one stationary distribution (for example
+    between two deterministic players) the least squares solution is
+    returned.
+    """
+    size = matrix.shape[0]
+    system = numpy.vstack([matrix.T - numpy.identity(size), numpy.ones(size)])
+    target = numpy.zeros(size + 1)
+    target[-1] = 1
+    distribution = numpy.linalg.lstsq(system, target, rcond=-1)[0]
+    return distribution
+
+
+def _state_payoffs(game):
+    """The payoffs for each joint state from the point of view of each player."""
+    payoffs_1 = numpy.array([game.score(state)[0] for state in STATES])
+    payoffs_2 = numpy.array([game.score(state)[1] for state in STATES])
+    return payoffs_1, payoffs_2
+
+
+def expected_state_counts(player1, player2, turns, noise=0, stationary=False):
+    """
+    The expected number of turns spent in each joint state.
+
+    Parameters
+    ----------
+    player1, player2 : MemoryOnePlayer
+        The two players (with four vectors set)
+    turns : integer
+        The number of turns in the match
+    noise : float
+        The probability that any intended move is flipped
+    stationary : bool
+        If True, use the long run (stationary) distribution of the chain
+        rather than the exact distribution over the first turns.
+
+    Returns
+    -------
+    numpy.ndarray
+        The expected number of turns spent in each of the states in STATES.
+    """
+    matrix = transition_matrix(
+        player1._four_vector, player2._four_vector, noise)
+    if stationary:
+        return turns * stationary_distribution(matrix)
+    initial = initial_distribution(player1._initial, player2._initial, noise)
+    return numpy.dot(initial, geometric_sum(matrix, turns))
+
+
+def expected_outcome(player1, player2, game, turns, noise=0,
+                     stationary=False):
+    """
+    The expected scores and cooperation counts of a match.
+
+    Returns
+    -------
+    tuple
+        A pair of tuples: the expected scores of the two players and their
+        expected numbers of cooperations, in the form used by RoundRobin.
+    """
+    counts = expected_state_counts(
+        player1, player2, turns, noise, stationary)
+    payoffs_1, payoffs_2 = _state_payoffs(game)
+    scores = (float(numpy.dot(counts, payoffs_1)),
+              float(numpy.dot(counts, payoffs_2)))
+    cooperation_rates = (float(counts[0] + counts[1]),
+                         float(counts[0] + counts[2]))
+    return scores, cooperation_rates
@@ -1,8 +1,7 @@
-import copy
-
 import axelrod
 
 from axelrod import Player, update_histories, Actions
+from .history import History
 
 C, D = Actions.C, Actions.D
 
@@ -13,9 +12,9 @@ class MockPlayer(Player):
 
     def __init__(self, player, move):
         # Need to retain history for opponents that examine opponents history
-        # Do a deep copy just to be safe
+        # Copying a History is a single copy of its underlying bytes
         axelrod.Player.__init__(self)
-        self.history = copy.deepcopy(player.history)
+        self.history = History(player.history)
         self.cooperations = player.cooperations
         self.defections = player.defections
         self.move = move
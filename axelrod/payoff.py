@@ -1,5 +1,4 @@
-import math
-from numpy import median, mean
+import numpy
 from axelrod import Actions
 
 C, D = Actions.C, Actions.D
@@ -127,17 +126,7 @@ def scores(payoff):
         (e.g. player 1 versus player 1) and so these are also excluded from the
         scores here by the condition on ip and ires.
     """
-    nplayers = len(payoff)
-    repetitions = len(payoff[0][0])
-    scores = []
-    for ires, res in enumerate(payoff):
-        scores.append([])
-        for irep in range(repetitions):
-            scores[-1].append(0)
-            for ip in range(nplayers):
-                if ip != ires:
-                    scores[-1][-1] += res[ip][irep]
-    return scores
+    return scores_array(numpy.asarray(payoff)).tolist()
 
 
 def normalised_scores(scores, turns):
@@ -161,10 +150,7 @@ def normalised_scores(scores, turns):
         where t is the total number of turns played per repetition for a given
         player excluding self-interactions.
     """
-    nplayers = len(scores)
-    normalisation = turns * (nplayers - 1)
-    return [
-        [1.0 * s / normalisation for s in r] for r in scores]
+    return normalised_scores_array(numpy.asarray(scores), turns).tolist()
 
 
 def ranking(scores):
@@ -182,11 +168,7 @@ def ranking(scores):
         A list of players (their index within the players list rather than
         a player instance) ordered by median score
     """
-    nplayers = len(scores)
-    ranking = sorted(
-        range(nplayers),
-        key=lambda i: -median(scores[i]))
-    return ranking
+    return ranking_array(numpy.asarray(scores)).tolist()
 
 
 def ranked_names(players, ranking):
@@ -235,20 +217,9 @@ def normalised_payoff(payoff_matrix, turns):
     list
         A per-turn averaged payoff matrix and its standard deviations.
     """
-    repetitions = len(payoff_matrix[0][0])
-    averages = []
-    stddevs = []
-    for res in payoff_matrix:
-        averages.append([])
-        stddevs.append([])
-        for s in res:
-            perturn = [1.0 * rep / turns for rep in s]
-            avg = sum(perturn) / repetitions
-            dev = math.sqrt(
-                sum([(avg - pt)**2 for pt in perturn]) / repetitions)
-            averages[-1].append(avg)
-            stddevs[-1].append(dev)
-    return averages, stddevs
+    averages, stddevs = normalised_payoff_array(
+        numpy.asarray(payoff_matrix), turns)
+    return averages.tolist(), stddevs.tolist()
 
 
 def winning_player(players, payoffs):
@@ -308,21 +279,7 @@ def wins(payoff):
         i.e. one row per player which lists the total wins for that player
         in each repetition.
     """
-    nplayers = len(payoff)
-    repetitions = len(payoff[0][0])
-    wins = [
-        [0 for r in range(repetitions)] for p in range(nplayers)]
-    for player in range(nplayers):
-        for opponent in range(nplayers):
-            players = (player, opponent)
-            for repetition in range(repetitions):
-                payoffs = (
-                    payoff[player][opponent][repetition],
-                    payoff[opponent][player][repetition])
-                winner = winning_player(players, payoffs)
-                if winner is not None:
-                    wins[winner][repetition] += 1
-    return wins
+    return wins_array(numpy.asarray(payoff)).tolist()
 
 
 def payoff_diffs_means(payoff, turns):
@@ -357,18 +314,7 @@ def payoff_diffs_means(payoff, turns):
         normalized by the number of turns. I.e. the nplayers x nplayers
         matrix of mean payoff differences between each player and opponent.
     """
-    nplayers = len(payoff)
-    repetitions = len(payoff[0][0])
-    diffs_matrix = [[0] * nplayers for _ in range(nplayers)]
-    for player in range(nplayers):
-        for opponent in range(nplayers):
-            diffs = []
-            for repetition in range(repetitions):
-                diff = (payoff[player][opponent][repetition] - payoff[opponent][player][repetition]) / float(turns)
-                diffs.append(diff)
-            diffs_matrix[player][opponent] = mean(diffs)
-
-    return diffs_matrix
+    return payoff_diffs_means_array(numpy.asarray(payoff), turns).tolist()
 
 
 def score_diffs(payoff, turns):
@@ -400,14 +346,82 @@ def score_diffs(payoff, turns):
         where the payoffs have been normalized by the number of turns and summed
         over the repititions.
     """
-    nplayers = len(payoff)
-    repetitions = len(payoff[0][0])
-    diffs = [
-        [] for p in range(nplayers)]
-    for player in range(nplayers):
-        for opponent in range(nplayers):
-            for repetition in range(repetitions):
-                diff = (payoff[player][opponent][repetition] - payoff[opponent][player][repetition]) / float(turns)
-                diffs[player].append(diff)
-
-    return diffs
+    return score_diffs_array(numpy.asarray(payoff), turns).tolist()
+
+
+# The functions below compute the same values as those above, but take and
+# return numpy arrays: payoff is a (n, n, repetitions) array indexed by
+# player, opponent and repetition (as ResultSet.result_arrays holds) and
+# scores a (n, repetitions) array.
+
+
+def _ordered_sum(values, axis):
+    """
+    The sum of an array along an axis, adding the slices one at a time in
+    order, as the builtin sum would, rather than pairwise: the result is then
+    the same whatever the memory layout of the array.
+    """
+    values = numpy.moveaxis(values, axis, 0)
+    total = numpy.zeros(values.shape[1:], dtype=values.dtype)
+    for value in values:
+        total += value
+    return total
+
+
+def scores_array(payoff):
+    """The (n, repetitions) scores array excluding self-interactions (see
+    scores)."""
+    nplayers = payoff.shape[0]
+    self_interactions = numpy.eye(nplayers, dtype=bool)[:, :, numpy.newaxis]
+    return _ordered_sum(numpy.where(self_interactions, 0, payoff), 1)
+
+
+def normalised_scores_array(scores, turns):
+    """The per-turn normalised scores array (see normalised_scores)."""
+    normalisation = turns * (scores.shape[0] - 1)
+    return scores / float(normalisation)
+
+
+def ranking_array(scores):
+    """Player index numbers ordered by median score, ties keeping the order
+    of the players (see ranking)."""
+    return numpy.argsort(-numpy.median(scores, axis=1), kind='mergesort')
+
+
+def normalised_payoff_array(payoff, turns):
+    """The (n, n) arrays of per-turn averaged payoffs and their standard
+    deviations (see normalised_payoff)."""
+    repetitions = payoff.shape[2]
+    perturn = payoff / float(turns)
+    averages = _ordered_sum(perturn, 2) / repetitions
+    deviations = (averages[:, :, numpy.newaxis] - perturn) ** 2
+    stddevs = numpy.sqrt(_ordered_sum(deviations, 2) / repetitions)
+    return averages, stddevs
+
+
+def wins_array(payoff):
+    """The (n, repetitions) array of win counts (see wins)."""
+    beaten = payoff > payoff.transpose(1, 0, 2)
+    # Every pair of players is looked at in both orders, so each win counts
+    # twice.
+    return 2 * beaten.sum(axis=1)
+
+
+def _payoff_diffs(payoff, turns):
+    """The (n, n, repetitions) array of per-turn differences between the
+    payoffs of each player and of its opponent."""
+    return numpy.ascontiguousarray(
+        (payoff - payoff.transpose(1, 0, 2)) / float(turns))
+
+
+def payoff_diffs_means_array(payoff, turns):
+    """The (n, n) array of mean payoff differences (see
+    payoff_diffs_means)."""
+    return numpy.mean(_payoff_diffs(payoff, turns), axis=2)
+
+
+def score_diffs_array(payoff, turns):
+    """The (n, n * repetitions) array of payoff differences against every
+    opponent in every repetition (see score_diffs)."""
+    nplayers = payoff.shape[0]
+    return _payoff_diffs(payoff, turns).reshape(nplayers, -1)
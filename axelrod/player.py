@@ -2,8 +2,11 @@ import inspect
 import random
 import copy
 
+import numpy
+
 from axelrod import Actions
-from .game import DefaultGame
+from .game import DefaultGame, Game
+from .history import History, HistoryAttribute
 
 
 C, D = Actions.C, Actions.D
@@ -48,6 +51,114 @@ def update_histories(player1, player2, move1, move2):
         player2.defections += 1
 
 
+# What is asking for the move of the strategy being run (see strategy_caller),
+# in a list so that it can be changed in place.
+_caller = [None]
+
+
+def strategy_caller():
+    """
+    What is asking for the move of the strategy being run: 'play' when the
+    players are playing a turn, 'simulate_match' when a mind reader is
+    simulating rounds, 'strategy' when another strategy asks for it (see
+    call_strategy) and None otherwise.
+
+    Strategies which must not be simulated, or must not simulate each other
+    without end, check this instead of inspecting the stack.
+    """
+    return _caller[0]
+
+
+def call_strategy(player, opponent, caller):
+    """The move of player against opponent, asked for by caller (see
+    strategy_caller)."""
+    previous = _caller[0]
+    _caller[0] = caller
+    try:
+        return player.strategy(opponent)
+    finally:
+        _caller[0] = previous
+
+
+# The kinds of value captured by Player.snapshot
+(_VALUE, _HISTORY, _PLAYER, _LIST, _FLAT_LIST, _DICT, _FLAT_DICT, _SET,
+ _ARRAY, _STATEFUL, _COPY) = range(11)
+# Games are never changed once made.
+_IMMUTABLE_TYPES = (
+    int, float, complex, bool, str, bytes, frozenset, type(None), type,
+    type(len), type(lambda: None), Game)
+
+
+def _capture(value, memo):
+    """The state of a value as (kind, value, data), for _release."""
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return (_VALUE, value, None)
+    if isinstance(value, History):
+        return (_HISTORY, value, len(value))
+    if isinstance(value, tuple):
+        items = [_capture(item, memo) for item in value]
+        if all(item[0] == _VALUE for item in items):
+            return (_VALUE, value, None)
+        return (_LIST, None, items)
+    if id(value) in memo:
+        # Shared (or recursive) references are restored once.
+        return (_VALUE, value, None)
+    memo[id(value)] = value
+    if isinstance(value, Player):
+        if type(value).snapshot == Player.snapshot:
+            return (_PLAYER, value, value._snapshot(memo))
+        return (_PLAYER, value, value.snapshot())
+    if isinstance(value, list):
+        if all(isinstance(item, _IMMUTABLE_TYPES) for item in value):
+            return (_FLAT_LIST, value, list(value))
+        return (_LIST, value, [_capture(item, memo) for item in value])
+    if isinstance(value, dict):
+        if all(isinstance(item, _IMMUTABLE_TYPES) for item in value.values()):
+            return (_FLAT_DICT, value, dict(value))
+        return (_DICT, value, [(key, _capture(item, memo))
+                               for key, item in value.items()])
+    if isinstance(value, set):
+        return (_SET, value, set(value))
+    if isinstance(value, numpy.ndarray):
+        return (_ARRAY, value, value.copy())
+    if hasattr(value, 'snapshot') and hasattr(value, 'restore'):
+        return (_STATEFUL, value, value.snapshot())
+    return (_COPY, None, copy.deepcopy(value))
+
+
+def _release(captured):
+    """The value captured by _capture, brought back to its state then."""
+    kind, value, data = captured
+    if kind == _VALUE:
+        return value
+    if kind == _HISTORY:
+        value.truncate(data)
+    elif kind == _PLAYER:
+        value.restore(data)
+    elif kind == _LIST:
+        items = [_release(item) for item in data]
+        if value is None:
+            return tuple(items)
+        value[:] = items
+    elif kind == _FLAT_LIST:
+        value[:] = data
+    elif kind == _DICT:
+        items = [(key, _release(item)) for key, item in data]
+        value.clear()
+        value.update(items)
+    elif kind in (_FLAT_DICT, _SET):
+        value.clear()
+        value.update(data)
+    elif kind == _ARRAY:
+        value[...] = data
+    elif kind == _STATEFUL:
+        value.restore(data)
+    else:
+        # A snapshot can be restored more than once.
+        return copy.deepcopy(data)
+    return value
+
+
 class Player(object):
     """A class for a player in the tournament.
 
@@ -55,6 +166,8 @@ class Player(object):
     """
 
     name = "Player"
+    # Plain lists of moves are accepted but stored as a History.
+    history = HistoryAttribute('history')
     classifier = {}
     default_classifier = {
         'stochastic': False,
@@ -66,7 +179,7 @@ class Player(object):
 
     def __init__(self):
         """Initiates an empty history and 0 score for a player."""
-        self.history = []
+        self.history = History()
         self.classifier = copy.copy(self.classifier)
         if self.name == "Player":
             self.classifier['stochastic'] = False
@@ -112,7 +225,12 @@ class Player(object):
 
     def play(self, opponent, noise=0):
         """This pits two players against each other."""
-        s1, s2 = self.strategy(opponent), opponent.strategy(self)
+        previous = _caller[0]
+        _caller[0] = 'play'
+        try:
+            s1, s2 = self.strategy(opponent), opponent.strategy(self)
+        finally:
+            _caller[0] = previous
         if noise:
             s1, s2 = self._add_noise(noise, s1, s2)
         update_histories(self, opponent, s1, s2)
@@ -130,6 +248,32 @@ class Player(object):
         new_player.tournament_attributes = copy.copy(self.tournament_attributes)
         return new_player
 
+    def snapshot(self):
+        """
+        Captures the state of the player, so that restore can bring it back
+        after some turns have been played (as when looking ahead) without
+        copying the player.
+
+        Attributes holding immutable values are kept by reference, histories
+        by their length (moves are only appended during play) and lists,
+        dicts, sets, numpy arrays and other players are captured member by
+        member. Any other object is captured by its own snapshot method if it
+        has snapshot and restore methods, and is deep copied otherwise.
+        Strategies whose state does not fit this can override both methods.
+        """
+        return self._snapshot({id(self): self})
+
+    def _snapshot(self, memo):
+        return [(name, _capture(value, memo))
+                for name, value in self.__dict__.items()]
+
+    def restore(self, snapshot):
+        """Brings the player back to the state captured by snapshot."""
+        attributes = self.__dict__
+        attributes.clear()
+        attributes.update(
+            (name, _release(captured)) for name, captured in snapshot)
+
     def reset(self):
         """Resets history.
 
@@ -137,6 +281,6 @@ class Player(object):
         re-written (in the inherited class) and should not only reset history but also
         rest all other attributes.
         """
-        self.history = []
+        self.history = History()
         self.cooperations = 0
         self.defections = 0
@@ -1,5 +1,9 @@
 import math
 import csv
+import json
+import os
+
+import numpy
 
 #from .eigen import *
 from axelrod import payoff as ap, cooperation as ac
@@ -12,8 +16,41 @@ except ImportError:
     from io import StringIO
 
 
+class _Metric(object):
+    """
+    A metric of a ResultSet, computed by the decorated method the first time
+    it is read (or read from the files of a saved ResultSet) and then kept in
+    the instance dictionary, where later reads find it directly, until
+    ResultSet.invalidate discards it.
+    """
+
+    def __init__(self, compute):
+        self.compute = compute
+        self.__name__ = compute.__name__
+        self.__doc__ = compute.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        saved = instance._saved_metrics.pop(self.__name__, None)
+        if saved is None:
+            value = self.compute(instance)
+        else:
+            value = saved()
+        instance.__dict__[self.__name__] = value
+        return value
+
+
 class ResultSet(object):
-    """A class to hold the results of a tournament."""
+    """
+    A class to hold the results of a tournament.
+
+    The metrics are computed when first read rather than all at once, so
+    reading only the ranking does not pay for the cooperation and good
+    partner matrices or the eigenvector ratings. Metrics which cannot be
+    computed (those of a result type missing from the outcome, or the
+    morality metrics when with_morality is False) are None.
+    """
 
     def __init__(self, players, turns, repetitions, outcome,
                  with_morality=True):
@@ -32,48 +69,149 @@ class ResultSet(object):
         self.turns = turns
         self.repetitions = repetitions
         self.outcome = outcome
-        self.results = self._results(outcome)
-        self.scores = None
-        self.normalised_scores = None
-        self.ranking = None
-        self.ranked_names = None
-        self.payoff_matrix = None
-        self.wins = None
-        self.cooperation = None
-        self.normalised_cooperation = None
-        self.vengeful_cooperation = None
-        self.cooperating_rating = None
-        self.good_partner_matrix = None
-        self.good_partner_rating = None
-        self.eigenjesus_rating = None
-        self.eigenmoses_rating = None
-
-        if 'payoff' in self.results:
-            payoff = self.results['payoff']
-            self.scores = ap.scores(payoff)
-            self.normalised_scores = ap.normalised_scores(self.scores, turns)
-            self.ranking = ap.ranking(self.scores)
-            self.ranked_names = ap.ranked_names(players, self.ranking)
-            self.payoff_matrix, self.payoff_stddevs = (ap.normalised_payoff(
-                payoff, turns))
-            self.wins = ap.wins(payoff)
-            self.payoff_diffs_means = ap.payoff_diffs_means(payoff, turns)
-            self.score_diffs = ap.score_diffs(payoff, turns)
-
-        if 'cooperation' in self.results and with_morality:
-            self.cooperation = ac.cooperation(self.results['cooperation'])
-            self.normalised_cooperation = ac.normalised_cooperation(
-                self.cooperation, turns, repetitions)
-            self.vengeful_cooperation = ac.vengeful_cooperation(
-                self.normalised_cooperation)
-            self.cooperating_rating = ac.cooperating_rating(
-                self.cooperation, len(players), turns, repetitions)
-            self.good_partner_matrix = ac.good_partner_matrix(
-                self.results['cooperation'], len(players), repetitions)
-            self.good_partner_rating = ac.good_partner_rating(
-                self.good_partner_matrix, len(players), repetitions)
-            self.eigenjesus_rating = ac.eigenvector(self.normalised_cooperation)
-            self.eigenmoses_rating = ac.eigenvector(self.vengeful_cooperation)
+        self.with_morality = with_morality
+        self.result_arrays = self._result_arrays(outcome)
+        # The arrays of the saved metrics of a loaded ResultSet, and
+        # functions converting them into the metrics (see load).
+        self._saved_arrays = {}
+        self._saved_metrics = {}
+
+    def invalidate(self):
+        """
+        Discards every computed metric, so that they are computed again from
+        the outcome (for instance after it has been changed or replaced) when
+        next read.
+        """
+        self.result_arrays = self._result_arrays(self.outcome)
+        self._saved_arrays = {}
+        self._saved_metrics = {}
+        for name in list(self.__dict__):
+            if isinstance(getattr(type(self), name, None), _Metric):
+                del self.__dict__[name]
+
+    @_Metric
+    def results(self):
+        """The results dictionary (see _results)."""
+        return self._results(self.outcome)
+
+    # The payoff and cooperation functions work on the arrays directly.
+
+    def _payoff(self):
+        return self.result_arrays.get('payoff')
+
+    def _cooperation(self):
+        if not self.with_morality:
+            return None
+        return self.result_arrays.get('cooperation')
+
+    @_Metric
+    def scores(self):
+        payoff = self._payoff()
+        return None if payoff is None else ap.scores(payoff)
+
+    @_Metric
+    def normalised_scores(self):
+        if self.scores is None:
+            return None
+        return ap.normalised_scores(self.scores, self.turns)
+
+    @_Metric
+    def ranking(self):
+        return None if self.scores is None else ap.ranking(self.scores)
+
+    @_Metric
+    def ranked_names(self):
+        if self.ranking is None:
+            return None
+        return ap.ranked_names(self.players, self.ranking)
+
+    @_Metric
+    def _normalised_payoff(self):
+        payoff = self._payoff()
+        if payoff is None:
+            return None, None
+        return ap.normalised_payoff(payoff, self.turns)
+
+    @property
+    def payoff_matrix(self):
+        return self._normalised_payoff[0]
+
+    @property
+    def payoff_stddevs(self):
+        return self._normalised_payoff[1]
+
+    @_Metric
+    def wins(self):
+        payoff = self._payoff()
+        return None if payoff is None else ap.wins(payoff)
+
+    @_Metric
+    def payoff_diffs_means(self):
+        payoff = self._payoff()
+        if payoff is None:
+            return None
+        return ap.payoff_diffs_means(payoff, self.turns)
+
+    @_Metric
+    def score_diffs(self):
+        payoff = self._payoff()
+        return None if payoff is None else ap.score_diffs(payoff, self.turns)
+
+    @_Metric
+    def cooperation(self):
+        cooperation = self._cooperation()
+        return None if cooperation is None else ac.cooperation(cooperation)
+
+    @_Metric
+    def normalised_cooperation(self):
+        if self.cooperation is None:
+            return None
+        return ac.normalised_cooperation(
+            self.cooperation, self.turns, self.repetitions)
+
+    @_Metric
+    def vengeful_cooperation(self):
+        if self.normalised_cooperation is None:
+            return None
+        return ac.vengeful_cooperation(self.normalised_cooperation)
+
+    @_Metric
+    def cooperating_rating(self):
+        if self.cooperation is None:
+            return None
+        return ac.cooperating_rating(
+            self.cooperation, self.nplayers, self.turns, self.repetitions)
+
+    @_Metric
+    def good_partner_matrix(self):
+        cooperation = self._cooperation()
+        if cooperation is None:
+            return None
+        return ac.good_partner_matrix(
+            cooperation, self.nplayers, self.repetitions)
+
+    @_Metric
+    def good_partner_rating(self):
+        if self.good_partner_matrix is None:
+            return None
+        return ac.good_partner_rating(
+            self.good_partner_matrix, self.nplayers, self.repetitions)
+
+    @_Metric
+    def _eigen_ratings(self):
+        # Both ratings are computed in one batch.
+        if self.normalised_cooperation is None:
+            return None, None
+        return ac.eigenvectors(
+            [self.normalised_cooperation, self.vengeful_cooperation])
+
+    @property
+    def eigenjesus_rating(self):
+        return self._eigen_ratings[0]
+
+    @property
+    def eigenmoses_rating(self):
+        return self._eigen_ratings[1]
 
     @property
     def _null_results_matrix(self):
@@ -102,7 +240,7 @@ class ResultSet(object):
         """
         Args:
             outcome(dict): the outcome dictionary, in which the values are
-                lists of the form:
+                (repetitions, n, n) arrays or lists of the form:
 
                     [
                         [[a, b, c], [d, e, f], [g, h, i]],
@@ -126,15 +264,29 @@ class ResultSet(object):
             of player index) which lists values for each repetition.
         """
         results = {}
-        for result_type, result_list in outcome.items():
-            matrix = self._null_results_matrix
-            for index, result_matrix in enumerate(result_list):
-                for i in range(len(self.players)):
-                    for j in range(len(self.players)):
-                        matrix[i][j][index] = result_matrix[i][j]
-                results[result_type] = matrix
+        for result_type, array in self._result_arrays(outcome).items():
+            results[result_type] = array.tolist()
         return results
 
+    def _result_arrays(self, outcome):
+        """
+        Args:
+            outcome(dict): the outcome dictionary, in which the values are
+                (repetitions, n, n) arrays (or nested lists of that shape).
+
+        Returns:
+            A dictionary of (n, n, repetitions) arrays indexed by player,
+            opponent and repetition. These are transposed views of the
+            outcome so no data is copied when the outcome already holds
+            arrays.
+        """
+        arrays = {}
+        for result_type, result_list in outcome.items():
+            if len(result_list):
+                arrays[result_type] = numpy.asarray(
+                    result_list).transpose(1, 2, 0)
+        return arrays
+
     def csv(self):
         csv_string = StringIO()
         header = ",".join(self.ranked_names) + "\n"
@@ -145,3 +297,140 @@ class ResultSet(object):
                     for rank in self.ranking]
             writer.writerow(list(map(str, data)))
         return csv_string.getvalue()
+
+    def save(self, directory):
+        """
+        Writes the outcome arrays and every metric to a directory, as .npy
+        files described by a JSON header, from which load recreates the
+        ResultSet without replaying the tournament. The players are saved by
+        name only.
+
+        Parameters
+        ----------
+        directory : string
+            The directory to write to, which is created if need be.
+        """
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        header = {
+            'format': _SAVE_FORMAT,
+            'players': [str(player) for player in self.players],
+            'turns': self.turns,
+            'repetitions': self.repetitions,
+            'with_morality': self.with_morality,
+            'outcome': [],
+            'metrics': {},
+        }
+        for result_type, array in self.outcome.items():
+            if len(array):
+                numpy.save(_saved_path(directory, 'outcome', result_type),
+                           numpy.asarray(array))
+                header['outcome'].append(result_type)
+
+        for name in _metric_names():
+            value = getattr(self, name)
+            # Pairs of metrics are saved as one file each.
+            parts = value if isinstance(value, tuple) else (value,)
+            if any(part is None for part in parts):
+                continue
+            arrays = [numpy.asarray(part) for part in parts]
+            if any(array.dtype == object for array in arrays):
+                continue
+            for index, array in enumerate(arrays):
+                numpy.save(_saved_path(directory, name, index), array)
+            header['metrics'][name] = (
+                len(arrays) if isinstance(value, tuple) else None)
+
+        with open(os.path.join(directory, _HEADER), 'w') as f:
+            json.dump(header, f, indent=1, sort_keys=True)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """
+        Recreates a ResultSet written by save.
+
+        Only the header is read at once: the outcome arrays and the arrays
+        of the saved metrics are memory-mapped (with the given numpy.load
+        mmap_mode, or read into memory if it is None). A metric is converted
+        from its arrays into lists when first used, and saved_array gives
+        the arrays themselves. The players are their names.
+
+        Parameters
+        ----------
+        directory : string
+            The directory written by save.
+        mmap_mode : string
+            The mmap_mode passed to numpy.load for the outcome and metric
+            arrays.
+
+        Returns
+        -------
+        ResultSet
+        """
+        with open(os.path.join(directory, _HEADER)) as f:
+            header = json.load(f)
+        if header['format'] != _SAVE_FORMAT:
+            raise ValueError(
+                'Unknown result set format %s' % header['format'])
+        outcome = {}
+        for result_type in header['outcome']:
+            outcome[result_type] = numpy.load(
+                _saved_path(directory, 'outcome', result_type),
+                mmap_mode=mmap_mode)
+        result_set = cls(header['players'], header['turns'],
+                         header['repetitions'], outcome,
+                         header['with_morality'])
+        for name, parts in header['metrics'].items():
+            arrays = tuple(
+                numpy.load(_saved_path(directory, name, index),
+                           mmap_mode=mmap_mode)
+                for index in range(1 if parts is None else parts))
+            if parts is None:
+                arrays = arrays[0]
+            result_set._saved_arrays[name] = arrays
+            result_set._saved_metrics[name] = _metric_reader(arrays)
+        return result_set
+
+    def saved_array(self, name):
+        """
+        The arrays a metric was loaded from (see load), without converting
+        them into lists.
+
+        Parameters
+        ----------
+        name : string
+            The name of the metric.
+
+        Returns
+        -------
+        numpy.ndarray, tuple or None
+            The array of the metric, memory-mapped unless the ResultSet was
+            loaded with mmap_mode None, a tuple of arrays for a pair of
+            metrics, or None if the metric was not loaded.
+        """
+        return self._saved_arrays.get(name)
+
+
+_SAVE_FORMAT = 1
+_HEADER = 'header.json'
+
+
+def _saved_path(directory, name, part):
+    return os.path.join(directory, '%s_%s.npy' % (name, part))
+
+
+def _metric_names():
+    """The names of the metrics saved by ResultSet.save: all but results,
+    which is the outcome rearranged."""
+    return sorted(name for name, value in vars(ResultSet).items()
+                  if isinstance(value, _Metric) and name != 'results')
+
+
+def _metric_reader(arrays):
+    """A function converting the arrays of a saved metric into the nested
+    lists it was saved from (or a tuple of them for a pair of metrics)."""
+    def read():
+        if isinstance(arrays, tuple):
+            return tuple(array.tolist() for array in arrays)
+        return arrays.tolist()
+    return read
@@ -1,12 +1,37 @@
 from __future__ import division
+import numpy
 from axelrod import Actions
+from . import cycles, markov, transition_table
+
+
+def player_key(player):
+    """
+    Identifies a player's configuration for the deterministic cache: its
+    class, the arguments it was created with and the match length it was
+    told about (which length-aware strategies such as BackStabber use).
+
+    Returns None if the init arguments cannot be hashed, in which case the
+    player's matches are not cached.
+    """
+    try:
+        init_args = cycles.hashable(player.init_args)
+    except TypeError:
+        return None
+    return (player.__class__, init_args,
+            player.tournament_attributes['length'])
+
 
 class RoundRobin(object):
     """A class to define play a round robin game of players"""
 
     def __init__(self, players, game, turns, deterministic_cache=None,
-                 cache_mutable=True, noise=0):
-        """Initialise the players, game and deterministic cache"""
+                 cache_mutable=True, noise=0, markov_mode=None):
+        """Initialise the players, game and deterministic cache
+
+        markov_mode may be 'exact' or 'stationary' in which case matches
+        between two memory one players are not simulated but scored with
+        their expected outcomes (see axelrod.markov).
+        """
         self.players = players
         self.nplayers = len(players)
         self.game = game
@@ -17,6 +42,7 @@ class RoundRobin(object):
             self.deterministic_cache = deterministic_cache
         self.cache_mutable = cache_mutable
         self._noise = noise
+        self._markov_mode = markov_mode
 
     def play(self):
         """Plays a round robin where each match lasts turns.
@@ -27,12 +53,29 @@ class RoundRobin(object):
         Notice also that we need to handle self-interactions with some special
         exceptions due to the way gameplay is coded within Player.
 
-        Returns the total payoff matrix.
+        Returns the total payoff and cooperation matrices as lists.
         """
-
         payoff = self._empty_matrix(self.nplayers, self.nplayers)
-        cooperation = self._empty_matrix(self.nplayers, self.nplayers)
-
+        cooperation = self._empty_matrix(
+            self.nplayers, self.nplayers, self.cooperation_dtype)
+        self.play_into(payoff, cooperation)
+        return {'payoff': payoff.tolist(), 'cooperation': cooperation.tolist()}
+
+    def play_into(self, payoff, cooperation):
+        """Plays the round robin, writing the results into the given arrays.
+
+        Parameters
+        ----------
+        payoff, cooperation : numpy.ndarray
+            Preallocated n x n arrays (typically one repetition of a
+            tournament's outcome) to hold the total payoff and cooperation
+            of each player (row) against each opponent (column).
+
+        Returns
+        -------
+        dict
+            The payoff and cooperation arrays.
+        """
         for player1_index in range(self.nplayers):
             for player2_index in range(player1_index, self.nplayers):
                 scores, cooperation_rates = self._score_single_interaction(
@@ -43,24 +86,80 @@ class RoundRobin(object):
 
         return {'payoff': payoff, 'cooperation': cooperation}
 
-    def _empty_matrix(self, rows, columns):
-        return [[0 for j in range(columns)] for i in range(rows)]
+    @property
+    def cooperation_dtype(self):
+        """Cooperation counts are integers unless expectations are used."""
+        if self._markov_mode is None:
+            return numpy.int64
+        return numpy.float64
+
+    def _empty_matrix(self, rows, columns, dtype=numpy.float64):
+        return numpy.zeros((rows, columns), dtype=dtype)
 
     def _score_single_interaction(self, player1_index, player2_index):
-        player1, player2, classes = self._pair_of_players(
+        player1, player2, key = self._pair_of_players(
             player1_index, player2_index)
+        if self._markov_interaction(player1, player2):
+            return markov.expected_outcome(
+                player1, player2, self.game, self.turns, self._noise,
+                stationary=self._markov_mode == 'stationary')
         play_required = (
             self._stochastic_interaction(player1, player2) or
-            classes not in self.deterministic_cache)
+            key not in self.deterministic_cache)
         if play_required:
             scores, cooperation_rates = self._play_single_interaction(
-                player1, player2, classes)
+                player1, player2, key)
         else:
-            scores = self.deterministic_cache[classes]['scores']
+            scores = self.deterministic_cache[key]['scores']
             cooperation_rates = (
-                self.deterministic_cache[classes]['cooperation_rates'])
+                self.deterministic_cache[key]['cooperation_rates'])
         return scores, cooperation_rates
 
+    def _cache_key(self, player1, player2):
+        """
+        The deterministic cache key of a match: the configuration of both
+        players, the number of turns and the game matrix. A cache can thus
+        hold the results of many tournament configurations at once.
+
+        None (which is never stored) if either player cannot be keyed.
+        """
+        key1, key2 = player_key(player1), player_key(player2)
+        if key1 is None or key2 is None:
+            return None
+        return (key1, key2, self.turns, self.game.RPST())
+
+    def _repeatable_interaction(self, player1_index, player2_index):
+        """Whether every repetition of an interaction has the same outcome."""
+        player1 = self.players[player1_index]
+        player2 = self.players[player2_index]
+        return (
+            self._markov_interaction(player1, player2) or
+            not self._stochastic_interaction(player1, player2))
+
+    def _cached_outcome(self, player1_index, player2_index):
+        """The scores and cooperation rates of an interaction if they are
+        held in the deterministic cache, otherwise None."""
+        player1 = self.players[player1_index]
+        player2 = self.players[player2_index]
+        key = self._cache_key(player1, player2)
+        if (self._markov_interaction(player1, player2) or
+                self._stochastic_interaction(player1, player2) or
+                key not in self.deterministic_cache):
+            return None
+        cached = self.deterministic_cache[key]
+        return cached['scores'], cached['cooperation_rates']
+
+    def _cache_outcome(self, player1_index, player2_index, scores,
+                       cooperation_rates):
+        """Adds the outcome of an interaction played elsewhere (for example
+        by a worker process) to the deterministic cache if appropriate."""
+        player1 = self.players[player1_index]
+        player2 = self.players[player2_index]
+        if (not self._markov_interaction(player1, player2) and
+                self._cache_update_required(player1, player2)):
+            self._store(self._cache_key(player1, player2), scores,
+                        cooperation_rates)
+
     def _update_matrices(self, player1_index, player2_index, scores,
                          payoffs, cooperation_rates, cooperation):
         # For self-interactions we can take the average of the two
@@ -77,13 +176,11 @@ class RoundRobin(object):
 
     def _pair_of_players(self, player1_index, player2_index):
         player1 = self.players[player1_index]
-        class1 = player1.__class__
         if player1_index == player2_index:
             player2 = player1.clone()
         else:
             player2 = self.players[player2_index]
-        class2 = player2.__class__
-        return player1, player2, (class1, class2)
+        return player1, player2, self._cache_key(player1, player2)
 
     def _stochastic_interaction(self, player1, player2):
         return (
@@ -91,31 +188,51 @@ class RoundRobin(object):
             player1.classifier['stochastic'] or
             player2.classifier['stochastic'])
 
-    def _play_single_interaction(self, player1, player2, classes):
-        turn = 0
+    def _markov_interaction(self, player1, player2):
+        return (
+            self._markov_mode is not None and
+            markov.is_memory_one(player1) and
+            markov.is_memory_one(player2))
+
+    def _cycles_interaction(self, player1, player2):
+        """Whether a match can stop being played once it becomes periodic
+        (see axelrod.cycles)."""
+        return (
+            not self._noise and
+            cycles.finite_memory(player1) and
+            cycles.finite_memory(player2))
+
+    def _play_single_interaction(self, player1, player2, key):
         player1.reset()
         player2.reset()
-        while turn < self.turns:
-            turn += 1
-            player1.play(player2, self._noise)
-        scores = self._calculate_scores(player1, player2)
-        cooperation_rates = (
-            self._calculate_cooperation(player1),
-            self._calculate_cooperation(player2))
+        if self._cycles_interaction(player1, player2):
+            tables = (transition_table.transition_table(player1),
+                      transition_table.transition_table(player2))
+            if None in tables:
+                cycles.play_with_cycles(player1, player2, self.turns)
+            else:
+                transition_table.play_tables(
+                    player1, player2, tables[0], tables[1], self.turns)
+        else:
+            turn = 0
+            while turn < self.turns:
+                turn += 1
+                player1.play(player2, self._noise)
+        scores, cooperation_rates, _ = self.game.score_histories(
+            player1.history, player2.history)
         if self._cache_update_required(player1, player2):
-            self.deterministic_cache[classes] = {
+            self._store(key, scores, cooperation_rates)
+        return scores, cooperation_rates
+
+    def _store(self, key, scores, cooperation_rates):
+        if key is not None:
+            self.deterministic_cache[key] = {
                 'scores': scores,
                 'cooperation_rates': cooperation_rates}
-        return scores, cooperation_rates
 
     def _calculate_scores(self, p1, p2):
         """Calculates the score for two players based their history"""
-        s1, s2 = 0, 0
-        for pair in zip(p1.history, p2.history):
-            score = self.game.score(pair)
-            s1 += score[0]
-            s2 += score[1]
-        return s1, s2
+        return self.game.score_histories(p1.history, p2.history)[0]
 
     def _cache_update_required(self, p1, p2):
         return (
@@ -0,0 +1,81 @@
+"""
+Tournament outcomes held in shared memory.
+
+Worker processes attach to the payoff and cooperation arrays of a tournament
+and write the result of every match straight into them, so that only small
+completion messages need to pass through the done queue.
+"""
+
+import numpy
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+
+def shared_memory_available():
+    return shared_memory is not None
+
+
+def share_resource_tracker():
+    """Starts the resource tracker, which processes forked afterwards then
+    share. Otherwise each worker would start its own and, when exiting,
+    report the blocks it attached to as leaked."""
+    if shared_memory_available():
+        resource_tracker.ensure_running()
+
+
+class SharedOutcome(object):
+    """The arrays of an outcome dictionary backed by shared memory blocks.
+
+    The process creating a SharedOutcome owns the blocks and must call
+    close() once the workers are done with them; workers attach to existing
+    blocks with SharedOutcome.attach(spec).
+    """
+
+    def __init__(self, blocks, specification, owner):
+        self._blocks = blocks
+        self.specification = specification
+        self._owner = owner
+        self.arrays = {}
+        for key, (name, shape, dtype) in specification.items():
+            self.arrays[key] = numpy.ndarray(
+                shape, dtype=dtype, buffer=blocks[key].buf)
+
+    @classmethod
+    def create(cls, outcome):
+        """Copies each array of an outcome dictionary into a new block."""
+        blocks = {}
+        specification = {}
+        for key, array in outcome.items():
+            blocks[key] = shared_memory.SharedMemory(
+                create=True, size=max(array.nbytes, 1))
+            specification[key] = (
+                blocks[key].name, array.shape, array.dtype.str)
+        shared = cls(blocks, specification, owner=True)
+        for key, array in outcome.items():
+            shared.arrays[key][...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, specification):
+        """Attaches to the blocks described by another SharedOutcome's
+        specification (which is small enough to pass through a queue)."""
+        blocks = {}
+        for key, (name, shape, dtype) in specification.items():
+            blocks[key] = shared_memory.SharedMemory(name=name)
+        return cls(blocks, specification, owner=False)
+
+    def copy_to(self, outcome):
+        for key, array in self.arrays.items():
+            outcome[key][...] = array
+
+    def close(self):
+        # The views must go before the blocks can be closed.
+        self.arrays = {}
+        for block in self._blocks.values():
+            block.close()
+            if self._owner:
+                block.unlink()
+        self._blocks = {}
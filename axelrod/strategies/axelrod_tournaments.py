@@ -232,7 +232,7 @@ class Tullock(Player):
         rounds = self._rounds_to_cooperate
         if len(self.history) < rounds:
             return C
-        cooperate_count = opponent.history[-rounds:].count(C)
+        cooperate_count = opponent.history.tail_count(rounds, C)
         prop_cooperate = cooperate_count / float(rounds)
         prob_cooperate = max(0, prop_cooperate - 0.10)
         return random_choice(prob_cooperate)
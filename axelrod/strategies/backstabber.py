@@ -53,7 +53,7 @@ class DoubleCrosser(Player):
             return D
         if len(opponent.history) < 180:
             if len(opponent.history) > cutoff:
-                if D not in opponent.history[:cutoff + 1]:
+                if D not in opponent.history.window(0, cutoff + 1):
                     if opponent.history[-2:] != [D, D]:  # Fail safe
                         return C
         if opponent.defections > 3:
@@ -1,5 +1,4 @@
-import inspect
-from axelrod import Player, Actions
+from axelrod import Player, Actions, strategy_caller
 
 C, D = Actions.C, Actions.D
 
@@ -42,7 +41,7 @@ class Darwin(Player):
     def strategy(self, opponent):
         # Frustrate psychics and ensure that simulated rounds
         # do not influence genome.
-        if inspect.stack()[1][3] not in Darwin.valid_callers:
+        if strategy_caller() not in Darwin.valid_callers:
             return C
 
         trial = len(self.history)
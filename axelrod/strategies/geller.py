@@ -19,9 +19,8 @@ This is almost certainly cheating, and more than likely against the
 spirit of the 'competition' :-)
 """
 
-import inspect
-
-from axelrod import Player, Actions, random_choice
+from axelrod import (
+    Player, Actions, random_choice, strategy_caller, call_strategy)
 
 C, D = Actions.C, Actions.D
 
@@ -47,13 +46,10 @@ class Geller(Player):
         that gives the least jail time, which is is equivalent to playing the same
         strategy as that which the opponent will play.
         """
-        curframe = inspect.currentframe()
-        calframe = inspect.getouterframes(curframe, 2)
-        calname = calframe[1][3]
-        if calname == 'strategy':
+        if strategy_caller() == 'strategy':
             return self.default()
         else:
-            return opponent.strategy(self)
+            return call_strategy(opponent, self, 'strategy')
 
 
 class GellerCooperator(Geller):
@@ -43,9 +43,12 @@ class GoByMajority(Player):
         """
 
         memory = self.classifier['memory_depth']
-        history = opponent.history[-memory:]
-        defections = sum([s == D for s in history])
-        cooperations = sum([s == C for s in history])
+        if memory:
+            defections = opponent.history.tail_count(memory, D)
+            cooperations = opponent.history.tail_count(memory, C)
+        else:
+            defections = opponent.history.count(D)
+            cooperations = opponent.history.count(C)
         if defections > cooperations:
             return D
         if defections == cooperations:
@@ -33,6 +33,208 @@ def detect_cycle(history, min_size=1, offset=0):
     return None
 
 
+class CycleDetector(object):
+    """
+    Gives the result of detect_cycle(history, min_size) for a history which
+    grows one move at a time, at amortized constant cost per move.
+
+    detect_cycle returns the shortest cycle of length i >= min_size, with
+    i < len(history) // 2, which all moves but the last repeat. The moves are
+    fed to a Knuth-Morris-Pratt failure function, from which the shortest
+    period p of those moves follows directly. The shortest allowed period is
+    then the first multiple of p which is at least min_size: by the
+    periodicity lemma of Fine and Wilf, no period below half the length can
+    be anything else.
+    """
+
+    def __init__(self, min_size=1):
+        self.min_size = min_size
+        self._source = None
+        self._moves = []
+        # The length of the longest proper border of each prefix of the moves
+        self._borders = [0]
+
+    def update(self, history):
+        """Feeds the moves of history not seen yet (starting afresh if it is
+        not the history fed so far) and returns the cycle detected."""
+        if history is not self._source or len(history) < len(self._moves):
+            self.__init__(self.min_size)
+            self._source = history
+        for move in history[len(self._moves):]:
+            self.feed(move)
+        return self.cycle()
+
+    def snapshot(self):
+        """The state of the detector, for Player.snapshot."""
+        # Starting afresh makes new lists, so the lists are kept as well.
+        return self._source, self._moves, self._borders, len(self._moves)
+
+    def restore(self, snapshot):
+        self._source, self._moves, self._borders, length = snapshot
+        del self._moves[length:]
+        del self._borders[length + 1:]
+
+    def feed(self, move):
+        moves, borders = self._moves, self._borders
+        moves.append(move)
+        border = 0
+        if len(moves) > 1:
+            border = borders[-1]
+            while border and moves[border] != move:
+                border = borders[border]
+            if moves[border] == move:
+                border += 1
+        borders.append(border)
+
+    def cycle(self):
+        length = len(self._moves)
+        if length < 2:
+            return None
+        period = (length - 1) - self._borders[length - 1]
+        size = period * -(-self.min_size // period)
+        if size < length // 2:
+            return tuple(self._moves[:size])
+        return None
+
+
+class TransitionCounter(object):
+    """
+    Counts the turns on which one player's move was followed by the same move
+    from the other player on the next turn, for a pair of histories which grow
+    one move at a time, at constant cost per move.
+
+    All but the most recent transition are kept as running counts (the last
+    one is added when asked for, so that a move which is popped and played
+    again, as mindreader does, is never counted twice). The counts start
+    afresh if either history is replaced or shrinks below what was counted.
+    """
+
+    def __init__(self):
+        self._sources = (None, None)
+        self._counted = 0
+        self._counts = {C: 0, D: 0}
+
+    def snapshot(self):
+        """The state of the counter, for Player.snapshot."""
+        return self._sources, self._counted, dict(self._counts)
+
+    def restore(self, snapshot):
+        self._sources, self._counted, counts = snapshot
+        self._counts = dict(counts)
+
+    def update(self, history, opponent_history):
+        """Returns the number of i < len(history) - 1 with history[i] ==
+        opponent_history[i + 1] == C, and the same number for D."""
+        settled = max(len(history) - 2, 0)
+        if (history is not self._sources[0] or
+                opponent_history is not self._sources[1] or
+                settled < self._counted):
+            self.__init__()
+            self._sources = (history, opponent_history)
+        counts = self._counts
+        for i in range(self._counted, settled):
+            move = history[i]
+            if move in counts and opponent_history[i + 1] == move:
+                counts[move] += 1
+        self._counted = settled
+        countCC, countDD = counts[C], counts[D]
+        if len(history) > 1:
+            move = history[-2]
+            if opponent_history[len(history) - 1] == move:
+                if move == C:
+                    countCC += 1
+                elif move == D:
+                    countDD += 1
+        return countCC, countDD
+
+
+class AlternationDetector(object):
+    """
+    Tells whether a history which grows one move at a time has alternated
+    between moves throughout, at constant cost per move.
+
+    As for TransitionCounter, the most recent move is checked afresh each
+    time and the check starts over if the history is replaced or shrinks.
+    """
+
+    def __init__(self):
+        self._source = None
+        self._checked = 0
+        self._alternating = True
+
+    def snapshot(self):
+        """The state of the detector, for Player.snapshot."""
+        return self._source, self._checked, self._alternating
+
+    def restore(self, snapshot):
+        self._source, self._checked, self._alternating = snapshot
+
+    def update(self, history):
+        """Whether history[i] != history[i + 1] for every
+        i < len(history) - 1."""
+        settled = max(len(history) - 1, 0)
+        if history is not self._source or settled < self._checked:
+            self.__init__()
+            self._source = history
+        if self._alternating:
+            for i in range(max(self._checked, 1), settled):
+                if history[i] == history[i - 1]:
+                    self._alternating = False
+                    break
+        self._checked = settled
+        if not self._alternating:
+            return False
+        return len(history) < 2 or history[-1] != history[-2]
+
+
+class CooperationCounter(object):
+    """
+    Counts the cooperations of two players over any window of turns, using
+    prefix sums of their combined cooperations which grow by one entry per
+    move. As for TransitionCounter, the most recent turn is not stored and
+    the sums start afresh if either history is replaced or shrinks.
+    """
+
+    def __init__(self):
+        self._sources = (None, None)
+        # The cooperations of both players over the first i turns
+        self._prefix = [0]
+        self._last = 0
+
+    def snapshot(self):
+        """The state of the counter, for Player.snapshot."""
+        return self._sources, self._prefix, len(self._prefix), self._last
+
+    def restore(self, snapshot):
+        self._sources, self._prefix, length, self._last = snapshot
+        del self._prefix[length:]
+
+    def update(self, history, opponent_history):
+        settled = max(len(history) - 1, 0)
+        if (history is not self._sources[0] or
+                opponent_history is not self._sources[1] or
+                settled < len(self._prefix) - 1):
+            self.__init__()
+            self._sources = (history, opponent_history)
+        prefix = self._prefix
+        for i in range(len(prefix) - 1, settled):
+            prefix.append(
+                prefix[-1] + (history[i] == C) + (opponent_history[i] == C))
+        self._last = prefix[-1]
+        if len(history) > settled:
+            self._last += (history[-1] == C) + (opponent_history[-1] == C)
+
+    def cooperations(self, start, stop):
+        """The cooperations of both players over turns start to stop - 1,
+        for 0 <= start <= stop <= the length of the last update."""
+        return self._sum(stop) - self._sum(start)
+
+    def _sum(self, turns):
+        if turns < len(self._prefix):
+            return self._prefix[turns]
+        return self._last
+
+
 class DefectorHunter(Player):
     """A player who hunts for defectors."""
 
@@ -81,12 +283,20 @@ class AlternatorHunter(Player):
         'manipulates_state': False
     }
 
+    def __init__(self):
+        Player.__init__(self)
+        self.alternation_detector = AlternationDetector()
+
     def strategy(self, opponent):
-        oh = opponent.history
-        if len(self.history) >= 6 and all([oh[i] != oh[i+1] for i in range(len(oh)-1)]):
+        if (len(self.history) >= 6 and
+                self.alternation_detector.update(opponent.history)):
             return D
         return C
 
+    def reset(self):
+        Player.reset(self)
+        self.alternation_detector = AlternationDetector()
+
 
 class CycleHunter(Player):
     """Hunts strategies that play cyclically, like any of the Cyclers,
@@ -101,14 +311,21 @@ class CycleHunter(Player):
         'manipulates_state': False
     }
 
-    @staticmethod
-    def strategy(opponent):
-        cycle = detect_cycle(opponent.history, min_size=2)
+    def __init__(self):
+        Player.__init__(self)
+        self.cycle_detector = CycleDetector(min_size=2)
+
+    def strategy(self, opponent):
+        cycle = self.cycle_detector.update(opponent.history)
         if cycle:
             if len(set(cycle)) > 1:
                 return D
         return C
 
+    def reset(self):
+        Player.reset(self)
+        self.cycle_detector = CycleDetector(min_size=2)
+
 
 class EventualCycleHunter(Player):
     """Hunts strategies that eventually play cyclically"""
@@ -145,6 +362,10 @@ class MathConstantHunter(Player):
         'manipulates_state': False
     }
 
+    def __init__(self):
+        Player.__init__(self)
+        self.cooperation_counter = CooperationCounter()
+
     def strategy(self, opponent):
         """
         Check whether the number of cooperations in the first and second halves
@@ -155,13 +376,14 @@ class MathConstantHunter(Player):
 
         n = len(self.history)
         if n >= 8 and opponent.cooperations and opponent.defections:
+            self.cooperation_counter.update(self.history, opponent.history)
 
             start1, end1 = 0, n // 2
             start2, end2 = n // 4, 3 * n // 4
             start3, end3 = n // 2, n
-            count1 = opponent.history[start1: end1].count(C) + self.history[start1: end1].count(C)
-            count2 = opponent.history[start2: end2].count(C) + self.history[start2: end2].count(C)
-            count3 = opponent.history[start3: end3].count(C) + self.history[start3: end3].count(C)
+            count1 = self.cooperation_counter.cooperations(start1, end1)
+            count2 = self.cooperation_counter.cooperations(start2, end2)
+            count3 = self.cooperation_counter.cooperations(start3, end3)
             ratio1 = 0.5 * count1 / (end1 - start1)
             ratio2 = 0.5 * count2 / (end2 - start2)
             ratio3 = 0.5 * count3 / (end3 - start3)
@@ -170,6 +392,10 @@ class MathConstantHunter(Player):
 
         return C
 
+    def reset(self):
+        Player.reset(self)
+        self.cooperation_counter = CooperationCounter()
+
 
 class RandomHunter(Player):
     """A player who hunts for random players."""
@@ -183,6 +409,10 @@ class RandomHunter(Player):
         'manipulates_state': False
     }
 
+    def __init__(self):
+        Player.__init__(self)
+        self.transition_counter = TransitionCounter()
+
     def strategy(self, opponent):
         """
         A random player is unpredictable, which means the conditional frequency
@@ -192,15 +422,22 @@ class RandomHunter(Player):
 
         n = len(self.history)
         if n > 10:
+            countCC, countDD = self.transition_counter.update(
+                self.history, opponent.history)
+            # The moves before the last one
+            cooperations = self.history.count(C) - (self.history[-1] == C)
+            defections = self.history.count(D) - (self.history[-1] == D)
             probabilities = []
-            if self.history[:-1].count(C) > 5:
-                countCC = len([i for i in range(n-1) if self.history[i] == "C" and opponent.history[i+1] == "C"])
-                probabilities.append(1.0 * countCC / self.history[:-1].count("C"))
-            if self.history[:-1].count(D) > 5:
-                countDD = len([i for i in range(n-1) if self.history[i] == "D" and opponent.history[i+1] == "D"])
-                probabilities.append(1.0 * countDD / self.history[:-1].count("D"))
+            if cooperations > 5:
+                probabilities.append(1.0 * countCC / cooperations)
+            if defections > 5:
+                probabilities.append(1.0 * countDD / defections)
 
             if probabilities and all([abs(p - 0.5) < 0.25 for p in probabilities]):
                 return D
 
         return C
+
+    def reset(self):
+        Player.reset(self)
+        self.transition_counter = TransitionCounter()
@@ -22,9 +22,10 @@ class Inverse(Player):
         If so, player defection is inversely proportional to when this occurred.
         """
 
-        index = next((index for index, value in enumerate(opponent.history, start=1) if value == D), None)
-
-        if index is None:
+        # The history keeps a running count of defections and finds the
+        # first one without a Python level scan.
+        if not opponent.history.count(D):
             return C
+        index = opponent.history.index(D) + 1
 
         return random_choice(1 - 1 / float(abs(index)))
@@ -1,4 +1,11 @@
-from axelrod import Player, obey_axelrod, Actions
+import operator
+import random
+
+import numpy
+
+from axelrod import Player, obey_axelrod, update_histories, Actions
+from axelrod.cycles import hashable
+from axelrod.transition_table import transition_table
 from ._strategies import strategies
 from .hunter import DefectorHunter, AlternatorHunter, RandomHunter, MathConstantHunter, CycleHunter, EventualCycleHunter
 from .cooperator import Cooperator
@@ -7,6 +14,110 @@ from .cooperator import Cooperator
 ordinary_strategies = [s for s in strategies if obey_axelrod(s)]
 C, D = Actions.C, Actions.D
 
+_CODES = {C: 0, D: 1}
+_MOVES = (C, D)
+
+# Whether the strategy of each configuration (class and init args) of a
+# deterministic player draws random numbers, as found by _draws_random.
+_draws = {}
+
+
+def _draws_random(player):
+    """
+    Whether a player draws random numbers while playing, even though its
+    moves do not depend on them (as WinStayLoseShift, a memory one player
+    with probabilities 0 and 1). Such members are still asked for their
+    moves so that seeded matches are unchanged.
+    """
+    key = (player.__class__, hashable(player.init_args))
+    if key not in _draws:
+        clone, opponent = player.clone(), Player()
+        state = random.getstate()
+        try:
+            for move in (C, D, C):
+                clone.strategy(opponent)
+                update_histories(clone, opponent, move, move)
+            _draws[key] = random.getstate() != state
+        finally:
+            random.setstate(state)
+    return _draws[key]
+
+
+class TeamEvaluator(object):
+    """
+    Gives the moves of every member of a team for the histories of the meta
+    player and its opponent.
+
+    Members which can be compiled into lookup tables (see
+    axelrod.transition_table) are never asked for their moves. Members with
+    the same memory depth share the index of their table entry, and the
+    moves of all their distinct tables are precomputed for each index, so
+    that members which behave identically are looked up once and a whole
+    group costs one lookup. The other members share the meta player's
+    history and each has its strategy called, in team order, so that the
+    random numbers they draw are drawn in the same order as when every
+    member was asked.
+    """
+
+    def __init__(self, team):
+        self.team = team
+        self.size = len(team)
+        # The members to ask
+        self._called = []
+        # (table, moves of each distinct table for each index) per memory
+        self._groups = []
+        # The position of each member's move in the list of the answers of
+        # the members asked followed by the moves of the groups
+        positions = [None] * self.size
+        tables = {}
+        for index, player in enumerate(team):
+            table = transition_table(player)
+            if table is not None and not _draws_random(player):
+                tables.setdefault(table.memory, []).append((index, table))
+                continue
+            positions[index] = len(self._called)
+            self._called.append(player)
+        offset = len(self._called)
+        for memory in sorted(tables):
+            distinct = []
+            for index, table in tables[memory]:
+                if table.moves not in distinct:
+                    distinct.append(table.moves)
+                positions[index] = offset + distinct.index(table.moves)
+            offset += len(distinct)
+            self._groups.append((tables[memory][0][1], [
+                tuple(_MOVES[moves[state]] for moves in distinct)
+                for state in range(len(distinct[0]))]))
+        if self.size == 1:
+            self._arrange = lambda moves: (moves[positions[0]],)
+        elif self.size:
+            self._arrange = operator.itemgetter(*positions)
+        else:
+            self._arrange = lambda moves: ()
+
+    def snapshot(self):
+        """For Player.snapshot: the evaluator itself does not change once
+        built (the state of the members is captured with the team)."""
+        return None
+
+    def restore(self, snapshot):
+        pass
+
+    def moves(self, player, opponent):
+        """The moves of the members, as a tuple in team order."""
+        moves = []
+        for member in self._called:
+            # The history is shared, so it only needs handing over again
+            # after a reset.
+            if member.history is not player.history:
+                member.history = player.history
+            moves.append(member.strategy(opponent))
+        for table, moves_by_state in self._groups:
+            moves.extend(moves_by_state[
+                table.state(player.history, opponent.history)])
+        return self._arrange(moves)
+
+
 class MetaPlayer(Player):
     """A generic player that has its own team of players."""
 
@@ -37,14 +148,20 @@ class MetaPlayer(Player):
                     'manipulates_state']:
             self.classifier[key] = (any([t.classifier[key] for t in self.team]))
 
-    def strategy(self, opponent):
+        self._evaluator = None
 
-        # Make sure the history of all hunters is current.
-        for ih in range(len(self.team)):
-            self.team[ih].history = self.history
+    def team_moves(self, opponent):
+        """The moves of all our players, in team order."""
+        evaluator = self._evaluator
+        if (evaluator is None or evaluator.team is not self.team or
+                evaluator.size != len(self.team)):
+            evaluator = self._evaluator = TeamEvaluator(self.team)
+        return evaluator.moves(self, opponent)
+
+    def strategy(self, opponent):
 
         # Get the results of all our players.
-        results = [player.strategy(opponent) for player in self.team]
+        results = self.team_moves(opponent)
 
         # A subclass should just define a way to choose the result based on team results.
         return self.meta_strategy(results, opponent)
@@ -120,35 +237,43 @@ class MetaWinner(MetaPlayer):
         super(MetaWinner, self).__init__()
         self.init_args = (team,)
 
-        # For each player, we will keep the history of proposed moves and
-        # a running score since the beginning of the game.
-        for t in self.team:
-            t.proposed_history = []
-            t.score = 0
+        # For each player, we will keep a running score since the beginning
+        # of the game and the move it proposed last.
+        self.scores = numpy.zeros(self.nteam)
+        self._proposals = None
+        self._payoffs = None
+
+    def _payoff_matrix(self):
+        """Our payoffs, indexed by the codes of our move and the opponent's
+        move."""
+        R, P, S, T = self.tournament_attributes["game"].RPST()
+        if self._payoffs is None or self._payoffs[1] != (R, P, S, T):
+            self._payoffs = (numpy.array([[R, S], [T, P]]), (R, P, S, T))
+        return self._payoffs[0]
 
     def strategy(self, opponent):
 
         # Update the running score for each player, before determining the next move.
         if len(self.history):
-            for player in self.team:
-                game = self.tournament_attributes["game"]
-                last_round = (player.proposed_history[-1], opponent.history[-1])
-                s = game.scores[last_round][0]
-                player.score += s
+            opponent_move = _CODES[opponent.history[-1]]
+            self.scores += self._payoff_matrix()[self._proposals, opponent_move]
         return super(MetaWinner, self).strategy(opponent)
 
-    def meta_strategy(self, results, opponent):
+    def team_moves(self, opponent):
+        results = super(MetaWinner, self).team_moves(opponent)
+        if len(self.scores) != len(results):
+            self.scores = numpy.zeros(len(results))
+        # The proposals are scored on the next turn, once meta_strategy has
+        # chosen using the scores accumulated until now.
+        self._proposals = numpy.fromiter(
+            map(_CODES.__getitem__, results), numpy.intp, len(results))
+        return results
 
-        scores = [pl.score for pl in self.team]
-        bestscore = max(scores)
-        beststrategies = [i for i, pl in enumerate(self.team) if pl.score == bestscore]
-        bestproposals = [results[i] for i in beststrategies]
-        bestresult = C if C in bestproposals else D
+    def meta_strategy(self, results, opponent):
 
-        # Update each player's proposed history with his proposed result, but always after
-        # the new result has been settled based on scores accumulated until now.
-        for r, t in zip(results, self.team):
-            t.proposed_history.append(r)
+        scores = self.scores
+        best = scores == scores.max()
+        bestresult = C if (self._proposals[best] == _CODES[C]).any() else D
 
         if opponent.defections == 0:
             # Don't poke the bear
@@ -46,7 +46,7 @@ class MindWarper(Player):
         if name == 'strategy':
             pass
         else:
-            self.__dict__[name] = val
+            super(MindWarper, self).__setattr__(name, val)
 
     @staticmethod
     def strategy(opponent):
@@ -1,14 +1,14 @@
-import copy
-import inspect
-
-from axelrod import Player, RoundRobin, update_histories, Actions
+from axelrod import (
+    Player, update_histories, Actions, strategy_caller, call_strategy)
+from axelrod.cycles import attribute_state, finite_memory, hashable
 
 C, D = Actions.C, Actions.D
 
 def simulate_match(player_1, player_2, strategy, rounds=10):
     """Simulates a number of matches."""
     for match in range(rounds):
-        play_1, play_2 = strategy, player_2.strategy(player_1)
+        play_1 = strategy
+        play_2 = call_strategy(player_2, player_1, 'simulate_match')
         # Update histories and counts
         update_histories(player_1, player_2, play_1, play_2)
 
@@ -21,23 +21,59 @@ def roll_back_history(player, rounds):
         elif play == D:
             player.defections -= 1
 
-def look_ahead(player_1, player_2, game, rounds=10):
-    """Looks ahead for `rounds` and selects the next strategy appropriately."""
+def _look_ahead_key(player_1, player_2, game, rounds):
+    """The key under which the choice of look_ahead is memoized, or None if
+    the opponent's replies may depend on more than its last few moves and
+    its attributes."""
+    if not finite_memory(player_2):
+        return None
+    try:
+        attributes = attribute_state(player_2)
+    except TypeError:
+        return None
+    memory = int(player_2.classifier['memory_depth'])
+    return (player_2.__class__, hashable(player_2.init_args), memory,
+            player_2.tournament_attributes['length'],
+            player_1.history.tail_bytes(memory),
+            player_2.history.tail_bytes(memory), attributes, game.RPST(),
+            rounds)
+
+def look_ahead(player_1, player_2, game, rounds=10, choices=None):
+    """Looks ahead for `rounds` and selects the next strategy appropriately.
+
+    The opponent plays the simulated rounds itself and is then restored with
+    Player.snapshot and Player.restore. Only the scores of the simulated
+    rounds are compared, as the rounds already played count the same for
+    both strategies.
+
+    If a choices dictionary is given, the choices against opponents whose
+    replies follow from their last few moves and their attributes (see
+    axelrod.cycles.finite_memory) are memoized in it."""
+    key = None
+    if choices is not None:
+        key = _look_ahead_key(player_1, player_2, game, rounds)
+        if key in choices:
+            return choices[key]
+
     results = []
+    snapshot = player_2.snapshot()
 
     # Simulate plays for `rounds` rounds
     strategies = [C, D]
     for strategy in strategies:
-        opponent_ = copy.deepcopy(player_2) # need deepcopy here
-        round_robin = RoundRobin(players=[player_1, opponent_], game=game,
-                                 turns=rounds)
-        simulate_match(player_1, opponent_, strategy, rounds)
-        results.append(round_robin._calculate_scores(player_1, opponent_)[0])
+        simulate_match(player_1, player_2, strategy, rounds)
+        results.append(sum(
+            game.score(pair)[0] for pair in
+            zip(player_1.history[-rounds:], player_2.history[-rounds:])))
 
         # Restore histories and counts
         roll_back_history(player_1, rounds)
+        player_2.restore(snapshot)
 
-    return strategies[results.index(max(results))]
+    choice = strategies[results.index(max(results))]
+    if key is not None:
+        choices[key] = choice
+    return choice
 
 
 class MindReader(Player):
@@ -52,6 +88,11 @@ class MindReader(Player):
         'manipulates_state': False
     }
 
+    def __init__(self):
+        super(MindReader, self).__init__()
+        # The choices of look_ahead during the current match
+        self.look_ahead_choices = {}
+
     def strategy(self, opponent):
         """Pretends to play the opponent a number of times before each match.
         The primary purpose is to look far enough ahead to see if a defect will
@@ -62,19 +103,20 @@ class MindReader(Player):
         in this method, by defecting if the method is called by strategy
         """
 
-        curframe = inspect.currentframe()
-        calframe = inspect.getouterframes(curframe, 2)
-        calname = calframe[1][3]
-
-        if calname in ('strategy', 'simulate_match'):
+        if strategy_caller() in ('strategy', 'simulate_match'):
             return D
 
         game = self.tournament_attributes["game"]
 
-        best_strategy = look_ahead(self, opponent, game)
+        best_strategy = look_ahead(
+            self, opponent, game, choices=self.look_ahead_choices)
 
         return best_strategy
 
+    def reset(self):
+        Player.reset(self)
+        self.look_ahead_choices = {}
+
 
 class ProtectedMindReader(MindReader):
     """A player that looks ahead at what the opponent will do and decides what to do.
@@ -95,7 +137,7 @@ class ProtectedMindReader(MindReader):
         if name == 'strategy':
             pass
         else:
-            self.__dict__[name] = val
+            super(ProtectedMindReader, self).__setattr__(name, val)
 
 class MirrorMindReader(ProtectedMindReader):
     """A player that will mirror whatever strategy it is playing against by cheating
@@ -118,11 +160,7 @@ class MirrorMindReader(ProtectedMindReader):
         or bender by cooperating.
         """
 
-        curframe = inspect.currentframe()
-        calframe = inspect.getouterframes(curframe, 2)
-        calname = calframe[1][3]
-
-        if calname in ('strategy', 'simulate_match'):
+        if strategy_caller() in ('strategy', 'simulate_match'):
             return C
 
-        return opponent.strategy(self)
+        return call_strategy(opponent, self, 'strategy')
@@ -1,4 +1,3 @@
-from collections import OrderedDict
 import random
 
 from axelrod import Player, random_choice, Actions
@@ -36,9 +35,23 @@ class RiskyQLearner(Player):
         self.prev_action = random_choice()
         self.history = []
         self.score = 0
-        self.Qs = OrderedDict({'':  OrderedDict(zip([C, D], [0, 0])) })
-        self.Vs = OrderedDict({'': 0})
-        self.prev_state = ''
+        self._reset_tables()
+
+    def _reset_tables(self):
+        """
+        Empties the Q and V tables.
+
+        States are integers (see encode_state) and the tables are dictionaries
+        keyed by state: Qs holds the [C, D] values of each state and Vs its
+        value. The state 0 stands for the turn before the first one.
+        """
+        self.Qs = {0: [0, 0]}
+        self.Vs = {0: 0}
+        self.prev_state = 0
+        # The opponent's last memory_length moves, one bit each (1 for D)
+        # below a leading 1, and how many of its moves they take into account.
+        self._tail = 1
+        self._opponent_moves = 0
 
     def receive_tournament_attributes(self):
         (R, P, S, T) = self.tournament_attributes["game"].RPST()
@@ -49,13 +62,10 @@ class RiskyQLearner(Player):
         state = self.find_state(opponent)
         reward = self.find_reward(opponent)
         if state not in self.Qs:
-            self.Qs[state] = OrderedDict(zip([C, D], [0, 0]))
+            self.Qs[state] = [0, 0]
             self.Vs[state] = 0
         self.perform_q_learning(self.prev_state, state, self.prev_action, reward)
-        if state not in self.Qs:
-            action = random_choice()
-        else:
-            action = self.select_action(state)
+        action = self.select_action(state)
         self.prev_state = state
         self.prev_action = action
         return action
@@ -67,22 +77,50 @@ class RiskyQLearner(Player):
         rnd_num = random.random()
         p = 1. - self.action_selection_parameter
         if rnd_num < p:
-            return max(self.Qs[state], key=lambda x: self.Qs[state][x])
+            q_cooperate, q_defect = self.Qs[state]
+            return C if q_cooperate >= q_defect else D
         return random_choice()
 
+    def encode_state(self, moves, cooperations):
+        """
+        The state in which the opponent's last memory_length moves are the
+        given ones and it has cooperated the given number of times.
+        """
+        tail = 1
+        for move in moves[-self.memory_length:]:
+            tail = 2 * tail + (move == D)
+        return cooperations * (2 << self.memory_length) + tail
+
     def find_state(self, opponent):
         """
-        Finds the my_state (the opponents last n moves +  its previous proportion of playing C) as a hashable state
+        Finds the state (the opponent's last memory_length moves and its
+        number of cooperations) as an integer.
+
+        The moves are kept as bits which are shifted along as the opponent's
+        history grows by one move a turn, and are only read again from the
+        history if it has changed in any other way.
         """
-        prob = '{:.1f}'.format(opponent.cooperations)
-        return ''.join(opponent.history[-self.memory_length:]) + prob
+        history = opponent.history
+        if len(history) == self._opponent_moves + 1:
+            tail = 2 * self._tail + (history[-1] == D)
+            if tail >> (self.memory_length + 1):
+                # Drop the oldest move, moving the leading 1 down to its place.
+                tail = tail & ((2 << self.memory_length) - 1) | (
+                    1 << self.memory_length)
+            self._tail = tail
+        elif len(history) != self._opponent_moves:
+            self._tail = self.encode_state(history, 0)
+        self._opponent_moves = len(history)
+        return opponent.cooperations * (2 << self.memory_length) + self._tail
 
     def perform_q_learning(self, prev_state, state, action, reward):
         """
         Performs the qlearning algorithm
         """
-        self.Qs[prev_state][action] = (1.-self.learning_rate)*self.Qs[prev_state][action] + self.learning_rate*(reward + self.discount_rate*self.Vs[state])
-        self.Vs[prev_state] = max(self.Qs[prev_state].values())
+        Q = self.Qs[prev_state]
+        index = 1 if action == D else 0
+        Q[index] = (1.-self.learning_rate)*Q[index] + self.learning_rate*(reward + self.discount_rate*self.Vs[state])
+        self.Vs[prev_state] = max(Q)
 
     def find_reward(self, opponent):
         """
@@ -101,9 +139,7 @@ class RiskyQLearner(Player):
         """
         Player.reset(self)
 
-        self.Qs = {'': {C: 0, D: 0}}
-        self.Vs = {'': 0}
-        self.prev_state = ''
+        self._reset_tables()
         self.prev_action = random_choice()
 
 
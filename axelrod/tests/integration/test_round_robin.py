@@ -38,20 +38,17 @@ class TestRoundRobin(unittest.TestCase):
         rr = axelrod.RoundRobin(players=[p1, p2, p3], game=self.game, turns=20)
         self.assertEqual(rr.deterministic_cache, {})
         rr.play()
-        self.assertEqual(rr.deterministic_cache[
-            (axelrod.Defector, axelrod.Defector)]['scores'], (20, 20))
-        self.assertEqual(rr.deterministic_cache[
-            (axelrod.Defector, axelrod.Defector)]['cooperation_rates'], (0, 0))
-        self.assertEqual(rr.deterministic_cache[
-            (axelrod.Cooperator, axelrod.Cooperator)]['scores'], (60, 60))
-        self.assertEqual(rr.deterministic_cache[
-            (axelrod.Cooperator, axelrod.Cooperator)]['cooperation_rates'], (20, 20))
-        self.assertEqual(rr.deterministic_cache[
-            (axelrod.Cooperator, axelrod.Defector)]['scores'], (0, 100))
-        self.assertEqual(rr.deterministic_cache[
-            (axelrod.Cooperator, axelrod.Defector)]['cooperation_rates'], (20, 0))
-        self.assertFalse(
-            (axelrod.Random, axelrod.Random) in rr.deterministic_cache)
+        cache = rr.deterministic_cache
+        self.assertEqual(cache[rr._cache_key(p2, p2)]['scores'], (20, 20))
+        self.assertEqual(
+            cache[rr._cache_key(p2, p2)]['cooperation_rates'], (0, 0))
+        self.assertEqual(cache[rr._cache_key(p1, p1)]['scores'], (60, 60))
+        self.assertEqual(
+            cache[rr._cache_key(p1, p1)]['cooperation_rates'], (20, 20))
+        self.assertEqual(cache[rr._cache_key(p1, p2)]['scores'], (0, 100))
+        self.assertEqual(
+            cache[rr._cache_key(p1, p2)]['cooperation_rates'], (20, 0))
+        self.assertFalse(rr._cache_key(p3, p3) in cache)
 
     def test_noisy_cache(self):
         p1, p2, p3 = axelrod.Cooperator(), axelrod.Defector(), axelrod.Random()
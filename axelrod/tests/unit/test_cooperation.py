@@ -1,4 +1,5 @@
 import unittest
+import numpy
 from axelrod import Actions
 import axelrod.cooperation as ac
 
@@ -133,3 +134,40 @@ class TestCooperation(unittest.TestCase):
         self.assertEqual(
             self.round_rating(eigenvector, 2), self.expected_eigenvector
         )
+
+    def test_arrays(self):
+        # A (n, n, repetitions) view of a (repetitions, n, n) outcome, as
+        # ResultSet passes it.
+        outcome = numpy.array(
+            self.expected_cooperation_results).transpose(2, 0, 1).copy()
+        results = outcome.transpose(1, 2, 0)
+        cooperation = ac.cooperation_array(results)
+        self.assertEqual(cooperation.tolist(), self.expected_cooperation)
+        normalised = ac.normalised_cooperation_array(cooperation, 5, 2)
+        self.assertEqual(
+            normalised.tolist(), self.expected_normalised_cooperation)
+        self.assertEqual(
+            self.round_matrix(ac.vengeful_cooperation_array(normalised), 1),
+            self.expected_vengeful_cooperation)
+        self.assertEqual(
+            self.round_rating(
+                ac.cooperating_rating_array(cooperation, 3, 5, 2), 2),
+            self.expected_cooperating_rating)
+        good_partner_matrix = ac.good_partner_matrix_array(results)
+        self.assertEqual(
+            good_partner_matrix.tolist(), self.expected_good_partner_matrix)
+        self.assertEqual(
+            ac.good_partner_rating_array(good_partner_matrix, 3, 2).tolist(),
+            self.expected_good_partner_rating)
+
+    def test_eigenvectors(self):
+        eigenvector = ac.eigenvector(self.expected_cooperation)
+        # One normalised cooperation matrix per repetition
+        matrices = (numpy.array(self.expected_cooperation_results) /
+                    5.0).transpose(2, 0, 1)
+        eigenvectors = ac.eigenvectors(matrices, initial=eigenvector)
+        self.assertEqual(len(eigenvectors), 2)
+        for matrix, vector in zip(matrices, eigenvectors):
+            self.assertEqual(
+                self.round_rating(vector, 2),
+                self.round_rating(ac.eigenvector(matrix), 2))
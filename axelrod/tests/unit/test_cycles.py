@@ -0,0 +1,89 @@
+"""Tests for playing matches between finite memory deterministic players."""
+
+import random
+import unittest
+import axelrod
+from axelrod import cycles, transition_table
+
+C, D = axelrod.Actions.C, axelrod.Actions.D
+
+
+class TestCycles(unittest.TestCase):
+
+    def test_hashable(self):
+        self.assertEqual(cycles.hashable([1, [2, 3]]), (1, (2, 3)))
+        self.assertEqual(
+            cycles.hashable({'b': [1], 'a': 2}), (('a', 2), ('b', (1,))))
+        with self.assertRaises(TypeError):
+            cycles.hashable(set([1]))
+
+    def test_finite_memory(self):
+        for strategy in [axelrod.TitForTat, axelrod.CyclerCCCD,
+                         axelrod.ForgetfulGrudger, axelrod.GoByMajority10]:
+            self.assertTrue(cycles.finite_memory(strategy()), msg=strategy)
+        for strategy in [axelrod.Random, axelrod.Grudger, axelrod.MindReader]:
+            self.assertFalse(cycles.finite_memory(strategy()), msg=strategy)
+        # GoByMajority(0) declares a memory depth of 0 but uses all moves
+        self.assertEqual(axelrod.GoByMajority().classifier['memory_depth'], 0)
+        self.assertFalse(cycles.finite_memory(axelrod.GoByMajority()))
+
+    def test_finite_memory_random_state(self):
+        # WinStayLoseShift draws random numbers without using them, so its
+        # turns cannot be skipped.
+        cycles._checked.clear()
+        random.seed(0)
+        state = random.getstate()
+        self.assertFalse(cycles.finite_memory(axelrod.WinStayLoseShift()))
+        self.assertEqual(random.getstate(), state)
+
+    def test_seeded_tournament(self):
+        """Is a seeded tournament repeatable when the memory depths of its
+        players have not been checked or compiled yet?"""
+        cycles._checked.clear()
+        transition_table._tables.clear()
+        results = []
+        for run in range(2):
+            random.seed(1)
+            tournament = axelrod.Tournament(
+                players=[axelrod.WinStayLoseShift(), axelrod.TitForTat(),
+                         axelrod.Random()],
+                turns=50, repetitions=2)
+            results.append(tournament.play().results)
+        self.assertEqual(results[0], results[1])
+
+    def test_play_with_cycles(self):
+        pairs = [(axelrod.TitForTat(), axelrod.CyclerCCCCCD()),
+                 (axelrod.ForgetfulGrudger(), axelrod.CyclerCCD()),
+                 (axelrod.HardTitForTat(), axelrod.Alternator()),
+                 (axelrod.TrickyCooperator(), axelrod.TwoTitsForTat())]
+        for player1, player2 in pairs:
+            played = cycles.play_with_cycles(player1, player2, 1000)
+            self.assertLess(played, 100)
+            expected1, expected2 = player1.clone(), player2.clone()
+            for turn in range(1000):
+                expected1.play(expected2)
+            self.assertEqual(player1.history, expected1.history)
+            self.assertEqual(player2.history, expected2.history)
+            self.assertEqual(player1.cooperations, expected1.cooperations)
+            self.assertEqual(player2.defections, expected2.defections)
+
+    def test_unconfirmed_cycle(self):
+        """Is a match played out when the state repeats but the play does
+        not (here because a player hides its memory)?"""
+
+        class FirstMoveCooperator(axelrod.Player):
+            classifier = dict(axelrod.Cooperator.classifier)
+
+            def strategy(self, opponent):
+                return D if self.history else C
+
+        player1, player2 = FirstMoveCooperator(), axelrod.Cooperator()
+        self.assertEqual(cycles.play_with_cycles(player1, player2, 10), 10)
+        self.assertEqual(player1.history, [C] + [D] * 9)
+        self.assertEqual(player1.defections, 9)
+
+    def test_short_match(self):
+        player1, player2 = axelrod.TitForTat(), axelrod.Alternator()
+        self.assertEqual(cycles.play_with_cycles(player1, player2, 2), 2)
+        self.assertEqual(player1.history, [C, C])
+        self.assertEqual(player2.history, [C, D])
@@ -51,6 +51,17 @@ class TestDarwin(TestPlayer):
         # Genome contains only valid responses.
         self.assertEqual(p1.genome.count(C) + p1.genome.count(D), len(p1.genome))
 
+    def test_snapshot(self):
+        """The genome belongs to the class, so only the instance is restored"""
+        p1 = self.player()
+        p2 = axelrod.Cooperator()
+        snapshot = p1.snapshot()
+        for i in range(5):
+            p1.play(p2)
+        p1.restore(snapshot)
+        self.assertEqual(p1.history, [])
+        self.assertEqual(p1.response, C)
+
     def test_reset(self):
         """Is instance correctly reset between rounds"""
         p1 = self.player()
@@ -0,0 +1,130 @@
+"""Tests for the deterministic cache and its on-disk store."""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+import axelrod
+from axelrod.deterministic_cache import (
+    CacheStore, DeterministicCache, FORMAT_VERSION, encode_key)
+
+
+class TestCacheStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.directory, 'cache.db')
+        self.key = (
+            (axelrod.GoByMajority, (5, True), 200),
+            (axelrod.Defector, (), 200), 200, (3, 1, 0, 5))
+        self.value = {'scores': (199, 204), 'cooperation_rates': (1, 0)}
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_encode_key(self):
+        self.assertEqual(
+            encode_key(self.key),
+            '[[{"class": "axelrod.strategies.gobymajority.GoByMajority"}, '
+            '[5, true], 200], [{"class": "axelrod.strategies.defector.'
+            'Defector"}, [], 200], 200, [3, 1, 0, 5]]')
+
+    def test_unstorable_key(self):
+        key = ((axelrod.Cooperator, (object(),), 10),) + self.key[1:]
+        with self.assertRaises(TypeError):
+            encode_key(key)
+        store = CacheStore(self.file_name)
+        store.save({key: self.value})
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.load([key]), {})
+        store.close()
+
+    def test_save_and_load(self):
+        store = CacheStore(self.file_name)
+        self.assertEqual(len(store), 0)
+        store.save({self.key: self.value})
+        store.close()
+
+        store = CacheStore(self.file_name)
+        self.assertEqual(len(store), 1)
+        other_key = self.key[:2] + (100, self.key[3])
+        self.assertEqual(
+            store.load([self.key, other_key]), {self.key: self.value})
+        store.close()
+
+    def test_concurrent_readers(self):
+        writer = CacheStore(self.file_name)
+        reader = CacheStore(self.file_name)
+        writer.save({self.key: self.value})
+        self.assertEqual(reader.load([self.key]), {self.key: self.value})
+        writer.close()
+        reader.close()
+
+    def test_format_version(self):
+        store = CacheStore(self.file_name)
+        store.close()
+        connection = sqlite3.connect(self.file_name)
+        self.assertEqual(
+            connection.execute('PRAGMA user_version').fetchone()[0],
+            FORMAT_VERSION)
+        connection.execute('PRAGMA user_version = %d' % (FORMAT_VERSION + 1))
+        connection.close()
+        with self.assertRaises(ValueError):
+            CacheStore(self.file_name)
+        # Creating a store replaces the old one
+        store = CacheStore.create(self.file_name)
+        self.assertEqual(len(store), 0)
+        store.close()
+
+
+class TestDeterministicCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.directory, 'cache.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_without_store(self):
+        cache = DeterministicCache()
+        cache['key'] = 'value'
+        self.assertEqual(cache, {'key': 'value'})
+        self.assertEqual(cache.load(['key', 'other']), 0)
+
+    def test_write_through_and_load(self):
+        cache = DeterministicCache(CacheStore(self.file_name))
+        key = ((axelrod.Cooperator, (), 10), (axelrod.Defector, (), 10), 10,
+               (3, 1, 0, 5))
+        cache[key] = {'scores': (0, 50), 'cooperation_rates': (10, 0)}
+        self.assertEqual(len(cache.store), 1)
+        cache.store.close()
+
+        cache = DeterministicCache(CacheStore(self.file_name))
+        self.assertEqual(cache, {})
+        self.assertEqual(cache.load([key]), 1)
+        self.assertEqual(cache[key]['scores'], (0, 50))
+        # Keys already cached are not read again
+        self.assertEqual(cache.load([key]), 0)
+        cache.store.close()
+
+    def test_reopened_file(self):
+        """Are the results of a tournament found again in a later run?"""
+        players = [axelrod.GoByMajority(5), axelrod.TitForTat(),
+                   axelrod.Cooperator()]
+        round_robin = axelrod.RoundRobin(
+            players=players, game=axelrod.Game(), turns=10,
+            deterministic_cache=DeterministicCache(
+                CacheStore(self.file_name)))
+        round_robin.play()
+        cache = round_robin.deterministic_cache
+        stored = len(cache.store)
+        self.assertEqual(stored, len(cache))
+        cache.store.close()
+
+        cache = DeterministicCache(CacheStore(self.file_name))
+        key = round_robin._cache_key(players[0], players[1])
+        self.assertEqual(cache.load([key]), 1)
+        self.assertEqual(cache[key], round_robin.deterministic_cache[key])
+        cache.store.close()
@@ -1,5 +1,6 @@
 """Tests for the Ecosystem class"""
 
+import random
 import unittest
 
 import axelrod
@@ -22,8 +23,16 @@ class TestEcosystem(unittest.TestCase):
             axelrod.Cooperator(),
             axelrod.Defector(),
         ])
+        random.seed(0)
+        noisy = axelrod.Tournament(players=[
+            axelrod.Random(),
+            axelrod.Random(),
+            axelrod.TitForTat(),
+            axelrod.Defector(),
+        ], turns=20, repetitions=5)
         cls.res_cooperators = cooperators.play()
         cls.res_defector_wins = defector_wins.play()
+        cls.res_noisy = noisy.play()
 
     def test_init(self):
         """Are the populations created correctly?"""
@@ -66,6 +75,16 @@ class TestEcosystem(unittest.TestCase):
         eco = axelrod.Ecosystem(self.res_cooperators, fitness=fitness)
         self.assertTrue(eco.fitness(10), 20)
 
+    def test_replaced_fitness(self):
+        """Is a fitness replaced after construction used to reproduce?"""
+
+        eco = axelrod.Ecosystem(self.res_defector_wins)
+        eco.fitness = lambda p: 1
+        eco.reproduce(10)
+        self.assertEqual(eco.reproduce_expected(10), 0)
+        for p in eco.population_sizes:
+            self.assertEqual(p, [0.25] * 4)
+
     def test_cooperators(self):
         """Are cooperators stable over time?"""
 
@@ -93,3 +112,124 @@ class TestEcosystem(unittest.TestCase):
         self.assertAlmostEqual(last[1], 0.0)
         self.assertAlmostEqual(last[2], 0.0)
         self.assertAlmostEqual(last[3], 1.0)
+
+    def test_populations(self):
+        """Is the population history kept in an array?"""
+
+        eco = axelrod.Ecosystem(self.res_defector_wins)
+        eco.reproduce(10)
+        eco.reproduce(5)
+        self.assertEqual(eco.populations.shape, (16, 4))
+        self.assertEqual(eco.population_sizes, eco.populations.tolist())
+
+    def test_set_populations(self):
+        """Does reproduction continue from assigned populations?"""
+
+        eco = axelrod.Ecosystem(self.res_defector_wins)
+        eco.reproduce(10)
+        eco.population_sizes = [[0.5, 0.5, 0.0, 0.0]]
+        eco.reproduce(5)
+        self.assertEqual(eco.population_sizes, [[0.5, 0.5, 0.0, 0.0]] * 6)
+
+        eco = axelrod.Ecosystem(self.res_defector_wins, replicates=2)
+        eco.populations = [[[0.5, 0.5, 0.0, 0.0], [0.0, 0.0, 0.5, 0.5]]]
+        eco.reproduce(5)
+        self.assertEqual(eco.populations.shape, (6, 2, 4))
+        self.assertEqual(eco.populations[-1, 0].tolist(),
+                         [0.5, 0.5, 0.0, 0.0])
+        self.assertGreater(eco.populations[-1, 1, 3], 0.99)
+
+    def test_seed(self):
+        """Does seeding the random module make reproduction repeatable?"""
+
+        populations = []
+        for seed in (1, 1, 2):
+            random.seed(seed)
+            eco = axelrod.Ecosystem(self.res_noisy)
+            eco.reproduce(20)
+            populations.append(eco.population_sizes)
+        self.assertEqual(populations[0], populations[1])
+        self.assertNotEqual(populations[0], populations[2])
+
+    def test_replicates(self):
+        """Do replicate ecosystems evolve side by side?"""
+
+        eco = axelrod.Ecosystem(
+            self.res_noisy, population=[1, 1, 1, 2], replicates=3)
+        eco.reproduce(100)
+        pops = eco.populations
+        self.assertEqual(pops.shape, (101, 3, 4))
+        self.assertEqual(pops[0].tolist(), [[.2, .2, .2, .4]] * 3)
+        for replicate in pops[-1]:
+            self.assertAlmostEqual(sum(replicate), 1.0)
+        self.assertNotEqual(pops[1, 0].tolist(), pops[1, 1].tolist())
+        # The population sizes are averaged over the replicates
+        sizes = eco.population_sizes
+        self.assertEqual(len(sizes), 101)
+        for p, replicates in zip(sizes, pops):
+            self.assertEqual(len(p), 4)
+            for x, y in zip(p, replicates.mean(axis=0)):
+                self.assertAlmostEqual(x, y)
+
+    def test_expected_cooperators(self):
+        """Does the expected reproduction stop at a fixed point?"""
+
+        eco = axelrod.Ecosystem(self.res_cooperators)
+        self.assertEqual(eco.reproduce_expected(100), 0)
+        self.assertEqual(eco.population_sizes, [[0.25] * 4])
+
+    def test_expected_defector_wins(self):
+        """Does the expected reproduction stop once the defector has won?"""
+
+        eco = axelrod.Ecosystem(self.res_defector_wins)
+        turns = eco.reproduce_expected(1000)
+        self.assertLess(turns, 1000)
+        pops = eco.population_sizes
+        self.assertEqual(len(pops), turns + 1)
+        for p in pops:
+            self.assertAlmostEqual(sum(p), 1.0)
+        self.assertEqual(pops[-1], [0.0, 0.0, 0.0, 1.0])
+
+    def test_expected_populations(self):
+        """Does the expected reproduction follow the expected payoffs?"""
+
+        for results, population in [
+                (self.res_noisy, [1, 1, 1, 2]),
+                # The defector invades from a population below extinction.
+                (self.res_defector_wins, [1, 1, 1, 1e-14])]:
+            eco = axelrod.Ecosystem(results, population=population)
+            turns = eco.reproduce_expected(200)
+            pops = eco.population_sizes
+
+            expected = [pops[0]]
+            for turn in range(turns):
+                last = expected[-1]
+                fitness = [sum(payoff * p for payoff, p in zip(row, last))
+                           for row in results.payoff_matrix]
+                following = [p * f for p, f in zip(last, fitness)]
+                expected.append([p / sum(following) for p in following])
+            for p, q in zip(pops, expected):
+                for x, y in zip(p, q):
+                    self.assertAlmostEqual(x, y, places=3)
+        self.assertEqual(pops[-1], [0.0, 0.0, 0.0, 1.0])
+
+    def test_expected_replicates(self):
+        """Does each replicate follow the expected payoffs from its own
+        populations?"""
+
+        random.seed(0)
+        eco = axelrod.Ecosystem(self.res_noisy, replicates=2)
+        eco.reproduce(5)
+        turns = eco.reproduce_expected(50)
+        pops = eco.populations
+        self.assertEqual(pops.shape, (turns + 6, 2, 4))
+        for replicate in range(2):
+            single = axelrod.Ecosystem(
+                self.res_noisy, population=pops[5, replicate].tolist())
+            stop = single.reproduce_expected(50)
+            self.assertEqual(pops[5:stop + 6, replicate].tolist(),
+                             single.population_sizes)
+            # A replicate reaching a fixed point early stays there
+            for p in pops[stop + 6:, replicate]:
+                self.assertEqual(p.tolist(), single.population_sizes[-1])
+        self.assertNotEqual(pops[-1, 0].tolist(), pops[-1, 1].tolist())
@@ -7,7 +7,8 @@ import unittest
 import numpy
 from numpy.testing import assert_array_almost_equal
 
-from axelrod.eigen import normalise, principal_eigenvector
+from axelrod.eigen import (
+    normalise, principal_eigenvector, principal_eigenvectors)
 
 
 class FunctionCases(unittest.TestCase):
@@ -43,3 +44,31 @@ class FunctionCases(unittest.TestCase):
         self.assertAlmostEqual(evalue, 3, places=3)
         assert_array_almost_equal(evector, numpy.dot(mat, evector) / evalue)
         assert_array_almost_equal(evector, normalise([0, 0, 0, 1]), decimal=4)
+
+    def test_eigen_negative(self):
+        # Power iteration flips sign at every step: the matrix is solved
+        # directly
+        mat = [[-2, 0, 0], [0, 1, 0], [0, 0, 1]]
+        evector, evalue = principal_eigenvector(mat)
+        self.assertAlmostEqual(evalue, -2)
+        assert_array_almost_equal(numpy.abs(evector), [1, 0, 0])
+
+    def test_initial(self):
+        mat = numpy.array([[2, 1], [1, 2]])
+        initial = normalise(numpy.array([1., 1.]))
+        evector, evalue = principal_eigenvector(
+            mat, maximum_iterations=1, initial=initial)
+        self.assertAlmostEqual(evalue, 3)
+        assert_array_almost_equal(evector, initial)
+
+    def test_batch(self):
+        mats = numpy.array([[[2, 1], [1, 2]], [[1, 0], [0, 1]],
+                            [[2, 0], [1, 2]], [[-3, 0], [0, 1]]])
+        evectors, evalues = principal_eigenvectors(mats)
+        self.assertEqual(evectors.shape, (4, 2))
+        for mat, evector, evalue in zip(mats, evectors, evalues):
+            expected_evector, expected_evalue = principal_eigenvector(mat)
+            assert_array_almost_equal(evector, expected_evector)
+            self.assertAlmostEqual(evalue, expected_evalue)
+            assert_array_almost_equal(numpy.dot(mat, evector),
+                                      evalue * evector)
@@ -25,3 +25,26 @@ class TestGame(unittest.TestCase):
         self.assertEqual(self.game.score((D, D)), (1, 1))
         self.assertEqual(self.game.score((C, D)), (0, 5))
         self.assertEqual(self.game.score((D, C)), (5, 0))
+
+    def test_payoff_array(self):
+        self.assertEqual(self.game.payoff_array.tolist(), [[3, 0], [5, 1]])
+        for (move1, move2), (score1, score2) in self.game.scores.items():
+            code1 = axelrod.game.MOVE_CODES[move1]
+            code2 = axelrod.game.MOVE_CODES[move2]
+            self.assertEqual(self.game.payoff_array[code1, code2], score1)
+            self.assertEqual(self.game.payoff_array[code2, code1], score2)
+
+    def test_score_histories(self):
+        history1 = axelrod.history.History([C, C, D, D, C])
+        history2 = [C, D, C, D, D]
+        scores, cooperations, counts = self.game.score_histories(
+            history1, history2)
+        self.assertEqual(scores, (9, 14))
+        self.assertEqual(cooperations, (3, 2))
+        self.assertEqual(counts, (1, 2, 1, 1))
+        # Extra turns in the longer history are ignored
+        self.assertEqual(
+            self.game.score_histories(history1, history2[:2])[0], (3, 8))
+        game = axelrod.Game(r=2.5, s=0, t=4, p=0.5)
+        self.assertEqual(
+            game.score_histories(history1, history2)[0], (7, 11))
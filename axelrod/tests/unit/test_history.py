@@ -0,0 +1,160 @@
+"""Tests for the History class."""
+
+import copy
+import pickle
+import random
+import unittest
+
+import axelrod
+from axelrod.history import History, HistoryView
+
+C, D = axelrod.Actions.C, axelrod.Actions.D
+
+
+class TestHistory(unittest.TestCase):
+
+    def test_init(self):
+        history = History()
+        self.assertEqual(len(history), 0)
+        self.assertEqual(history, [])
+        history = History([C, D, D])
+        self.assertEqual(history, [C, D, D])
+        self.assertEqual(History(history), history)
+
+    def test_append_and_counts(self):
+        history = History()
+        for move in [C, D, D, C, D]:
+            history.append(move)
+        self.assertEqual(history.count(C), 2)
+        self.assertEqual(history.count(D), 3)
+        self.assertEqual(history, [C, D, D, C, D])
+
+    def test_extend(self):
+        history = History([C])
+        history.extend([D, C])
+        history.extend('DD')
+        history.extend(History([C]))
+        self.assertEqual(history, [C, D, C, D, D, C])
+        self.assertEqual(history.count(C), 3)
+        self.assertEqual(history.count(D), 3)
+
+    def test_pop(self):
+        history = History([C, D, D])
+        self.assertEqual(history.pop(-1), D)
+        self.assertEqual(history.count(D), 1)
+        self.assertEqual(history.pop(0), C)
+        self.assertEqual(history, [D])
+        self.assertEqual(history.count(C), 0)
+
+    def test_truncate(self):
+        history = History([C, D, D, C])
+        history.truncate(2)
+        self.assertEqual(history, [C, D])
+        self.assertEqual(history.count(C), 1)
+        self.assertEqual(history.count(D), 1)
+        history.truncate(3)
+        self.assertEqual(history, [C, D])
+
+    def test_repeat_tail(self):
+        history = History([D, C, C, D])
+        history.repeat_tail(3, 7)
+        self.assertEqual(history, [D, C, C, D, C, C, D, C, C, D, C])
+        self.assertEqual(history.count(C), 7)
+        self.assertEqual(history.count(D), 4)
+
+    def test_tail_count(self):
+        random.seed(0)
+        history, moves = History(), []
+        for turn in range(60):
+            for n in (1, 3, 10):
+                for move in (C, D):
+                    self.assertEqual(history.tail_count(n, move),
+                                     moves[-n:].count(move))
+            if moves and random.random() < 0.3:
+                self.assertEqual(history.pop(), moves.pop())
+            else:
+                move = random.choice([C, D])
+                history.append(move)
+                moves.append(move)
+        self.assertEqual(history.tail_count(0, C), 0)
+
+    def test_tail_count_after_bulk_changes(self):
+        history = History([C, C, D])
+        self.assertEqual(history.tail_count(2, C), 1)
+        history.extend([D, D])
+        self.assertEqual(history.tail_count(2, C), 0)
+        history.repeat_tail(5, 2)
+        self.assertEqual(history.tail_count(2, C), 2)
+        history.pop(0)
+        self.assertEqual(history.tail_count(4, D), 2)
+
+    def test_list_compatibility(self):
+        history = History([C, C, D, D, C])
+        self.assertEqual(history[-1], C)
+        self.assertEqual(history[0], C)
+        self.assertEqual(history[-1:], [C])
+        self.assertEqual(history[-3:], [D, D, C])
+        self.assertEqual(history[-0:], [C, C, D, D, C])
+        self.assertEqual(list(history), [C, C, D, D, C])
+        self.assertEqual(list(reversed(history)), [C, D, D, C, C])
+        self.assertEqual("".join(history[-3:]), "DDC")
+        self.assertTrue(D in history)
+        self.assertFalse(D in History([C, C]))
+        self.assertEqual(history.index(D), 2)
+        self.assertRaises(ValueError, History([C]).index, D)
+        self.assertEqual(history + [D], [C, C, D, D, C, D])
+        self.assertEqual([D] + history, [D, C, C, D, D, C])
+        self.assertEqual(str(history), str([C, C, D, D, C]))
+        self.assertFalse(History())
+        self.assertNotEqual(history, [C])
+
+    def test_tail(self):
+        history = History([C, C, D, D, C])
+        view = history.tail(3)
+        self.assertIsInstance(view, HistoryView)
+        self.assertEqual(len(view), 3)
+        self.assertEqual(view.count(D), 2)
+        self.assertEqual(view, [D, D, C])
+        self.assertEqual(history.tail(10), history)
+        self.assertEqual(len(history.tail(0)), 0)
+
+    def test_window(self):
+        history = History([C, C, D, D, C])
+        view = history.window(1, 4)
+        self.assertEqual(view, [C, D, D])
+        self.assertEqual(view.count(C), 1)
+        self.assertEqual(view[-1], D)
+        self.assertEqual(view[0], C)
+        self.assertRaises(IndexError, view.__getitem__, 3)
+        self.assertTrue(D in view)
+        self.assertFalse(D in history.window(0, 2))
+        self.assertEqual(history.window(3, 1), [])
+
+    def test_view_does_not_follow_appends(self):
+        history = History([C, D])
+        view = history.tail(2)
+        history.append(C)
+        self.assertEqual(view, [C, D])
+
+    def test_codes(self):
+        codes = History([C, D, D, C]).codes()
+        self.assertEqual(codes.tolist(), [0, 1, 1, 0])
+        self.assertEqual(len(History().codes()), 0)
+
+    def test_copy_and_pickle(self):
+        history = History([C, D, C])
+        for other in (copy.copy(history), copy.deepcopy(history),
+                      pickle.loads(pickle.dumps(history))):
+            self.assertEqual(other, history)
+            self.assertEqual(other.count(C), 2)
+            other.append(D)
+            self.assertNotEqual(other, history)
+
+    def test_player_history(self):
+        player = axelrod.Player()
+        self.assertIsInstance(player.history, History)
+        player.history = [C, D]
+        self.assertIsInstance(player.history, History)
+        self.assertEqual(player.history, [C, D])
+        player.reset()
+        self.assertEqual(player.history, [])
@@ -6,7 +6,9 @@ import unittest
 import axelrod
 
 from .test_player import TestPlayer
-from axelrod.strategies.hunter import detect_cycle
+from axelrod.strategies.hunter import (
+    detect_cycle, CycleDetector, TransitionCounter, AlternationDetector,
+    CooperationCounter)
 
 C, D = axelrod.Actions.C, axelrod.Actions.D
 
@@ -31,6 +33,111 @@ class TestCycleDetection(unittest.TestCase):
         self.assertEqual(detect_cycle(history), None)
 
 
+class TestCycleDetector(unittest.TestCase):
+
+    def test_matches_detect_cycle(self):
+        random.seed(0)
+        histories = [[C] * 20, [C, D] * 10, [C, C, D] * 10,
+                     [C, D, C, C, D, C, C, C, D],
+                     [random.choice([C, D]) for i in range(40)],
+                     [C, D, D] * 5 + [C] + [C, D, D] * 5]
+        for history in histories:
+            for min_size in (1, 2, 3):
+                detector = CycleDetector(min_size=min_size)
+                moves = []
+                for move in history:
+                    self.assertEqual(
+                        detector.update(moves),
+                        detect_cycle(moves, min_size=min_size))
+                    moves.append(move)
+
+    def test_new_history(self):
+        detector = CycleDetector(min_size=2)
+        self.assertEqual(detector.update([C, D] * 5), (C, D))
+        self.assertEqual(detector.update([C, C, D] * 4), (C, C, D))
+        self.assertEqual(detector.update([C, D, C, C]), None)
+
+
+class TestTransitionCounter(unittest.TestCase):
+
+    def test_matches_recount(self):
+        random.seed(0)
+        counter = TransitionCounter()
+        history, opponent_history = [], []
+        for turn in range(50):
+            n = len(history)
+            expected = tuple(
+                len([i for i in range(n - 1)
+                     if history[i] == move == opponent_history[i + 1]])
+                for move in (C, D))
+            self.assertEqual(
+                counter.update(history, opponent_history), expected)
+            history.append(random.choice([C, D]))
+            opponent_history.append(random.choice([C, D]))
+
+    def test_shrinking_history(self):
+        counter = TransitionCounter()
+        history, opponent_history = [C] * 6, [C] * 6
+        self.assertEqual(counter.update(history, opponent_history), (5, 0))
+        del history[-3:], opponent_history[-3:]
+        history.append(D)
+        opponent_history.append(D)
+        self.assertEqual(counter.update(history, opponent_history), (2, 0))
+
+
+class TestAlternationDetector(unittest.TestCase):
+
+    def test_matches_recheck(self):
+        random.seed(0)
+        detector = AlternationDetector()
+        history = []
+        for turn in range(50):
+            expected = all(history[i] != history[i + 1]
+                           for i in range(len(history) - 1))
+            self.assertEqual(detector.update(history), expected)
+            # Mostly alternate, so that both answers come up
+            if history and random.random() < 0.9:
+                history.append(C if history[-1] == D else D)
+            else:
+                history.append(random.choice([C, D]))
+            if random.random() < 0.1:
+                del history[-2:]
+
+    def test_replayed_move(self):
+        detector = AlternationDetector()
+        history = [C, D, C, D]
+        self.assertTrue(detector.update(history))
+        history[-1] = C
+        self.assertFalse(detector.update(history))
+        history[-1] = D
+        self.assertTrue(detector.update(history))
+
+
+class TestCooperationCounter(unittest.TestCase):
+
+    def test_matches_recount(self):
+        random.seed(0)
+        counter = CooperationCounter()
+        history, opponent_history = [], []
+        for turn in range(30):
+            counter.update(history, opponent_history)
+            for start in range(len(history) + 1):
+                for stop in range(start, len(history) + 1):
+                    self.assertEqual(
+                        counter.cooperations(start, stop),
+                        history[start:stop].count(C) +
+                        opponent_history[start:stop].count(C))
+            history.append(random.choice([C, D]))
+            opponent_history.append(random.choice([C, D]))
+
+    def test_new_history(self):
+        counter = CooperationCounter()
+        counter.update([C] * 4, [C] * 4)
+        self.assertEqual(counter.cooperations(0, 4), 8)
+        counter.update([D] * 4, [C] * 4)
+        self.assertEqual(counter.cooperations(0, 4), 4)
+
+
 class TestDefectorHunter(TestPlayer):
 
     name = "Defector Hunter"
@@ -167,6 +274,16 @@ class TestMathConstantHunter(TestPlayer):
     def test_strategy(self):
         self.responses_test([C] * 8, [C] * 7 + [D], [D])
 
+    def test_reset(self):
+        P1 = axelrod.MathConstantHunter()
+        P2 = axelrod.Player()
+        P1.history = [C] * 8
+        P2.history = [C] * 7 + [D]
+        P2.cooperations, P2.defections = 7, 1
+        self.assertEqual(P1.strategy(P2), D)
+        P1.reset()
+        self.assertEqual(P1.cooperation_counter._prefix, [0])
+
 
 class TestRandomHunter(TestPlayer):
 
@@ -192,3 +309,7 @@ class TestRandomHunter(TestPlayer):
         P1.history = [C] * 100
         P2.history = [random.choice([C, D]) for i in range(100)]
         self.assertEqual(P1.strategy(P2), D)
+
+        # The transitions are counted afresh for new histories.
+        P2.history = [C] * 100
+        self.assertEqual(P1.strategy(P2), C)
@@ -0,0 +1,113 @@
+"""Tests for the exact memory one match engine."""
+
+import random
+import unittest
+
+import numpy
+from numpy.testing import assert_array_almost_equal
+
+import axelrod
+from axelrod import markov
+
+C, D = axelrod.Actions.C, axelrod.Actions.D
+
+
+class TestMarkov(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.game = axelrod.Game()
+
+    def test_is_memory_one(self):
+        self.assertTrue(markov.is_memory_one(axelrod.WinStayLoseShift()))
+        self.assertTrue(markov.is_memory_one(axelrod.Joss()))
+        self.assertTrue(markov.is_memory_one(axelrod.GTFT()))
+        self.assertFalse(markov.is_memory_one(axelrod.TitForTat()))
+        self.assertFalse(markov.is_memory_one(axelrod.MemoryOnePlayer()))
+
+    def test_transition_matrix(self):
+        wsls = axelrod.WinStayLoseShift()
+        matrix = markov.transition_matrix(
+            wsls._four_vector, wsls._four_vector)
+        expected = [[1, 0, 0, 0], [0, 0, 0, 1], [0, 0, 0, 1], [1, 0, 0, 0]]
+        assert_array_almost_equal(matrix, expected)
+        joss = axelrod.Joss()
+        matrix = markov.transition_matrix(
+            joss._four_vector, joss._four_vector, noise=0.1)
+        assert_array_almost_equal(matrix.sum(axis=1), numpy.ones(4))
+
+    def test_initial_distribution(self):
+        assert_array_almost_equal(
+            markov.initial_distribution(C, D), [0, 1, 0, 0])
+        assert_array_almost_equal(
+            markov.initial_distribution(C, C, noise=0.5), [0.25] * 4)
+
+    def test_geometric_sum(self):
+        matrix = numpy.array([[0.5, 0.5], [0.2, 0.8]])
+        for n in range(8):
+            expected = sum(
+                [numpy.linalg.matrix_power(matrix, k) for k in range(n)],
+                numpy.zeros((2, 2)))
+            assert_array_almost_equal(markov.geometric_sum(matrix, n), expected)
+
+    def test_stationary_distribution(self):
+        matrix = numpy.array([[0.5, 0.5], [0.2, 0.8]])
+        distribution = markov.stationary_distribution(matrix)
+        assert_array_almost_equal(distribution, [2. / 7, 5. / 7])
+        assert_array_almost_equal(numpy.dot(distribution, matrix), distribution)
+
+    def test_expected_outcome_deterministic(self):
+        # Without stochastic entries the expectation is the simulated result
+        p1, p2 = axelrod.WinStayLoseShift(), axelrod.MemoryOnePlayer(
+            (0, 0, 1, 1))
+        scores, cooperation = markov.expected_outcome(p1, p2, self.game, 20)
+        p1.reset()
+        p2.reset()
+        for turn in range(20):
+            p1.play(p2)
+        rr = axelrod.RoundRobin([p1, p2], self.game, 20)
+        self.assertEqual(scores, rr._calculate_scores(p1, p2))
+        self.assertEqual(cooperation, (p1.cooperations, p2.cooperations))
+
+    def test_expected_outcome_stochastic(self):
+        p1, p2 = axelrod.Joss(), axelrod.StochasticWSLS()
+        scores, cooperation = markov.expected_outcome(
+            p1, p2, self.game, 10, noise=0.05)
+        random.seed(0)
+        repetitions = 3000
+        totals = numpy.zeros(4)
+        for repetition in range(repetitions):
+            p1.reset()
+            p2.reset()
+            for turn in range(10):
+                p1.play(p2, 0.05)
+            rr = axelrod.RoundRobin([p1, p2], self.game, 10)
+            totals += rr._calculate_scores(p1, p2) + (
+                p1.cooperations, p2.cooperations)
+        estimate = totals / repetitions
+        assert_array_almost_equal(
+            estimate, scores + cooperation, decimal=0)
+
+    def test_expected_outcome_stationary(self):
+        p1, p2 = axelrod.GTFT(), axelrod.GTFT()
+        scores, cooperation = markov.expected_outcome(
+            p1, p2, self.game, 100, stationary=True)
+        self.assertAlmostEqual(scores[0], 300)
+        self.assertAlmostEqual(cooperation[1], 100)
+
+
+class TestRoundRobinMarkovMode(unittest.TestCase):
+
+    def test_play(self):
+        players = [axelrod.Joss(), axelrod.WinStayLoseShift(),
+                   axelrod.Cooperator()]
+        rr = axelrod.RoundRobin(
+            players=players, game=axelrod.Game(), turns=10,
+            markov_mode='exact')
+        payoff = rr.play()['payoff']
+        expected, _ = markov.expected_outcome(
+            players[0], players[1], axelrod.Game(), 10)
+        self.assertAlmostEqual(payoff[0][1], expected[0])
+        self.assertAlmostEqual(payoff[1][0], expected[1])
+        # Cooperator is not a memory one player so is simulated
+        self.assertEqual(payoff[2][2], 30)
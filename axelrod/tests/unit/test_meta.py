@@ -6,6 +6,7 @@ import axelrod
 import unittest
 
 from .test_player import TestPlayer
+from axelrod.strategies.meta import TeamEvaluator
 
 C, D = axelrod.Actions.C, axelrod.Actions.D
 
@@ -40,6 +41,8 @@ class TestMetaPlayer(TestPlayer):
                              (key, player.classifier[key], classifier[key]))
 
     def test_reset(self):
+        if self.player is axelrod.MetaPlayer:
+            self.skipTest('the generic meta player has no meta strategy')
         p1 = self.player()
         p2 = axelrod.Cooperator()
         p1.play(p2)
@@ -49,6 +52,86 @@ class TestMetaPlayer(TestPlayer):
         for player in p1.team:
             self.assertEqual(len(player.history), 0)
 
+    def test_snapshot(self):
+        if self.player is axelrod.MetaPlayer:
+            self.skipTest('the generic meta player has no meta strategy')
+        super(TestMetaPlayer, self).test_snapshot()
+
+
+class PerMemberEvaluator(object):
+    """Gives the moves of a team by asking every member in team order, as
+    meta players did before TeamEvaluator."""
+
+    def __init__(self, team):
+        self.team = team
+        self.size = len(team)
+
+    def snapshot(self):
+        return None
+
+    def restore(self, snapshot):
+        pass
+
+    def moves(self, player, opponent):
+        for member in self.team:
+            member.history = player.history
+        return tuple(member.strategy(opponent) for member in self.team)
+
+
+class TestTeamEvaluator(unittest.TestCase):
+
+    def test_moves(self):
+        team = [axelrod.TitForTat(), axelrod.Grudger(), axelrod.Random(),
+                axelrod.TitForTat(), axelrod.Cooperator(), axelrod.Defector(),
+                axelrod.GoByMajority(), axelrod.WinStayLoseShift(),
+                axelrod.WinStayLoseShift(), axelrod.Random()]
+        players = [player.clone() for player in team]
+        evaluator = TeamEvaluator(team)
+        player, opponent = axelrod.Player(), axelrod.Player()
+        for turn in range(30):
+            seed = random.randint(0, 1000)
+            random.seed(seed)
+            moves = evaluator.moves(player, opponent)
+            random.seed(seed)
+            for member in players:
+                member.history = player.history
+            self.assertEqual(
+                moves, tuple(member.strategy(opponent) for member in players))
+            axelrod.update_histories(player, opponent, random.choice([C, D]),
+                                     random.choice([C, D]))
+
+    def test_lookups(self):
+        team = [axelrod.TitForTat(), axelrod.TitForTat(),
+                axelrod.SuspiciousTitForTat(),
+                axelrod.GoByMajority(), axelrod.GoByMajority()]
+        evaluator = TeamEvaluator(team)
+        # The tit for tat players are looked up and both GoByMajority
+        # players are asked.
+        self.assertEqual(evaluator._called, [team[3], team[4]])
+        player, opponent = axelrod.Player(), axelrod.Player()
+        axelrod.update_histories(player, opponent, C, D)
+        self.assertEqual(evaluator.moves(player, opponent), (D, D, D, D, D))
+        self.assertEqual(len(team[0].history), 0)
+
+    def test_seeded_meta_players(self):
+        """Seeded matches of meta players are the same as when every member
+        is asked for its move."""
+        for meta_player in (axelrod.MetaMajority, axelrod.MetaWinner):
+            for opponent in (axelrod.Random(), axelrod.Alternator(),
+                             axelrod.WinStayLoseShift(), axelrod.Joss()):
+                histories = []
+                for evaluator in (None, PerMemberEvaluator):
+                    player = meta_player()
+                    opponent.reset()
+                    if evaluator is not None:
+                        player._evaluator = evaluator(player.team)
+                    random.seed(1)
+                    for turn in range(20):
+                        player.play(opponent)
+                    histories.append((player.history[:],
+                                      opponent.history[:], random.random()))
+                self.assertEqual(histories[0], histories[1])
+
 
 class TestMetaMajority(TestMetaPlayer):
 
@@ -125,16 +208,13 @@ class TestMetaWinner(TestMetaPlayer):
         P2 = axelrod.Player()
 
         # This meta player will simply choose the strategy with the highest current score.
-        P1.team[0].score = 0
-        P1.team[1].score = 1
+        P1.scores[:] = [0, 1]
         self.assertEqual(P1.strategy(P2), C)
-        P1.team[0].score = 1
-        P1.team[1].score = 0
+        P1.scores[:] = [1, 0]
         self.assertEqual(P1.strategy(P2), C)
 
         # If there is a tie, choose to cooperate if possible.
-        P1.team[0].score = 1
-        P1.team[1].score = 1
+        P1.scores[:] = [1, 1]
         self.assertEqual(P1.strategy(P2), C)
 
         opponent = axelrod.Cooperator()
@@ -1,9 +1,12 @@
 """Test for the mindreader strategy."""
 
+import random
+
 import axelrod
 
 from .test_player import TestPlayer
-from axelrod.strategies.mindreader import simulate_match
+from axelrod.strategies.mindreader import (
+    simulate_match, look_ahead)
 
 C, D = axelrod.Actions.C, axelrod.Actions.D
 
@@ -73,6 +76,59 @@ class TestMindReader(TestPlayer):
         self.assertEqual(P1.history, [C, C])
         self.assertEqual(P2.history, [C, D])
 
+    def test_opponent_state_is_same(self):
+        """
+        Checks that the opponent is restored after looking ahead
+        """
+        P1 = axelrod.MindReader()
+        P2 = axelrod.ArrogantQLearner()
+        for turn in range(3):
+            P1.play(P2)
+        Qs, Vs = repr(P2.Qs), repr(P2.Vs)
+        prev_state = P2.prev_state
+        P1.strategy(P2)
+        self.assertEqual(repr(P2.Qs), Qs)
+        self.assertEqual(repr(P2.Vs), Vs)
+        self.assertEqual(P2.prev_state, prev_state)
+        self.assertEqual(len(P2.history), 3)
+
+    def test_look_ahead_is_memoized(self):
+        """
+        Checks that choices against finite memory opponents are reused
+        """
+        P1 = axelrod.MindReader()
+        P2 = axelrod.TitForTat()
+        P1.history = [C, D]
+        P2.history = [C, C]
+        choices = {}
+        choice = look_ahead(P1, P2, axelrod.Game(), choices=choices)
+        self.assertEqual(len(choices), 1)
+        P1.history = [D, D, D]
+        P2.history = [D, C, C]
+        self.assertEqual(
+            look_ahead(P1, P2, axelrod.Game(), choices=choices), choice)
+        self.assertEqual(len(choices), 1)
+        self.assertEqual(P2.history, [D, C, C])
+
+    def test_memoized_choices_follow_attributes(self):
+        """
+        Checks that memoized choices agree with looking ahead afresh against
+        opponents whose replies also depend on their attributes
+        """
+        random.seed(0)
+        for opponent in [axelrod.ForgetfulGrudger, axelrod.OnceBitten,
+                         axelrod.TitForTat]:
+            P1, P2 = axelrod.MindReader(), opponent()
+            P1.tournament_attributes['game'] = axelrod.Game()
+            for turn in range(400):
+                expected = look_ahead(P1, P2, axelrod.Game())
+                self.assertEqual(P1.strategy(P2), expected, msg=opponent)
+                move = D if random.random() < 0.2 else C
+                axelrod.update_histories(P1, P2, move, P2.strategy(P1))
+            self.assertGreater(len(P1.look_ahead_choices), 0)
+            P1.reset()
+            self.assertEqual(P1.look_ahead_choices, {})
+
     def test_vs_geller(self):
         """Ensures that a recursion error does not occur """
         P1 = axelrod.MindReader()
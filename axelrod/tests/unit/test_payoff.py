@@ -1,4 +1,5 @@
 import unittest
+import numpy
 from axelrod import Game, Actions
 import axelrod.payoff as ap
 
@@ -135,3 +136,30 @@ class TestPayoff(unittest.TestCase):
     def test_wins(self):
         wins = ap.wins(self.expected_payoff)
         self.assertEqual(wins, self.expected_wins)
+
+    def test_arrays(self):
+        # A (n, n, repetitions) view of a (repetitions, n, n) outcome, as
+        # ResultSet passes it.
+        outcome = numpy.array(self.expected_payoff).transpose(2, 0, 1).copy()
+        payoff = outcome.transpose(1, 2, 0)
+        scores = ap.scores_array(payoff)
+        self.assertEqual(scores.tolist(), self.expected_scores)
+        self.assertEqual(
+            ap.normalised_scores_array(scores, 5).tolist(),
+            self.expected_normalised_scores)
+        self.assertEqual(
+            ap.ranking_array(scores).tolist(), self.expected_ranking)
+        self.assertEqual(ap.wins_array(payoff).tolist(), self.expected_wins)
+        self.assertEqual(
+            ap.payoff_diffs_means_array(payoff, 5).tolist(), self.diff_means)
+        self.assertEqual(
+            ap.score_diffs_array(payoff, 5).tolist(),
+            self.expected_score_diffs)
+        averages, stddevs = ap.normalised_payoff_array(payoff, 5)
+        self.assertEqual(
+            self.round_matrix(averages, 2), self.expected_normalised_payoff)
+        self.assertEqual(
+            self.round_matrix(stddevs, 2), self.expected_payoff_stddevs)
+
+    def test_ranking_ties(self):
+        self.assertEqual(ap.ranking([[1, 2], [3, 0], [2, 2]]), [2, 0, 1])
@@ -4,7 +4,8 @@ import random
 import unittest
 
 import axelrod
-from axelrod import DefaultGame, Game, Player, simulate_play
+from axelrod import (
+    DefaultGame, Game, Player, simulate_play, strategy_caller, call_strategy)
 
 
 C, D = axelrod.Actions.C, axelrod.Actions.D
@@ -68,6 +69,53 @@ class TestPlayerClass(unittest.TestCase):
     def test_strategy(self):
         self.assertRaises(NotImplementedError, self.player().strategy, self.player())
 
+    def test_strategy_caller(self):
+        callers = []
+
+        def record(self, opponent):
+            callers.append(strategy_caller())
+            return C
+
+        p1, p2 = self.player(), self.player()
+        p1.strategy = p2.strategy = lambda opponent: record(p1, opponent)
+        self.assertEqual(strategy_caller(), None)
+        p1.play(p2)
+        self.assertEqual(callers, ['play', 'play'])
+        self.assertEqual(call_strategy(p1, p2, 'strategy'), C)
+        self.assertEqual(callers[-1], 'strategy')
+        self.assertEqual(strategy_caller(), None)
+
+        p1.strategy = lambda opponent: call_strategy(opponent, p1, 'strategy')
+        p2.strategy = lambda opponent: 1 / 0
+        self.assertRaises(ZeroDivisionError, p1.play, p2)
+        self.assertEqual(strategy_caller(), None)
+
+    def test_snapshot_attributes(self):
+        player, opponent = self.player(), self.player()
+        player.strategy = cooperate
+        opponent.strategy = defect
+        player.team = [axelrod.TitForTat(), axelrod.Grudger()]
+        player.counts = {C: 0, D: 0}
+        player.seen = set()
+        team, counts = player.team, player.counts
+        snapshot = player.snapshot()
+        for member in team:
+            member.history.append(C)
+        counts[C] += 1
+        player.seen.add(C)
+        player.team = []
+        player.extra = True
+        player.play(opponent)
+        player.restore(snapshot)
+        self.assertIs(player.team, team)
+        self.assertEqual([len(member.history) for member in team], [0, 0])
+        self.assertEqual(player.counts, {C: 0, D: 0})
+        self.assertIs(player.counts, counts)
+        self.assertEqual(player.seen, set())
+        self.assertFalse(hasattr(player, 'extra'))
+        self.assertEqual(player.history, [])
+        self.assertEqual(player.cooperations, 0)
+
 
 def test_responses(test_class, P1, P2, history_1, history_2,
                    responses, random_seed=None):
@@ -145,6 +193,24 @@ class TestPlayer(unittest.TestCase):
         self.assertEqual(self.player().cooperations, 0)
         self.assertEqual(self.player().defections, 0)
 
+    def test_snapshot(self):
+        """Test that a restored player plays as it did after the snapshot."""
+        player, opponent = self.player(), axelrod.Alternator()
+        for turn in range(5):
+            player.play(opponent)
+        snapshots = player.snapshot(), opponent.snapshot()
+        plays = []
+        for attempt in range(2):
+            random.seed(0)
+            for turn in range(5):
+                player.play(opponent)
+            plays.append((player.history[:], opponent.history[:]))
+            player.restore(snapshots[0])
+            opponent.restore(snapshots[1])
+            self.assertEqual(len(player.history), 5)
+            self.assertEqual(player.cooperations + player.defections, 5)
+        self.assertEqual(plays[0], plays[1])
+
     def test_clone(self):
         # Make sure that self.init_args has the right number of arguments
         p1 = self.player()
@@ -233,8 +299,8 @@ class TestHeadsUp(unittest.TestCase):
         # Test sequence of play
         for outcome_1, outcome_2 in outcomes:
             player_1.play(player_2)
-            self.assertEqual(player_1_history[-1], outcome_1)
-            self.assertEqual(player_2_history[-1], outcome_2)
+            self.assertEqual(player_1.history[-1], outcome_1)
+            self.assertEqual(player_2.history[-1], outcome_2)
 
 
 def test_four_vector(test_class, expected_dictionary):
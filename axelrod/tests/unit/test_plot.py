@@ -109,6 +109,16 @@ class TestPlot(unittest.TestCase):
         else:
             self.skipTest('matplotlib not installed')
 
+    def test_ecosystem_replicates(self):
+        if matplotlib_installed:
+            eco = axelrod.Ecosystem(self.test_result_set, replicates=3)
+            eco.reproduce(100)
+            plot = axelrod.Plot(self.test_result_set)
+            self.assertIsInstance(
+                plot.stackplot(eco), matplotlib.pyplot.Figure)
+        else:
+            self.skipTest('matplotlib not installed')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -33,37 +33,57 @@ class TestRiskyQLearner(TestPlayer):
         random.seed(5)
         p1 = axelrod.RiskyQLearner()
         p2 = axelrod.Cooperator()
+        first, second = p1.encode_state('', 0), p1.encode_state(C, 1)
         simulate_play(p1, p2)
-        self.assertEqual(p1.Qs, {'': {C: 0, D: 0.9}, '0.0': {C: 0, D: 0}})
+        self.assertEqual(p1.Qs, {0: [0, 0.9], first: [0, 0]})
         simulate_play(p1, p2)
-        self.assertEqual(p1.Qs,{'': {C: 0, D: 0.9}, '0.0': {C: 2.7, D: 0}, 'C1.0': {C: 0, D: 0}})
+        self.assertEqual(p1.Qs, {0: [0, 0.9], first: [2.7, 0], second: [0, 0]})
 
     def test_vs_update(self):
         """Test that the q and v values update."""
         random.seed(5)
         p1 = axelrod.RiskyQLearner()
         p2 = axelrod.Cooperator()
+        first, second = p1.encode_state('', 0), p1.encode_state(C, 1)
         simulate_play(p1, p2)
-        self.assertEqual(p1.Vs, {'': 0.9, '0.0': 0})
+        self.assertEqual(p1.Vs, {0: 0.9, first: 0})
         simulate_play(p1, p2)
-        self.assertEqual(p1.Vs,{'': 0.9, '0.0': 2.7, 'C1.0': 0})
+        self.assertEqual(p1.Vs, {0: 0.9, first: 2.7, second: 0})
 
     def test_prev_state_updates(self):
         """Test that the q and v values update."""
         random.seed(5)
         p1 = axelrod.RiskyQLearner()
         p2 = axelrod.Cooperator()
+        first, second = p1.encode_state('', 0), p1.encode_state(C, 1)
         simulate_play(p1, p2)
-        self.assertEqual(p1.prev_state, '0.0')
+        self.assertEqual(p1.prev_state, first)
         simulate_play(p1, p2)
-        self.assertEqual(p1.prev_state, 'C1.0')
+        self.assertEqual(p1.prev_state, second)
+
+    def test_find_state(self):
+        """Test that the rolling state matches the opponent's history."""
+        random.seed(5)
+        p1 = axelrod.RiskyQLearner()
+        p2 = axelrod.Random()
+        self.assertEqual(p1.find_state(p2), p1.encode_state('', 0))
+        for turn in range(30):
+            p1.play(p2)
+            self.assertEqual(p1.find_state(p2),
+                             p1.encode_state(p2.history, p2.cooperations))
+        self.assertNotEqual(p1.encode_state([C] * 12, 12),
+                            p1.encode_state([C] * 11, 12))
+        p2.reset()
+        p2.history = [D, C, D]
+        p2.cooperations = 1
+        self.assertEqual(p1.find_state(p2), p1.encode_state([D, C, D], 1))
 
     def test_strategy(self):
         """Tests that it chooses the best strategy."""
         random.seed(5)
         p1 = axelrod.RiskyQLearner()
         p1.state = 'CCDC'
-        p1.Qs = {'': {C: 0, D: 0}, 'CCDC': {C: 2, D: 6}}
+        p1.Qs = {0: [0, 0], p1.encode_state('CCDC', 3): [2, 6]}
         p2 = axelrod.Cooperator()
         test_responses(self, p1, p2, [], [], [C, D, C, C, D, C, C])
 
@@ -72,15 +92,15 @@ class TestRiskyQLearner(TestPlayer):
         tests the reset method
         """
         P1 = axelrod.RiskyQLearner()
-        P1.Qs = {'': {C: 0, D: -0.9}, '0.0': {C: 0, D: 0}}
-        P1.Vs = {'': 0, '0.0': 0}
+        P1.Qs = {0: [0, -0.9], P1.encode_state('', 0): [0, 0]}
+        P1.Vs = {0: 0, P1.encode_state('', 0): 0}
         P1.history = [C, D, D, D]
         P1.prev_state = C
         P1.reset()
-        self.assertEqual(P1.prev_state, '')
+        self.assertEqual(P1.prev_state, 0)
         self.assertEqual(P1.history, [])
-        self.assertEqual(P1.Vs, {'': 0})
-        self.assertEqual(P1.Qs, {'': {C: 0, D: 0}})
+        self.assertEqual(P1.Vs, {0: 0})
+        self.assertEqual(P1.Qs, {0: [0, 0]})
 
 
 class TestArrogantQLearner(TestPlayer):
@@ -102,10 +122,11 @@ class TestArrogantQLearner(TestPlayer):
         random.seed(5)
         p1 = axelrod.ArrogantQLearner()
         p2 = axelrod.Cooperator()
+        first, second = p1.encode_state('', 0), p1.encode_state(C, 1)
         play_1, play_2 = simulate_play(p1, p2)
-        self.assertEqual(p1.Qs, {'': {C: 0, D: 0.9}, '0.0': {C: 0, D: 0}})
+        self.assertEqual(p1.Qs, {0: [0, 0.9], first: [0, 0]})
         simulate_play(p1, p2)
-        self.assertEqual(p1.Qs,{'': {C: 0, D: 0.9}, '0.0': {C: 2.7, D: 0}, 'C1.0': {C: 0, D: 0}})
+        self.assertEqual(p1.Qs, {0: [0, 0.9], first: [2.7, 0], second: [0, 0]})
 
     def test_vs_update(self):
         """
@@ -114,10 +135,11 @@ class TestArrogantQLearner(TestPlayer):
         random.seed(5)
         p1 = axelrod.ArrogantQLearner()
         p2 = axelrod.Cooperator()
+        first, second = p1.encode_state('', 0), p1.encode_state(C, 1)
         simulate_play(p1, p2)
-        self.assertEqual(p1.Vs, {'': 0.9, '0.0': 0})
+        self.assertEqual(p1.Vs, {0: 0.9, first: 0})
         simulate_play(p1, p2)
-        self.assertEqual(p1.Vs,{'': 0.9, '0.0': 2.7, 'C1.0': 0})
+        self.assertEqual(p1.Vs, {0: 0.9, first: 2.7, second: 0})
 
     def test_prev_state_updates(self):
         """
@@ -126,32 +148,33 @@ class TestArrogantQLearner(TestPlayer):
         random.seed(5)
         p1 = axelrod.ArrogantQLearner()
         p2 = axelrod.Cooperator()
+        first, second = p1.encode_state('', 0), p1.encode_state(C, 1)
         simulate_play(p1, p2)
-        self.assertEqual(p1.prev_state, '0.0')
+        self.assertEqual(p1.prev_state, first)
         simulate_play(p1, p2)
-        self.assertEqual(p1.prev_state, 'C1.0')
+        self.assertEqual(p1.prev_state, second)
 
     def test_strategy(self):
         """Tests that it chooses the best strategy."""
         random.seed(9)
         p1 = axelrod.ArrogantQLearner()
         p1.state = 'CCDC'
-        p1.Qs = {'': {C: 0, D: 0}, 'CCDC': {C: 2, D: 6}}
+        p1.Qs = {0: [0, 0], p1.encode_state('CCDC', 3): [2, 6]}
         p2 = axelrod.Cooperator()
         test_responses(self, p1, p2, [], [], [C, C, C, C, C, C, C])
 
     def test_reset_method(self):
         """Tests the reset method."""
         P1 = axelrod.ArrogantQLearner()
-        P1.Qs = {'': {C: 0, D: -0.9}, '0.0': {C: 0, D: 0}}
-        P1.Vs = {'': 0, '0.0': 0}
+        P1.Qs = {0: [0, -0.9], P1.encode_state('', 0): [0, 0]}
+        P1.Vs = {0: 0, P1.encode_state('', 0): 0}
         P1.history = [C, D, D, D]
         P1.prev_state = C
         P1.reset()
-        self.assertEqual(P1.prev_state, '')
+        self.assertEqual(P1.prev_state, 0)
         self.assertEqual(P1.history, [])
-        self.assertEqual(P1.Vs, {'':0})
-        self.assertEqual(P1.Qs, {'':{C:0, D:0}})
+        self.assertEqual(P1.Vs, {0:0})
+        self.assertEqual(P1.Qs, {0:[0, 0]})
 
 
 class TestHesitantQLearner(TestPlayer):
@@ -171,10 +194,11 @@ class TestHesitantQLearner(TestPlayer):
         random.seed(5)
         p1 = axelrod.HesitantQLearner()
         p2 = axelrod.Cooperator()
+        first, second = p1.encode_state('', 0), p1.encode_state(C, 1)
         simulate_play(p1, p2)
-        self.assertEqual(p1.Qs, {'': {C: 0, D: 0.1}, '0.0': {C: 0, D: 0}})
+        self.assertEqual(p1.Qs, {0: [0, 0.1], first: [0, 0]})
         simulate_play(p1, p2)
-        self.assertEqual(p1.Qs,{'': {C: 0, D: 0.1}, '0.0': {C: 0.30000000000000004, D: 0}, 'C1.0': {C: 0, D: 0}})
+        self.assertEqual(p1.Qs, {0: [0, 0.1], first: [0.30000000000000004, 0], second: [0, 0]})
 
     def test_vs_update(self):
         """
@@ -183,10 +207,11 @@ class TestHesitantQLearner(TestPlayer):
         random.seed(5)
         p1 = axelrod.HesitantQLearner()
         p2 = axelrod.Cooperator()
+        first, second = p1.encode_state('', 0), p1.encode_state(C, 1)
         simulate_play(p1, p2)
-        self.assertEqual(p1.Vs, {'': 0.1, '0.0': 0})
+        self.assertEqual(p1.Vs, {0: 0.1, first: 0})
         simulate_play(p1, p2)
-        self.assertEqual(p1.Vs,{'': 0.1, '0.0': 0.30000000000000004, 'C1.0': 0})
+        self.assertEqual(p1.Vs, {0: 0.1, first: 0.30000000000000004, second: 0})
 
     def test_prev_state_updates(self):
         """
@@ -195,17 +220,18 @@ class TestHesitantQLearner(TestPlayer):
         random.seed(5)
         p1 = axelrod.HesitantQLearner()
         p2 = axelrod.Cooperator()
+        first, second = p1.encode_state('', 0), p1.encode_state(C, 1)
         simulate_play(p1, p2)
-        self.assertEqual(p1.prev_state, '0.0')
+        self.assertEqual(p1.prev_state, first)
         simulate_play(p1, p2)
-        self.assertEqual(p1.prev_state, 'C1.0')
+        self.assertEqual(p1.prev_state, second)
 
     def test_strategy(self):
         """Tests that it chooses the best strategy."""
         random.seed(9)
         p1 = axelrod.HesitantQLearner()
         p1.state = 'CCDC'
-        p1.Qs = {'': {C: 0, D: 0}, 'CCDC': {C: 2, D: 6}}
+        p1.Qs = {0: [0, 0], p1.encode_state('CCDC', 3): [2, 6]}
         p2 = axelrod.Cooperator()
         test_responses(self, p1, p2, [], [], [C, C, C, C, C, C, C])
 
@@ -214,15 +240,15 @@ class TestHesitantQLearner(TestPlayer):
         tests the reset method
         """
         P1 = axelrod.HesitantQLearner()
-        P1.Qs = {'': {C: 0, D: -0.9}, '0.0': {C: 0, D: 0}}
-        P1.Vs = {'': 0, '0.0': 0}
+        P1.Qs = {0: [0, -0.9], P1.encode_state('', 0): [0, 0]}
+        P1.Vs = {0: 0, P1.encode_state('', 0): 0}
         P1.history = [C, D, D, D]
         P1.prev_state = C
         P1.reset()
-        self.assertEqual(P1.prev_state, '')
+        self.assertEqual(P1.prev_state, 0)
         self.assertEqual(P1.history, [])
-        self.assertEqual(P1.Vs, {'': 0})
-        self.assertEqual(P1.Qs, {'': {C: 0, D: 0}})
+        self.assertEqual(P1.Vs, {0: 0})
+        self.assertEqual(P1.Qs, {0: [0, 0]})
 
 
 class TestCautiousQLearner(TestPlayer):
@@ -242,49 +268,52 @@ class TestCautiousQLearner(TestPlayer):
         random.seed(5)
         p1 = axelrod.CautiousQLearner()
         p2 = axelrod.Cooperator()
+        first, second = p1.encode_state('', 0), p1.encode_state(C, 1)
         simulate_play(p1, p2)
-        self.assertEqual(p1.Qs, {'': {C: 0, D: 0.1}, '0.0': {C: 0, D: 0}})
+        self.assertEqual(p1.Qs, {0: [0, 0.1], first: [0, 0]})
         simulate_play(p1, p2)
-        self.assertEqual(p1.Qs,{'': {C: 0, D: 0.1}, '0.0': {C: 0.30000000000000004, D: 0}, 'C1.0': {C: 0, D: 0.0}})
+        self.assertEqual(p1.Qs, {0: [0, 0.1], first: [0.30000000000000004, 0], second: [0, 0.0]})
 
     def test_vs_update(self):
         """Test that the q and v values update."""
         random.seed(5)
         p1 = axelrod.CautiousQLearner()
         p2 = axelrod.Cooperator()
+        first, second = p1.encode_state('', 0), p1.encode_state(C, 1)
         simulate_play(p1, p2)
-        self.assertEqual(p1.Vs, {'': 0.1, '0.0': 0})
+        self.assertEqual(p1.Vs, {0: 0.1, first: 0})
         simulate_play(p1, p2)
-        self.assertEqual(p1.Vs,{'': 0.1, '0.0': 0.30000000000000004, 'C1.0': 0})
+        self.assertEqual(p1.Vs, {0: 0.1, first: 0.30000000000000004, second: 0})
 
     def test_prev_state_updates(self):
         """Test that the q and v values update."""
         random.seed(5)
         p1 = axelrod.CautiousQLearner()
         p2 = axelrod.Cooperator()
+        first, second = p1.encode_state('', 0), p1.encode_state(C, 1)
         simulate_play(p1, p2)
-        self.assertEqual(p1.prev_state, '0.0')
+        self.assertEqual(p1.prev_state, first)
         simulate_play(p1, p2)
-        self.assertEqual(p1.prev_state, 'C1.0')
+        self.assertEqual(p1.prev_state, second)
 
     def test_strategy(self):
         """Tests that it chooses the best strategy."""
         random.seed(9)
         p1 = axelrod.CautiousQLearner()
         p1.state = 'CCDC'
-        p1.Qs = {'': {C: 0, D: 0}, 'CCDC': {C: 2, D: 6}}
+        p1.Qs = {0: [0, 0], p1.encode_state('CCDC', 3): [2, 6]}
         p2 = axelrod.Cooperator()
         test_responses(self, p1, p2, [], [], [C, C, C, C, C, C, C])
 
     def test_reset_method(self):
         """Tests the reset method."""
         P1 = axelrod.CautiousQLearner()
-        P1.Qs = {'': {C: 0, D: -0.9}, '0.0': {C: 0, D: 0}}
-        P1.Vs = {'': 0, '0.0': 0}
+        P1.Qs = {0: [0, -0.9], P1.encode_state('', 0): [0, 0]}
+        P1.Vs = {0: 0, P1.encode_state('', 0): 0}
         P1.history = [C, D, D, D]
         P1.prev_state = C
         P1.reset()
-        self.assertEqual(P1.prev_state, '')
+        self.assertEqual(P1.prev_state, 0)
         self.assertEqual(P1.history, [])
-        self.assertEqual(P1.Vs, {'': 0})
-        self.assertEqual(P1.Qs, {'': {C: 0, D: 0}})
+        self.assertEqual(P1.Vs, {0: 0})
+        self.assertEqual(P1.Qs, {0: [0, 0]})
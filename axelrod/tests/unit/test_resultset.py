@@ -1,4 +1,7 @@
+import shutil
+import tempfile
 import unittest
+import numpy
 import axelrod
 
 
@@ -59,6 +62,98 @@ class TestResultSet(unittest.TestCase):
         self.assertEqual(rs._results(self.test_outcome), self.expected_results)
         self.assertEqual(rs.results, self.expected_results)
 
+    def test_result_arrays(self):
+        outcome = dict((key, numpy.array(value))
+                       for key, value in self.test_outcome.items())
+        rs = axelrod.ResultSet(self.players, 5, 2, outcome)
+        self.assertEqual(rs.result_arrays['payoff'].shape, (3, 3, 2))
+        # The arrays are views of the outcome rather than copies
+        self.assertIs(rs.result_arrays['payoff'].base, outcome['payoff'])
+        self.assertEqual(rs.results, self.expected_results)
+
     def test_csv(self):
         rs = axelrod.ResultSet(self.players, 5, 2, self.test_outcome)
         self.assertEqual(rs.csv(), self.expected_csv)
+
+    def test_lazy_metrics(self):
+        rs = axelrod.ResultSet(self.players, 5, 2, self.test_outcome)
+        self.assertNotIn('scores', rs.__dict__)
+        self.assertEqual(rs.ranked_names, ['Alternator', 'Random', 'TitForTat'])
+        self.assertIn('scores', rs.__dict__)
+        self.assertNotIn('cooperation', rs.__dict__)
+        self.assertNotIn('_eigen_ratings', rs.__dict__)
+        self.assertIs(rs.scores, rs.scores)
+        self.assertEqual(rs.cooperation, [[6, 6, 6], [6, 10, 6], [7, 5, 5]])
+
+    def test_missing_metrics(self):
+        rs = axelrod.ResultSet(self.players, 5, 2, self.test_outcome, False)
+        self.assertEqual(rs.eigenmoses_rating, None)
+        self.assertEqual(rs.good_partner_rating, None)
+        rs = axelrod.ResultSet(
+            self.players, 5, 2,
+            {'cooperation': self.test_outcome['cooperation']})
+        self.assertEqual(rs.ranking, None)
+        self.assertEqual(rs.payoff_stddevs, None)
+        self.assertEqual(
+            rs.cooperating_rating, [0.6, 11 / 15.0, 17 / 30.0])
+
+    def test_invalidate(self):
+        outcome = dict((key, numpy.array(value))
+                       for key, value in self.test_outcome.items())
+        rs = axelrod.ResultSet(self.players, 5, 2, outcome)
+        self.assertEqual(rs.ranking, [0, 2, 1])
+        self.assertEqual(rs.wins, [[2, 0], [0, 0], [0, 2]])
+        outcome['payoff'][:, 1, :] += 10
+        self.assertEqual(rs.ranking, [0, 2, 1])
+        rs.invalidate()
+        self.assertEqual(rs.ranking, [1, 0, 2])
+        self.assertEqual(rs.wins, [[2, 0], [4, 4], [0, 0]])
+
+    def test_save_and_load(self):
+        directory = tempfile.mkdtemp()
+        try:
+            rs = axelrod.ResultSet(self.players, 5, 2, self.test_outcome)
+            rs.save(directory)
+            loaded = axelrod.ResultSet.load(directory)
+            self.assertEqual(loaded.players, list(self.players))
+            self.assertEqual(loaded.turns, 5)
+            self.assertEqual(loaded.repetitions, 2)
+            self.assertIsInstance(loaded.outcome['payoff'], numpy.memmap)
+            self.assertIsInstance(loaded.saved_array('wins'), numpy.memmap)
+            matrix, stddevs = loaded.saved_array('_normalised_payoff')
+            self.assertIsInstance(matrix, numpy.memmap)
+            self.assertIsInstance(stddevs, numpy.memmap)
+            self.assertEqual(loaded.saved_array('wins').tolist(), rs.wins)
+            self.assertEqual(loaded.results, self.expected_results)
+            # The metrics are read from their files when first used
+            self.assertIn('wins', loaded._saved_metrics)
+            for name in ('ranking', 'ranked_names', 'wins', 'score_diffs',
+                         'payoff_matrix', 'payoff_stddevs',
+                         'good_partner_rating', 'eigenjesus_rating',
+                         'eigenmoses_rating'):
+                self.assertEqual(getattr(loaded, name), getattr(rs, name))
+            self.assertNotIn('wins', loaded._saved_metrics)
+            self.assertEqual(loaded.csv(), self.expected_csv)
+            loaded.invalidate()
+            self.assertEqual(loaded._saved_metrics, {})
+            self.assertEqual(loaded.saved_array('wins'), None)
+            self.assertEqual(loaded.ranking, rs.ranking)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_save_missing_metrics(self):
+        directory = tempfile.mkdtemp()
+        try:
+            rs = axelrod.ResultSet(
+                self.players, 5, 2, self.test_outcome, False)
+            rs.save(directory)
+            loaded = axelrod.ResultSet.load(directory, mmap_mode=None)
+            self.assertFalse(loaded.with_morality)
+            self.assertEqual(loaded.cooperation, None)
+            self.assertEqual(loaded.eigenmoses_rating, None)
+            self.assertEqual(loaded.scores, rs.scores)
+            self.assertNotIsInstance(loaded.saved_array('scores'),
+                                     numpy.memmap)
+        finally:
+            shutil.rmtree(directory)
+
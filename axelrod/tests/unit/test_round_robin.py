@@ -1,5 +1,6 @@
 import unittest
 import random
+import numpy
 import axelrod
 
 C, D = axelrod.Actions.C, axelrod.Actions.D
@@ -51,7 +52,24 @@ class TestRoundRobin(unittest.TestCase):
             players=[p1, p2], game=self.game, turns=20)
         result = rr._empty_matrix(2, 2)
         expected = [[0, 0], [0, 0]]
-        self.assertEqual(result, expected)
+        self.assertEqual(result.tolist(), expected)
+        self.assertEqual(result.dtype, numpy.float64)
+        result = rr._empty_matrix(2, 3, rr.cooperation_dtype)
+        self.assertEqual(result.shape, (2, 3))
+        self.assertEqual(result.dtype, numpy.int64)
+
+    def test_play_into(self):
+        p1, p2 = axelrod.Cooperator(), axelrod.Defector()
+        rr = axelrod.RoundRobin(
+            players=[p1, p2], game=self.game, turns=20)
+        payoff = numpy.zeros((3, 2, 2))
+        cooperation = numpy.zeros((3, 2, 2), dtype=numpy.int64)
+        view = payoff[1]
+        output = rr.play_into(view, cooperation[1])
+        self.assertIs(output['payoff'], view)
+        self.assertEqual(payoff[1].tolist(), [[60, 0], [100, 20]])
+        self.assertEqual(cooperation[1].tolist(), [[20, 20], [0, 0]])
+        self.assertFalse(payoff[0].any() or payoff[2].any())
 
     def test_score_single_interaction(self):
         players = [
@@ -92,8 +110,8 @@ class TestRoundRobin(unittest.TestCase):
         player1, player2, key = rr._pair_of_players(0, 2)
         self.assertEqual(player1.name, 'Cooperator')
         self.assertEqual(player2.name, 'Tit For Tat')
-        self.assertEqual(key[0], axelrod.Cooperator)
-        self.assertEqual(key[1], axelrod.TitForTat)
+        self.assertEqual(key[0][0], axelrod.Cooperator)
+        self.assertEqual(key[1][0], axelrod.TitForTat)
         player1, player2, key = rr._pair_of_players(0, 0)
         self.assertEqual(player1.name, player2.name)
         self.assertEqual(key[0], key[1])
@@ -103,6 +121,37 @@ class TestRoundRobin(unittest.TestCase):
         player2.name = 'player 2'
         self.assertNotEqual(player1.name, player2.name)
 
+    def test_cache_key(self):
+        players = [axelrod.GoByMajority(5), axelrod.GoByMajority(40),
+                   axelrod.MetaMajority(team=[axelrod.Cooperator])]
+        rr = axelrod.RoundRobin(players=players, game=self.game, turns=20)
+        key = rr._cache_key(players[0], players[1])
+        self.assertEqual(key, (
+            (axelrod.GoByMajority, (5, True), -1),
+            (axelrod.GoByMajority, (40, True), -1),
+            20, (3, 1, 0, 5)))
+        self.assertNotEqual(key, rr._cache_key(players[1], players[0]))
+        # List arguments are made hashable
+        self.assertEqual(
+            rr._cache_key(players[2], players[2])[0][1],
+            ((axelrod.Cooperator,),))
+        # The number of turns, the game and the match length are all included
+        other = axelrod.RoundRobin(
+            players=players, game=axelrod.Game(4, 0, 5, 1), turns=20)
+        self.assertNotEqual(key, other._cache_key(players[0], players[1]))
+        other = axelrod.RoundRobin(players=players, game=self.game, turns=30)
+        self.assertNotEqual(key, other._cache_key(players[0], players[1]))
+        players[0].set_tournament_attributes(length=20)
+        self.assertNotEqual(key, rr._cache_key(players[0], players[1]))
+
+    def test_unhashable_cache_key(self):
+        p1, p2 = axelrod.Cooperator(), axelrod.Defector()
+        p1.init_args = (set([1]),)
+        rr = axelrod.RoundRobin(players=[p1, p2], game=self.game, turns=20)
+        self.assertIsNone(rr._cache_key(p1, p2))
+        rr._cache_outcome(0, 1, (0, 100), (20, 0))
+        self.assertEqual(rr.deterministic_cache, {})
+
     def test_stochastic_interaction(self):
         p1, p2 = axelrod.Player(), axelrod.Player()
         rr = axelrod.RoundRobin(
@@ -116,6 +165,15 @@ class TestRoundRobin(unittest.TestCase):
             players=[p1, p2], game=self.game, turns=20)
         self.assertTrue(rr._stochastic_interaction(p1, p2))
 
+    def test_cycles_interaction(self):
+        p1, p2 = axelrod.TitForTat(), axelrod.CyclerCCD()
+        rr = axelrod.RoundRobin(players=[p1, p2], game=self.game, turns=20)
+        self.assertTrue(rr._cycles_interaction(p1, p2))
+        self.assertFalse(rr._cycles_interaction(p1, axelrod.Grudger()))
+        rr = axelrod.RoundRobin(
+            players=[p1, p2], game=self.game, turns=20, noise=0.1)
+        self.assertFalse(rr._cycles_interaction(p1, p2))
+
     def test_play_single_interaction(self):
         players = [
             axelrod.Alternator(), axelrod.Defector(), axelrod.TitForTat()]
@@ -123,9 +181,9 @@ class TestRoundRobin(unittest.TestCase):
             players=players, game=self.game, turns=20)
         player1 = players[0]
         player2 = players[2]
-        classes = (player1.__class__, player2.__class__)
+        key = rr._cache_key(player1, player2)
         scores, cooperation_rates = (
-            rr._play_single_interaction(player1, player2, classes))
+            rr._play_single_interaction(player1, player2, key))
         expected_scores = (53, 48)
         expected_cooperation_rates = (10, 11)
         self.assertEqual(expected_scores, scores)
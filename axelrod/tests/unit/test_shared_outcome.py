@@ -0,0 +1,56 @@
+"""Tests for tournament outcomes held in shared memory."""
+
+import unittest
+import multiprocessing
+import numpy
+from axelrod.shared_outcome import SharedOutcome, shared_memory_available
+
+
+@unittest.skipUnless(
+    shared_memory_available(), "shared memory is not available")
+class TestSharedOutcome(unittest.TestCase):
+
+    def outcome(self):
+        return {'payoff': numpy.arange(12, dtype=numpy.float64).reshape(
+                    (3, 2, 2)),
+                'cooperation': numpy.zeros((3, 2, 2), dtype=numpy.int64)}
+
+    def test_create(self):
+        outcome = self.outcome()
+        shared = SharedOutcome.create(outcome)
+        self.assertEqual(sorted(shared.arrays), ['cooperation', 'payoff'])
+        for key in outcome:
+            self.assertEqual(shared.arrays[key].tolist(), outcome[key].tolist())
+            self.assertEqual(shared.arrays[key].dtype, outcome[key].dtype)
+        # The shared arrays are a copy
+        shared.arrays['payoff'][0][0][0] = 100
+        self.assertEqual(outcome['payoff'][0][0][0], 0)
+        shared.close()
+        self.assertEqual(shared.arrays, {})
+
+    def test_attach_and_copy_to(self):
+        outcome = self.outcome()
+        shared = SharedOutcome.create(outcome)
+        attached = SharedOutcome.attach(shared.specification)
+        attached.arrays['cooperation'][2][1][0] = 7
+        attached.close()
+        shared.copy_to(outcome)
+        shared.close()
+        self.assertEqual(outcome['cooperation'][2][1][0], 7)
+        self.assertEqual(outcome['payoff'][2][1][1], 11)
+
+    def test_written_by_another_process(self):
+        outcome = self.outcome()
+        shared = SharedOutcome.create(outcome)
+
+        def write(specification):
+            attached = SharedOutcome.attach(specification)
+            attached.arrays['payoff'][1] = -1
+            attached.close()
+
+        process = multiprocessing.Process(
+            target=write, args=(shared.specification,))
+        process.start()
+        process.join()
+        self.assertEqual(shared.arrays['payoff'][1].tolist(), [[-1, -1], [-1, -1]])
+        shared.close()
@@ -4,6 +4,8 @@ import unittest
 import axelrod
 import logging
 import multiprocessing
+import numpy
+from axelrod.shared_outcome import SharedOutcome, shared_memory_available
 
 try:
     # Python 3
@@ -68,7 +70,10 @@ class TestTournament(unittest.TestCase):
         self.assertIsInstance(tournament._logger, logging.Logger)
         self.assertEqual(tournament.deterministic_cache, {})
         self.assertEqual(tournament.noise, 0.2)
-        self.assertEqual(tournament._parallel_repetitions, 10)
+        self.assertEqual(tournament._outcome['payoff'].shape, (10, 5, 5))
+        self.assertEqual(tournament._outcome['payoff'].dtype, numpy.float64)
+        self.assertEqual(
+            tournament._outcome['cooperation'].dtype, numpy.int64)
         anonymous_tournament = axelrod.Tournament(players=self.players)
         self.assertEqual(anonymous_tournament.name, 'axelrod')
 
@@ -96,7 +101,8 @@ class TestTournament(unittest.TestCase):
             name='_run_parallel_repetitions')
         tournament.play()
         tournament._run_serial_repetitions.assert_called_once_with(
-            {'cooperation': [], 'payoff': []})
+            tournament._outcome)
+        self.assertFalse(tournament._outcome['payoff'].any())
         self.assertFalse(tournament._run_parallel_repetitions.called)
 
     def test_parallel_play(self):
@@ -111,8 +117,7 @@ class TestTournament(unittest.TestCase):
         results = tournament.play()
         self.assertIsInstance(results, axelrod.ResultSet)
 
-        # Test that _run_parallel_repetitions is called with
-        # one entry in payoffs list
+        # Test that _run_parallel_repetitions is called with the empty outcome
         tournament = axelrod.Tournament(
             name=self.test_name,
             players=self.players,
@@ -125,9 +130,9 @@ class TestTournament(unittest.TestCase):
         tournament._run_parallel_repetitions = MagicMock(
             name='_run_parallel_repetitions')
         tournament.play()
-        tournament._run_parallel_repetitions.assert_called_once_with({
-            'payoff': [self.expected_payoff],
-            'cooperation': [self.expected_cooperation]})
+        tournament._run_parallel_repetitions.assert_called_once_with(
+            tournament._outcome)
+        self.assertFalse(tournament._outcome['payoff'].any())
         self.assertFalse(tournament._run_serial_repetitions.called)
 
     def test_build_cache_required(self):
@@ -188,53 +193,75 @@ class TestTournament(unittest.TestCase):
             prebuilt_cache=False)
         self.assertTrue(tournament._build_cache_required())
 
-    def test_build_cache(self):
+    def test_schedule_matches(self):
+        players = [axelrod.Cooperator(), axelrod.Defector(), axelrod.Random()]
         tournament = axelrod.Tournament(
             name=self.test_name,
-            players=self.players,
+            players=players,
             game=self.game,
-            turns=200,
-            repetitions=self.test_repetitions,
+            turns=10,
+            repetitions=3,
             processes=2)
-        tournament._run_single_repetition = MagicMock(
-            name='_run_single_repetition')
-        tournament._build_cache([])
-        tournament._run_single_repetition.assert_called_once_with([])
-        self.assertEqual(
-            tournament._parallel_repetitions, self.test_repetitions - 1)
+        round_robin = tournament._round_robin()
+        tournament.deterministic_cache[
+            round_robin._cache_key(players[0], players[1])] = {
+                'scores': (0, 50), 'cooperation_rates': (10, 0)}
+        outcome = tournament._empty_outcome()
+        matches = tournament._schedule_matches(round_robin, outcome)
+        # The cached pair is filled in for every repetition
+        for r in range(3):
+            self.assertEqual(outcome['payoff'][r][0][1], 0)
+            self.assertEqual(outcome['payoff'][r][1][0], 50)
+            self.assertEqual(outcome['cooperation'][r][0][1], 10)
+        # Other deterministic pairs are played once, stochastic ones always
+        self.assertEqual(matches, [
+            (None, 0, 0),
+            (0, 0, 2), (1, 0, 2), (2, 0, 2),
+            (None, 1, 1),
+            (0, 1, 2), (1, 1, 2), (2, 1, 2),
+            (0, 2, 2), (1, 2, 2), (2, 2, 2)])
+
+    def test_chunks(self):
+        matches = list(range(100))
+        chunks = axelrod.Tournament._chunks(matches, 4)
+        self.assertEqual(sum(chunks, []), matches)
+        sizes = [len(chunk) for chunk in chunks]
+        self.assertEqual(sizes[0], 12)
+        self.assertEqual(sizes, sorted(sizes, reverse=True))
+        self.assertEqual(sizes[-1], 1)
+        self.assertEqual(axelrod.Tournament._chunks([], 4), [])
 
     def test_run_single_repetition(self):
-        outcome = {'payoff': [], 'cooperation': []}
         tournament = axelrod.Tournament(
             name=self.test_name,
             players=self.players,
             game=self.game,
             turns=200,
             repetitions=self.test_repetitions)
-        tournament._run_single_repetition(outcome)
-        self.assertEqual(len(outcome['payoff']), 1)
-        self.assertEqual(len(outcome['cooperation']), 1)
-        self.assertEqual(outcome['payoff'][0], self.expected_payoff)
-        self.assertEqual(outcome['cooperation'][0], self.expected_cooperation)
+        outcome = tournament._empty_outcome()
+        tournament._run_single_repetition(outcome, 1)
+        self.assertEqual(outcome['payoff'][1].tolist(), self.expected_payoff)
+        self.assertEqual(
+            outcome['cooperation'][1].tolist(), self.expected_cooperation)
+        self.assertFalse(outcome['payoff'][0].any())
+        self.assertFalse(outcome['cooperation'][2:].any())
 
     def test_run_serial_repetitions(self):
-        outcome = {'payoff': [], 'cooperation': []}
         tournament = axelrod.Tournament(
             name=self.test_name,
             players=self.players,
             game=self.game,
             turns=200,
             repetitions=self.test_repetitions)
+        outcome = tournament._empty_outcome()
         tournament._run_serial_repetitions(outcome)
-        self.assertEqual(len(outcome['payoff']), self.test_repetitions)
-        self.assertEqual(len(outcome['cooperation']), self.test_repetitions)
         for r in range(self.test_repetitions):
-            self.assertEqual(outcome['payoff'][r], self.expected_payoff)
             self.assertEqual(
-                outcome['cooperation'][r], self.expected_cooperation)
+                outcome['payoff'][r].tolist(), self.expected_payoff)
+            self.assertEqual(
+                outcome['cooperation'][r].tolist(), self.expected_cooperation)
 
     def test_run_parallel_repetitions(self):
-        outcome = {'payoff': [], 'cooperation': []}
         tournament = axelrod.Tournament(
             name=self.test_name,
             players=self.players,
@@ -242,13 +269,13 @@ class TestTournament(unittest.TestCase):
             turns=200,
             repetitions=self.test_repetitions,
             processes=2)
+        outcome = tournament._empty_outcome()
         tournament._run_parallel_repetitions(outcome)
-        self.assertEqual(len(outcome['payoff']), self.test_repetitions)
-        self.assertEqual(len(outcome['cooperation']), self.test_repetitions)
         for r in range(self.test_repetitions):
-            self.assertEqual(outcome['payoff'][r], self.expected_payoff)
             self.assertEqual(
-                outcome['cooperation'][r], self.expected_cooperation)
+                outcome['payoff'][r].tolist(), self.expected_payoff)
+            self.assertEqual(
+                outcome['cooperation'][r].tolist(), self.expected_cooperation)
 
     def test_n_workers(self):
         max_processes = multiprocessing.cpu_count()
@@ -292,7 +319,7 @@ class TestTournament(unittest.TestCase):
         work_queue = multiprocessing.Queue()
         done_queue = multiprocessing.Queue()
         for repetition in range(self.test_repetitions):
-            work_queue.put(repetition)
+            work_queue.put([(repetition, 0, 1)])
         tournament = axelrod.Tournament(
             name=self.test_name,
             players=self.players,
@@ -311,24 +338,32 @@ class TestTournament(unittest.TestCase):
     def test_process_done_queue(self):
         workers = 2
         done_queue = multiprocessing.Queue()
-        outcome = {'payoff': [], 'cooperation': []}
         tournament = axelrod.Tournament(
             name=self.test_name,
             players=self.players,
             game=self.game,
             turns=200,
             repetitions=self.test_repetitions)
-        for r in range(self.test_repetitions):
-            done_queue.put(
-                {'payoff': 'test_payoffs', 'cooperation': 'test_cooperation'})
+        outcome = tournament._empty_outcome()
+        round_robin = tournament._round_robin()
+        done_queue.put([(r, 0, 2, (r, 2 * r), (r + 1, 0))
+                        for r in range(self.test_repetitions)])
+        done_queue.put([(None, 0, 1, (600, 600), (200, 200))])
         for w in range(workers):
             done_queue.put('STOP')
-        tournament._process_done_queue(workers, done_queue, outcome)
-        self.assertEqual(len(outcome['payoff']), self.test_repetitions)
-        self.assertEqual(len(outcome['cooperation']), self.test_repetitions)
-        for repetition in range(self.test_repetitions):
-            self.assertEqual(outcome['payoff'][r], 'test_payoffs')
-            self.assertEqual(outcome['cooperation'][r], 'test_cooperation')
+        tournament._process_done_queue(
+            workers, done_queue, outcome, round_robin)
+        for r in range(self.test_repetitions):
+            self.assertEqual(outcome['payoff'][r][0][2], r)
+            self.assertEqual(outcome['payoff'][r][2][0], 2 * r)
+            self.assertEqual(outcome['cooperation'][r][0][2], r + 1)
+            # The repeatable pair fills every repetition
+            self.assertEqual(outcome['payoff'][r][0][1], 600)
+            self.assertEqual(outcome['cooperation'][r][1][0], 200)
+        self.assertEqual(
+            tournament.deterministic_cache[round_robin._cache_key(
+                self.players[0], self.players[1])]['scores'],
+            (600, 600))
 
     def test_worker(self):
         tournament = axelrod.Tournament(
@@ -340,17 +375,50 @@ class TestTournament(unittest.TestCase):
 
         work_queue = multiprocessing.Queue()
         for repetition in range(self.test_repetitions):
-            work_queue.put(repetition)
+            work_queue.put([(repetition, 0, 2), (repetition, 2, 2)])
         work_queue.put('STOP')
 
         done_queue = multiprocessing.Queue()
         tournament._worker(work_queue, done_queue)
         for r in range(self.test_repetitions):
             output = done_queue.get()
-            self.assertEqual(output['payoff'], self.expected_payoff)
-            self.assertEqual(output['cooperation'], self.expected_cooperation)
+            self.assertEqual(output, [
+                (r, 0, 2, (0, 1000), (200, 0)),
+                (r, 2, 2, (200, 200), (0, 0))])
         queue_stop = done_queue.get()
         self.assertEqual(queue_stop, 'STOP')
+        # Workers do not add to the cache
+        self.assertEqual(tournament.deterministic_cache, {})
+
+    @unittest.skipUnless(
+        shared_memory_available(), "shared memory is not available")
+    def test_worker_with_shared_outcome(self):
+        tournament = axelrod.Tournament(
+            name=self.test_name,
+            players=self.players,
+            game=self.game,
+            turns=200,
+            repetitions=self.test_repetitions)
+        shared = SharedOutcome.create(tournament._empty_outcome())
+
+        work_queue = multiprocessing.Queue()
+        work_queue.put([(1, 0, 2), (None, 2, 2)])
+        work_queue.put('STOP')
+        done_queue = multiprocessing.Queue()
+        tournament._worker(work_queue, done_queue, shared.specification)
+        # Only the result standing for every repetition is sent back
+        self.assertEqual(
+            done_queue.get(), [(None, 2, 2, (200, 200), (0, 0))])
+        self.assertEqual(done_queue.get(), 'STOP')
+
+        outcome = shared.arrays
+        self.assertEqual(outcome['payoff'][1][0][2], 0)
+        self.assertEqual(outcome['payoff'][1][2][0], 1000)
+        self.assertEqual(outcome['cooperation'][1][0][2], 200)
+        self.assertFalse(outcome['cooperation'][0].any())
+        for r in range(self.test_repetitions):
+            self.assertEqual(outcome['payoff'][r][2][2], 200)
+        shared.close()
 
     def test_play_round_robin_mutable(self):
         tournament = axelrod.Tournament(
@@ -360,9 +428,10 @@ class TestTournament(unittest.TestCase):
             turns=200,
             repetitions=self.test_repetitions)
         output = tournament._play_round_robin()
-        self.assertEqual(output['payoff'], self.expected_payoff)
+        self.assertEqual(output['payoff'].tolist(), self.expected_payoff)
         self.assertTrue(
-            (axelrod.Cooperator, axelrod.Defector) in
+            tournament._round_robin()._cache_key(
+                self.players[0], self.players[1]) in
             tournament.deterministic_cache)
 
     def test_play_round_robin_immutable(self):
@@ -373,5 +442,23 @@ class TestTournament(unittest.TestCase):
             turns=200,
             repetitions=self.test_repetitions)
         output = tournament._play_round_robin(cache_mutable=False)
-        self.assertEqual(output['payoff'], self.expected_payoff)
+        self.assertEqual(output['payoff'].tolist(), self.expected_payoff)
         self.assertEqual(tournament.deterministic_cache, {})
+
+    def test_play_round_robin_into_arrays(self):
+        tournament = axelrod.Tournament(
+            name=self.test_name,
+            players=self.players,
+            game=self.game,
+            turns=200,
+            repetitions=self.test_repetitions)
+        payoff = tournament._outcome['payoff'][2]
+        cooperation = tournament._outcome['cooperation'][2]
+        output = tournament._play_round_robin(
+            payoff=payoff, cooperation=cooperation)
+        self.assertIs(output['payoff'], payoff)
+        self.assertEqual(
+            tournament._outcome['payoff'][2].tolist(), self.expected_payoff)
+        self.assertEqual(
+            tournament._outcome['cooperation'][2].tolist(),
+            self.expected_cooperation)
@@ -1,3 +1,6 @@
+import os
+import shutil
+import tempfile
 import unittest
 import axelrod
 
@@ -51,15 +54,110 @@ class TestTournamentManager(unittest.TestCase):
         self.assertIsInstance(mgr._tournaments[0], axelrod.Tournament)
         self.assertEqual(mgr._tournaments[0].name, self.test_tournament_name)
 
-    def test_valid_cache(self):
+    def test_cache_shared_across_turns(self):
         mgr = axelrod.TournamentManager(
             output_directory=self.test_output_directory,
             with_ecological=self.test_with_ecological, load_cache=False)
-        mgr.add_tournament(
-                players=self.test_players, name=self.test_tournament_name)
-        self.assertTrue(mgr._valid_cache(200))
         mgr._deterministic_cache['test_key'] = 'test_value'
-        self.assertFalse(mgr._valid_cache(200))
-        mgr._cache_valid_for_turns = 500
-        self.assertFalse(mgr._valid_cache(200))
-        self.assertTrue(mgr._valid_cache(500))
+        for turns in (200, 500):
+            mgr.add_tournament(
+                players=self.test_players, name=self.test_tournament_name,
+                turns=turns)
+            mgr._start_tournament(mgr._tournaments[-1])
+            self.assertIs(
+                mgr._tournaments[-1].deterministic_cache,
+                mgr._deterministic_cache)
+
+    def test_cache_file(self):
+        directory = tempfile.mkdtemp()
+        cache_file = os.path.join(directory, 'cache.db')
+        try:
+            mgr = axelrod.TournamentManager(
+                output_directory=directory, with_ecological=False,
+                save_cache=True, cache_file=cache_file)
+            mgr.add_tournament(
+                players=self.test_players, name='first', turns=10,
+                repetitions=2)
+            mgr.run_tournaments()
+            # Results are in the file as soon as they are computed
+            self.assertEqual(len(mgr._deterministic_cache.store), 3)
+            mgr._deterministic_cache.store.close()
+
+            mgr = axelrod.TournamentManager(
+                output_directory=directory, with_ecological=False,
+                cache_file=cache_file)
+            self.assertEqual(mgr._deterministic_cache, {})
+            mgr.add_tournament(
+                players=self.test_players, name='second', turns=10,
+                repetitions=2)
+            mgr._start_tournament(mgr._tournaments[0])
+            self.assertEqual(len(mgr._deterministic_cache), 3)
+            mgr._deterministic_cache.store.close()
+        finally:
+            shutil.rmtree(directory)
+
+    def test_cache_file_not_found(self):
+        mgr = axelrod.TournamentManager(
+            output_directory=self.test_output_directory,
+            with_ecological=False, cache_file='./no_such_cache_file')
+        self.assertFalse(mgr.load_cache)
+        self.assertIsNone(mgr._deterministic_cache.store)
+
+    def test_run_pooled_tournaments(self):
+        output_directory = tempfile.mkdtemp()
+        try:
+            mgr = axelrod.TournamentManager(
+                output_directory=output_directory,
+                with_ecological=False, load_cache=False)
+            players = [axelrod.Cooperator(), axelrod.TitForTat(),
+                       axelrod.Defector()]
+            mgr.add_tournament(
+                players=players, name='first', turns=10, repetitions=3,
+                processes=2)
+            mgr.add_tournament(
+                players=players[1:], name='second', turns=10, repetitions=2)
+            mgr.add_tournament(
+                players=players, name='third', turns=10, repetitions=2,
+                processes=2)
+            pool = mgr._worker_pool()
+            self.assertIsInstance(pool, axelrod.worker_pool.WorkerPool)
+            self.assertEqual(pool.tournaments, mgr._tournaments)
+            mgr.run_tournaments()
+            for tournament in mgr._tournaments:
+                payoff_matrix = tournament.result_set.payoff_matrix
+                self.assertEqual(payoff_matrix[0][0], 3)
+                self.assertEqual(payoff_matrix[-1][-1], 1)
+                self.assertTrue(os.path.exists(os.path.join(
+                    output_directory, tournament.name + '.csv')))
+        finally:
+            shutil.rmtree(output_directory)
+
+    def test_pooled_cache_reuse(self):
+        output_directory = tempfile.mkdtemp()
+        try:
+            mgr = axelrod.TournamentManager(
+                output_directory=output_directory,
+                with_ecological=False, load_cache=False)
+            players = [axelrod.Cooperator(), axelrod.TitForTat(),
+                       axelrod.Defector()]
+            for name in ('first', 'second'):
+                mgr.add_tournament(
+                    players=players, name=name, turns=10, repetitions=2,
+                    processes=2)
+            submitted = []
+            for tournament in mgr._tournaments:
+                def submit(pool, index, submit=tournament._submit):
+                    submitted.append(submit(pool, index))
+                    return submitted[-1]
+                tournament._submit = submit
+            mgr.run_tournaments()
+            # The second tournament waits for the first and then finds all
+            # its matches in the cache.
+            self.assertGreater(submitted[0], 0)
+            self.assertEqual(submitted[1], 0)
+            self.assertEqual(
+                mgr._tournaments[1].result_set.payoff_matrix,
+                mgr._tournaments[0].result_set.payoff_matrix)
+        finally:
+            shutil.rmtree(output_directory)
+
@@ -0,0 +1,85 @@
+"""Tests for the lookup tables of deterministic strategies."""
+
+import random
+import unittest
+import axelrod
+from axelrod import transition_table
+from axelrod.transition_table import TransitionTable
+
+C, D = axelrod.Actions.C, axelrod.Actions.D
+
+
+class TestTransitionTable(unittest.TestCase):
+
+    def test_tit_for_tat(self):
+        table = transition_table.transition_table(axelrod.TitForTat())
+        self.assertEqual(table.memory, 1)
+        # The empty history, then CC, CD, DC and DD as (own, opponent)
+        self.assertEqual(list(table.moves), [0, 0, 1, 0, 1])
+        self.assertEqual(table.state([], []), 0)
+        self.assertEqual(table.state([C, D], [C, C]), 3)
+        self.assertEqual(table.next_state(0, 1, 0), 3)
+        self.assertEqual(table.next_state(3, 0, 1), 2)
+
+    def test_random_state(self):
+        # WinStayLoseShift draws random numbers without using them, so it
+        # must keep being asked for its moves.
+        transition_table._tables.clear()
+        random.seed(0)
+        state = random.getstate()
+        table = transition_table.transition_table(axelrod.WinStayLoseShift())
+        self.assertIsNone(table)
+        self.assertEqual(random.getstate(), state)
+
+    def test_seeded_tournament(self):
+        """Does a seeded tournament give the same results with and without
+        lookup tables?"""
+        results = []
+        original = transition_table.MAX_MEMORY_DEPTH
+        for maximum_depth in (original, -1):
+            transition_table.MAX_MEMORY_DEPTH = maximum_depth
+            try:
+                random.seed(2)
+                tournament = axelrod.Tournament(
+                    players=[axelrod.Alternator(), axelrod.WinStayLoseShift(),
+                             axelrod.TitForTat(), axelrod.Random(),
+                             axelrod.Joss()],
+                    turns=50, repetitions=2)
+                results.append(tournament.play().results)
+            finally:
+                transition_table.MAX_MEMORY_DEPTH = original
+        self.assertEqual(results[0], results[1])
+
+    def test_state(self):
+        table = TransitionTable(2, bytearray(21))
+        self.assertEqual(table.state([D], [C]), 1 + 2)
+        # The most recent joint move is the lowest digit
+        self.assertEqual(table.state([C, D, D], [D, C, D]), 5 + 3 + 4 * 2)
+        self.assertEqual(table.next_state(5 + 3 + 4 * 2, 1, 0), 5 + 2 + 4 * 3)
+        self.assertEqual(table.next_state(1 + 2, 1, 1), 5 + 3 + 4 * 2)
+
+    def test_not_compiled(self):
+        for player in [axelrod.Random(), axelrod.Grudger(),
+                       axelrod.GoByMajority(), axelrod.GoByMajority5(),
+                       axelrod.CyclerCCD()]:
+            self.assertIsNone(
+                transition_table.transition_table(player), msg=player)
+
+    def test_play_tables(self):
+        strategies = [axelrod.TitForTat, axelrod.TwoTitsForTat,
+                      axelrod.HardTitForTat, axelrod.Bully,
+                      axelrod.SuspiciousTitForTat, axelrod.Alternator]
+        for strategy1 in strategies:
+            for strategy2 in strategies:
+                player1, player2 = strategy1(), strategy2()
+                transition_table.play_tables(
+                    player1, player2,
+                    transition_table.transition_table(player1),
+                    transition_table.transition_table(player2), 100)
+                expected1, expected2 = strategy1(), strategy2()
+                for turn in range(100):
+                    expected1.play(expected2)
+                self.assertEqual(player1.history, expected1.history)
+                self.assertEqual(player2.history, expected2.history)
+                self.assertEqual(player1.defections, expected1.defections)
+                self.assertEqual(player2.cooperations, expected2.cooperations)
@@ -0,0 +1,54 @@
+"""Tests for the worker pool shared between tournaments."""
+
+import unittest
+import axelrod
+from axelrod.shared_outcome import SharedOutcome, shared_memory_available
+from axelrod.worker_pool import WorkerPool
+
+
+class TestWorkerPool(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tournaments = [
+            axelrod.Tournament(
+                players=[axelrod.Cooperator(), axelrod.Defector()],
+                turns=10, repetitions=2, processes=2),
+            axelrod.Tournament(
+                players=[axelrod.TitForTat(), axelrod.Defector()],
+                turns=20, repetitions=2, processes=2)]
+
+    def test_init(self):
+        pool = WorkerPool(self.tournaments, 2)
+        self.assertEqual(pool.tournaments, self.tournaments)
+        self.assertEqual(pool.workers, 2)
+        self.assertEqual(list(pool.results()), [])
+
+    def test_interleaved_tasks(self):
+        pool = WorkerPool(self.tournaments, 2)
+        pool.start()
+        pool.submit(0, [[(0, 0, 1)], [(1, 0, 1)]])
+        pool.submit(1, [[(0, 0, 1), (1, 1, 1)]])
+        results = sorted(pool.results())
+        pool.close()
+        self.assertEqual(results, [
+            (0, [(0, 0, 1, (0, 50), (10, 0))]),
+            (0, [(1, 0, 1, (0, 50), (10, 0))]),
+            (1, [(0, 0, 1, (19, 24), (1, 0)), (1, 1, 1, (20, 20), (0, 0))])])
+
+    @unittest.skipUnless(
+        shared_memory_available(), "shared memory is not available")
+    def test_shared_outcome(self):
+        tournament = self.tournaments[0]
+        shared = SharedOutcome.create(tournament._empty_outcome())
+        pool = WorkerPool(self.tournaments, 2)
+        pool.start()
+        pool.submit(0, [[(0, 0, 1)], [(None, 1, 1)]], shared.specification)
+        results = sorted(pool.results(), key=len)
+        pool.close()
+        self.assertEqual(
+            sorted(output for index, output in results),
+            [[], [(None, 1, 1, (10, 10), (0, 0))]])
+        self.assertEqual(shared.arrays['payoff'][0][1][0], 50)
+        self.assertEqual(shared.arrays['payoff'][1][1][1], 10)
+        shared.close()
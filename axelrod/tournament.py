@@ -3,9 +3,12 @@ from __future__ import absolute_import
 import logging
 import multiprocessing
 
+import numpy
+
 from .game import *
 from .result_set import *
 from .round_robin import *
+from .shared_outcome import SharedOutcome, shared_memory_available
 
 
 class Tournament(object):
@@ -13,7 +16,7 @@ class Tournament(object):
 
     def __init__(self, players, name='axelrod', game=None, turns=200,
                  repetitions=10, processes=None, prebuilt_cache=False,
-                 noise=0, with_morality=True):
+                 noise=0, with_morality=True, markov_mode=None):
         self.name = name
         self.turns = turns
         self.players = players
@@ -24,11 +27,11 @@ class Tournament(object):
         self.prebuilt_cache = prebuilt_cache
         self.deterministic_cache = {}
         self.noise = noise
+        self.markov_mode = markov_mode
         self._with_morality = with_morality
-        self._parallel_repetitions = repetitions
         self._processes = processes
         self._logger = logging.getLogger(__name__)
-        self._outcome = {'payoff': [], 'cooperation': []}
+        self._outcome = self._empty_outcome()
 
     @property
     def players(self):
@@ -43,14 +46,26 @@ class Tournament(object):
             newplayers.append(player)
         self._players = newplayers
 
+    def _empty_outcome(self):
+        """Preallocated (repetitions, n, n) arrays to hold the payoff and
+        cooperation of every player (row) against every opponent (column) in
+        every repetition."""
+        shape = (self.repetitions, self.nplayers, self.nplayers)
+        if self.markov_mode is None:
+            cooperation_dtype = numpy.int64
+        else:
+            cooperation_dtype = numpy.float64
+        return {'payoff': numpy.zeros(shape, dtype=numpy.float64),
+                'cooperation': numpy.zeros(shape, dtype=cooperation_dtype)}
+
     def play(self):
         if self._processes is None:
             self._run_serial_repetitions(self._outcome)
         else:
-            if self._build_cache_required():
-                self._build_cache(self._outcome)
             self._run_parallel_repetitions(self._outcome)
+        return self._build_result_set()
 
+    def _build_result_set(self):
         self.result_set = ResultSet(
             players=self.players,
             turns=self.turns,
@@ -65,20 +80,15 @@ class Tournament(object):
                 len(self.deterministic_cache) == 0 or
                 not self.prebuilt_cache))
 
-    def _build_cache(self, outcome):
-        self._logger.debug('Playing first round robin to build cache')
-        self._run_single_repetition(outcome)
-        self._parallel_repetitions -= 1
-
-    def _run_single_repetition(self, outcome):
-        output = self._play_round_robin()
-        outcome['payoff'].append(output['payoff'])
-        outcome['cooperation'].append(output['cooperation'])
+    def _run_single_repetition(self, outcome, repetition):
+        self._play_round_robin(
+            payoff=outcome['payoff'][repetition],
+            cooperation=outcome['cooperation'][repetition])
 
     def _run_serial_repetitions(self, outcome):
         self._logger.debug('Playing %d round robins' % self.repetitions)
         for repetition in range(self.repetitions):
-            self._run_single_repetition(outcome)
+            self._run_single_repetition(outcome, repetition)
         return True
 
     def _run_parallel_repetitions(self, outcome):
@@ -89,17 +99,142 @@ class Tournament(object):
         done_queue = multiprocessing.Queue()
         workers = self._n_workers()
 
-        for repetition in range(self._parallel_repetitions):
-            work_queue.put(repetition)
+        round_robin = self._round_robin(
+            cache_mutable=self._build_cache_required())
+        shared = self._share_outcome(outcome)
+        target = outcome if shared is None else shared.arrays
+        matches = self._schedule_matches(round_robin, target)
+        chunks = self._chunks(matches, workers)
+        for chunk in chunks:
+            work_queue.put(chunk)
 
         self._logger.debug(
-            'Playing %d round robins with %d parallel processes' %
-            (self._parallel_repetitions, workers))
-        self._start_workers(workers, work_queue, done_queue)
-        self._process_done_queue(workers, done_queue, outcome)
+            'Playing %d matches in %d tasks with %d parallel processes' %
+            (len(matches), len(chunks), workers))
+        specification = None if shared is None else shared.specification
+        self._start_workers(workers, work_queue, done_queue, specification)
+        self._process_done_queue(workers, done_queue, target, round_robin)
+        self._unshare_outcome(shared, outcome)
 
         return True
 
+    def _share_outcome(self, outcome):
+        """A copy of the outcome in shared memory for the workers to write
+        into, or None if shared memory is not available."""
+        if not shared_memory_available():
+            return None
+        return SharedOutcome.create(outcome)
+
+    @staticmethod
+    def _unshare_outcome(shared, outcome):
+        if shared is not None:
+            shared.copy_to(outcome)
+            shared.close()
+
+    def _submit(self, pool, index):
+        """
+        Schedules the matches of this tournament on a shared WorkerPool in
+        which it has the given index. Results are passed back through
+        _receive.
+
+        Returns
+        -------
+        integer
+            The number of tasks submitted (if zero the outcome is complete).
+        """
+        round_robin = self._round_robin(
+            cache_mutable=self._build_cache_required())
+        shared = self._share_outcome(self._outcome)
+        target = self._outcome if shared is None else shared.arrays
+        matches = self._schedule_matches(round_robin, target)
+        chunks = self._chunks(matches, pool.workers)
+        pool.submit(
+            index, chunks, None if shared is None else shared.specification)
+        self._pooled_run = {
+            'round_robin': round_robin,
+            'shared': shared,
+            'target': target,
+            'remaining': len(chunks)}
+        self._logger.debug(
+            'Submitted %d matches of %s tournament in %d tasks' %
+            (len(matches), self.name, len(chunks)))
+        if not chunks:
+            self._unshare_outcome(shared, self._outcome)
+        return len(chunks)
+
+    def _receive(self, output):
+        """Records the output of one task submitted by _submit and returns
+        whether the outcome is now complete."""
+        run = self._pooled_run
+        self._record_matches(run['target'], run['round_robin'], output)
+        run['remaining'] -= 1
+        if run['remaining']:
+            return False
+        self._unshare_outcome(run['shared'], self._outcome)
+        return True
+
+    def _schedule_matches(self, round_robin, outcome):
+        """
+        Fills in the outcome of every interaction held in the deterministic
+        cache and lists the matches which are left to play.
+
+        Interactions with the same outcome in every repetition (deterministic
+        or scored by their expected Markov outcome) are played only once, and
+        are listed with None in place of a repetition.
+
+        Returns
+        -------
+        list
+            (repetition, player1_index, player2_index) matches, with all the
+            matches of a pair adjacent.
+        """
+        matches = []
+        for player1_index in range(self.nplayers):
+            for player2_index in range(player1_index, self.nplayers):
+                pair = (player1_index, player2_index)
+                cached = round_robin._cached_outcome(*pair)
+                if cached is not None:
+                    self._update_repetitions(
+                        round_robin, outcome, pair, None, *cached)
+                elif round_robin._repeatable_interaction(*pair):
+                    matches.append((None,) + pair)
+                else:
+                    matches.extend(
+                        (repetition,) + pair
+                        for repetition in range(self.repetitions))
+        return matches
+
+    @staticmethod
+    def _chunks(matches, workers):
+        """
+        Splits the matches into tasks for the workers.
+
+        Tasks shrink as the queue empties (guided self-scheduling): early
+        tasks are large to keep the queue overhead low, while the small tasks
+        at the end let idle workers pick up the remaining matches so that all
+        of them finish at about the same time.
+        """
+        chunks = []
+        start = 0
+        while start < len(matches):
+            size = max(1, (len(matches) - start) // (2 * workers))
+            chunks.append(matches[start:start + size])
+            start += size
+        return chunks
+
+    def _update_repetitions(self, round_robin, outcome, pair, repetition,
+                            scores, cooperation_rates):
+        """Writes the result of a match into one repetition of the outcome,
+        or into every repetition if repetition is None."""
+        if repetition is None:
+            repetitions = range(self.repetitions)
+        else:
+            repetitions = [repetition]
+        for repetition in repetitions:
+            round_robin._update_matrices(
+                pair[0], pair[1], scores, outcome['payoff'][repetition],
+                cooperation_rates, outcome['cooperation'][repetition])
+
     def _n_workers(self):
         if (2 <= self._processes <= multiprocessing.cpu_count()):
             n_workers = self._processes
@@ -107,39 +242,87 @@ class Tournament(object):
             n_workers = multiprocessing.cpu_count()
         return n_workers
 
-    def _start_workers(self, workers, work_queue, done_queue):
+    def _start_workers(self, workers, work_queue, done_queue,
+                       specification=None):
         for worker in range(workers):
             process = multiprocessing.Process(
-                target=self._worker, args=(work_queue, done_queue))
+                target=self._worker,
+                args=(work_queue, done_queue, specification))
             work_queue.put('STOP')
             process.start()
         return True
 
-    @staticmethod
-    def _process_done_queue(workers, done_queue, outcome):
+    def _process_done_queue(self, workers, done_queue, outcome, round_robin):
         stops = 0
         while stops < workers:
             output = done_queue.get()
             if output == 'STOP':
                 stops += 1
             else:
-                outcome['payoff'].append(output['payoff'])
-                outcome['cooperation'].append(output['cooperation'])
+                self._record_matches(outcome, round_robin, output)
         return True
 
-    def _worker(self, work_queue, done_queue):
-        for repetition in iter(work_queue.get, 'STOP'):
-            output = self._play_round_robin(cache_mutable=False)
-            done_queue.put(output)
+    def _record_matches(self, outcome, round_robin, output):
+        """Records the results a worker sent back: those of matches standing
+        for every repetition are also added to the deterministic cache."""
+        for repetition, i, j, scores, cooperation_rates in output:
+            if repetition is None:
+                round_robin._cache_outcome(i, j, scores, cooperation_rates)
+            self._update_repetitions(
+                round_robin, outcome, (i, j), repetition, scores,
+                cooperation_rates)
+
+    def _worker(self, work_queue, done_queue, specification=None):
+        round_robin = self._round_robin(cache_mutable=False)
+        shared = None
+        if specification is not None:
+            shared = SharedOutcome.attach(specification)
+        for chunk in iter(work_queue.get, 'STOP'):
+            done_queue.put(self._play_matches(round_robin, chunk, shared))
+        if shared is not None:
+            shared.close()
         done_queue.put('STOP')
         return True
 
-    def _play_round_robin(self, cache_mutable=True):
-        round_robin = RoundRobin(
+    def _play_matches(self, round_robin, chunk, shared=None):
+        """
+        Plays a chunk of matches.
+
+        With a SharedOutcome the results are written straight into its arrays
+        and only those of matches standing for every repetition (which the
+        parent process needs for its cache) are returned; otherwise all the
+        results are returned to be recorded by the parent.
+        """
+        output = []
+        for repetition, i, j in chunk:
+            scores, cooperation_rates = (
+                round_robin._score_single_interaction(i, j))
+            if shared is not None:
+                self._update_repetitions(
+                    round_robin, shared.arrays, (i, j), repetition, scores,
+                    cooperation_rates)
+            if shared is None or repetition is None:
+                output.append((repetition, i, j, scores, cooperation_rates))
+        return output
+
+    def _round_robin(self, cache_mutable=True):
+        return RoundRobin(
             players=self.players,
             game=self.game,
             turns=self.turns,
             deterministic_cache=self.deterministic_cache,
             cache_mutable=cache_mutable,
-            noise=self.noise)
-        return round_robin.play()
+            noise=self.noise,
+            markov_mode=self.markov_mode)
+
+    def _play_round_robin(self, cache_mutable=True, payoff=None,
+                          cooperation=None):
+        """Plays one round robin, writing its payoff and cooperation into the
+        given n x n arrays (or new ones) which are returned in a dict."""
+        round_robin = self._round_robin(cache_mutable)
+        if payoff is None:
+            payoff = round_robin._empty_matrix(self.nplayers, self.nplayers)
+        if cooperation is None:
+            cooperation = round_robin._empty_matrix(
+                self.nplayers, self.nplayers, round_robin.cooperation_dtype)
+        return round_robin.play_into(payoff, cooperation)
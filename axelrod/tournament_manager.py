@@ -1,33 +1,37 @@
 from __future__ import absolute_import, unicode_literals, print_function
 
 import os
-import pickle
+import sqlite3
 
+from .deterministic_cache import CacheStore, DeterministicCache
 from .tournament import *
 from .plot import *
 from .ecosystem import *
 from .utils import *
+from .worker_pool import WorkerPool
 
 
 class TournamentManager(object):
 
     def __init__(self, output_directory, with_ecological,
                  pass_cache=True, load_cache=True, save_cache=False,
-                 cache_file='./cache.txt'):
+                 cache_file='./cache.txt', expected_ecology=False):
         self._tournaments = []
         self._ecological_variants = []
         self._logger = logging.getLogger(__name__)
         self._output_directory = output_directory
         self._with_ecological = with_ecological
+        self._expected_ecology = expected_ecology
         self._pass_cache = pass_cache
         self._save_cache = save_cache
         self._cache_file = cache_file
-        self._deterministic_cache = {}
-        self._cache_valid_for_turns = None
+        self._deterministic_cache = DeterministicCache()
         self._load_cache = False
 
         if load_cache and not save_cache:
             self.load_cache = self._load_cache_from_file(cache_file)
+        if save_cache:
+            self._start_cache_file(cache_file)
 
     @staticmethod
     def one_player_per_strategy(strategies):
@@ -48,30 +52,101 @@ class TournamentManager(object):
 
     def run_tournaments(self):
         t0 = time.time()
-        for tournament in self._tournaments:
-            self._run_single_tournament(tournament)
-        if self._save_cache and not tournament.noise:
-            self._save_cache_to_file(self._deterministic_cache, self._cache_file)
+        pool = self._worker_pool()
+        if pool is None:
+            for tournament in self._tournaments:
+                self._run_single_tournament(tournament)
+        else:
+            self._run_pooled_tournaments(pool)
+        if self._save_cache:
+            self._logger.debug(
+                'Saved cache with %d entries to %s' %
+                (len(self._deterministic_cache.store), self._cache_file))
         self._logger.info(timed_message('Finished all tournaments', t0))
 
+    def _worker_pool(self):
+        """A WorkerPool shared by all the parallel tournaments, large enough
+        for the most demanding of them, or None if all are serial."""
+        workers = [tournament._n_workers() for tournament in self._tournaments
+                   if tournament._processes is not None]
+        if not workers:
+            return None
+        return WorkerPool(self._tournaments, max(workers))
+
+    def _run_pooled_tournaments(self, pool):
+        """
+        Runs every tournament, with the matches of all the parallel ones
+        interleaved on one pool of workers which is started only once.
+
+        Serial tournaments are played in the meantime by this process. A
+        tournament which could take matches from the cache entries of an
+        unfinished one waits for it, so that, as when they are run one after
+        the other, those matches are not played again.
+        """
+        pool.start()
+        try:
+            start_times = {}
+            # The cache keys of the unfinished pooled tournaments
+            pending = {}
+            for index, tournament in enumerate(self._tournaments):
+                keys = self._shared_cache_keys(tournament)
+                while any(keys & other for other in pending.values()):
+                    self._receive_pooled(pool, pending, start_times)
+                if tournament._processes is None:
+                    self._run_single_tournament(tournament)
+                    continue
+                start_times[index] = self._start_tournament(tournament)
+                if tournament._submit(pool, index):
+                    pending[index] = keys
+                else:
+                    tournament._build_result_set()
+                    self._finish_tournament(tournament, start_times[index])
+            while pending:
+                self._receive_pooled(pool, pending, start_times)
+        finally:
+            pool.close()
+
+    def _receive_pooled(self, pool, pending, start_times):
+        """Records the next output of the pool, finishing its tournament if
+        that was its last task."""
+        index, output = next(pool.results())
+        tournament = self._tournaments[index]
+        if tournament._receive(output):
+            del pending[index]
+            tournament._build_result_set()
+            self._finish_tournament(tournament, start_times[index])
+
+    def _shared_cache_keys(self, tournament):
+        """The cache keys through which a tournament shares results with
+        the others (none if it is noisy or the cache is not passed)."""
+        if tournament.noise or not self._pass_cache:
+            return set()
+        return set(self._cache_keys(tournament))
+
     def _run_single_tournament(self, tournament):
+        t0 = self._start_tournament(tournament)
+        tournament.play()
+        self._finish_tournament(tournament, t0)
+
+    def _start_tournament(self, tournament):
         self._logger.info(
             'Starting %s tournament with %d round robins of %d turns per pair.'
             % (tournament.name, tournament.repetitions, tournament.turns))
 
         t0 = time.time()
 
-        if not tournament.noise and self._pass_cache and self._valid_cache(tournament.turns):
+        # Cache keys include the number of turns and the game, so one cache
+        # can be shared by every tournament.
+        if not tournament.noise and self._pass_cache:
+            self._deterministic_cache.load(self._cache_keys(tournament))
             self._logger.debug('Passing cache with %d entries to %s tournament' %
                             (len(self._deterministic_cache), tournament.name))
             tournament.deterministic_cache = self._deterministic_cache
             if self._load_cache:
                 tournament.prebuilt_cache = True
-        else:
-            self._logger.debug('Cache is not valid for %s tournament' %
-                            tournament.name)
-        tournament.play()
+        return t0
 
+    def _finish_tournament(self, tournament, t0):
         self._logger.debug(timed_message('Finished %s tournament' % tournament.name, t0))
 
         if self._with_ecological:
@@ -81,7 +156,6 @@ class TournamentManager(object):
             ecosystem = None
 
         self._generate_output_files(tournament, ecosystem)
-        self._cache_valid_for_turns = tournament.turns
 
         self._logger.debug('Cache now has %d entries' %
                         len(self._deterministic_cache))
@@ -89,10 +163,14 @@ class TournamentManager(object):
         self._logger.info(
             timed_message('Finished all %s tasks' % tournament.name, t0))
 
-    def _valid_cache(self, turns):
-        return ((len(self._deterministic_cache) == 0) or
-                (len(self._deterministic_cache) > 0) and
-                turns == self._cache_valid_for_turns)
+    @staticmethod
+    def _cache_keys(tournament):
+        """The deterministic cache keys of every pair of players in a
+        tournament."""
+        round_robin = tournament._round_robin()
+        players = tournament.players
+        return [round_robin._cache_key(players[i], players[j])
+                for i in range(len(players)) for j in range(i, len(players))]
 
     def run_ecological_variant(self, tournament, ecosystem):
         self._logger.debug(
@@ -104,7 +182,13 @@ class TournamentManager(object):
             'strategies': 1000,
             'all_strategies': 10,
         }
-        ecosystem.reproduce(ecoturns.get(tournament.name))
+        turns = ecoturns.get(tournament.name)
+        if self._expected_ecology:
+            turns = ecosystem.reproduce_expected(turns)
+            self._logger.debug('Ecological variant of %s stopped after %d turns'
+                               % (tournament.name, turns))
+        else:
+            ecosystem.reproduce(turns)
         self._logger.debug(
             timed_message('Finished ecological variant of %s' % tournament.name, t0))
 
@@ -148,31 +232,26 @@ class TournamentManager(object):
         figure.clf()
         plt.close(figure)
 
-    def _save_cache_to_file(self, cache, file_name):
-        self._logger.debug(
-            'Saving cache with %d entries to %s' % (len(cache), file_name))
-        deterministic_cache = DeterministicCache(
-            cache, self._cache_valid_for_turns)
-        with open(file_name, 'wb') as io:
-            pickle.dump(deterministic_cache, io)
+    def _start_cache_file(self, file_name):
+        """Replaces the cache file with an empty store, to which the results
+        are written as soon as they are computed."""
+        self._logger.debug('Saving cache to %s' % file_name)
+        self._deterministic_cache.store = CacheStore.create(file_name)
         return True
 
     def _load_cache_from_file(self, file_name):
+        """Opens the cache file so that each tournament can load the entries
+        it needs."""
+        if not os.path.exists(file_name):
+            self._logger.debug('Cache file not found. Starting with empty cache')
+            return False
         try:
-            with open(file_name, 'rb') as io:
-                deterministic_cache = pickle.load(io)
-            self._deterministic_cache = deterministic_cache.cache
-            self._cache_valid_for_turns = deterministic_cache.turns
+            store = CacheStore(file_name)
+        except (ValueError, sqlite3.DatabaseError) as error:
             self._logger.debug(
-                'Loaded cache with %d entries' % len(self._deterministic_cache))
-            return True
-        except IOError:
-            self._logger.debug('Cache file not found. Starting with empty cache')
+                'Cache file not usable (%s). Starting with empty cache' %
+                error)
             return False
-
-
-class DeterministicCache(object):
-
-    def __init__(self, cache, turns):
-        self.cache = cache
-        self.turns = turns
+        self._deterministic_cache.store = store
+        self._logger.debug('Opened cache with %d entries' % len(store))
+        return True
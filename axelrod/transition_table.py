@@ -0,0 +1,171 @@
+"""
+Lookup tables for deterministic strategies with a short memory.
+
+A strategy whose next move depends only on the last k joint moves can be
+compiled, by asking it for its move after every possible joint history of
+at most k moves, into a table indexed by an integer encoding of that recent
+history. Matches between two compiled strategies are then played with one
+table lookup per player per turn, without calling strategy().
+
+The joint history of the last l <= k moves is encoded, from the point of
+view of one player, as offset(l) + sum of 4 ** i * (2 * own + opponent) over
+those moves (the most recent having i = 0), where own and opponent are the
+codes of the moves (0 for C, 1 for D) and offset(l) = (4 ** l - 1) / 3 is
+the number of histories shorter than l.
+"""
+
+import random
+
+from axelrod import Actions
+from . import cycles
+from .player import Player, update_histories
+
+C, D = Actions.C, Actions.D
+
+# Compiling takes (4 ** (k + 1) - 1) / 3 calls to strategy(), so longer
+# memories are left to axelrod.cycles.
+MAX_MEMORY_DEPTH = 4
+
+_CODES = {C: 0, D: 1}
+_MOVES = (C, D)
+
+# The table (or None) of each configuration of a strategy.
+_tables = {}
+
+
+class TransitionTable(object):
+    """The moves of a strategy after every joint history of at most memory
+    moves, indexed as described in the module docstring, and the index
+    reached from each entry after each of the four joint moves."""
+
+    def __init__(self, memory, moves):
+        self.memory = memory
+        self.moves = moves
+        self.transitions = []
+        for length in range(memory + 1):
+            for code in range(4 ** length):
+                for joint in range(4):
+                    if length < memory:
+                        following = _offset(length + 1) + 4 * code + joint
+                    else:
+                        following = _offset(length) + (
+                            (4 * code + joint) % 4 ** memory)
+                    self.transitions.append(following)
+
+    def state(self, own_history, opponent_history):
+        """The index of the table entry for the given histories."""
+        length = min(len(own_history), self.memory)
+        code = 0
+        for i in range(length):
+            code += 4 ** i * (2 * _CODES[own_history[-i - 1]] +
+                              _CODES[opponent_history[-i - 1]])
+        return _offset(length) + code
+
+    def next_state(self, state, own_move, opponent_move):
+        """The index after a turn on which the moves with the given codes
+        were played."""
+        return self.transitions[4 * state + 2 * own_move + opponent_move]
+
+
+def _offset(length):
+    """The number of joint histories shorter than length."""
+    return (4 ** length - 1) // 3
+
+
+def transition_table(player):
+    """
+    The compiled table of a player, or None if it cannot be compiled: only
+    deterministic players which respect a memory depth of at most
+    MAX_MEMORY_DEPTH (see axelrod.cycles.finite_memory) can be, and the
+    table must then predict the player's moves against scripted opponents.
+    Players drawing random numbers are never compiled (finite_memory rejects
+    them), since a match played from tables would skip their draws.
+    """
+    if (not cycles.finite_memory(player) or
+            player.classifier['memory_depth'] > MAX_MEMORY_DEPTH):
+        return None
+    key = (player.__class__, cycles.hashable(player.init_args),
+           player.classifier['memory_depth'],
+           player.tournament_attributes['length'])
+    if key not in _tables:
+        # Compiling calls the strategy, which may draw random numbers: the
+        # random state is restored so that seeded tournaments are repeatable.
+        state = random.getstate()
+        try:
+            _tables[key] = _compile(player)
+        finally:
+            random.setstate(state)
+    return _tables[key]
+
+
+def _compile(player):
+    memory = int(player.classifier['memory_depth'])
+    moves = bytearray()
+    for length in range(memory + 1):
+        for code in range(4 ** length):
+            own_history, opponent_history = [], []
+            # Digits from the oldest move, as laid out in the module docstring.
+            for i in reversed(range(length)):
+                joint = (code // 4 ** i) % 4
+                own_history.append(_MOVES[joint // 2])
+                opponent_history.append(_MOVES[joint % 2])
+            clone, opponent = player.clone(), Player()
+            for own_move, opponent_move in zip(own_history, opponent_history):
+                update_histories(clone, opponent, own_move, opponent_move)
+            moves.append(_CODES[clone.strategy(opponent)])
+    table = TransitionTable(memory, moves)
+    if not _predicts(table, player):
+        return None
+    return table
+
+
+def _predicts(table, player):
+    """Whether the table gives the moves of the player against the scripted
+    opponents of axelrod.cycles."""
+    for script in cycles.opponent_scripts(table.memory):
+        clone, opponent = player.clone(), Player()
+        state = 0
+        for opponent_move in script:
+            move = clone.strategy(opponent)
+            if _CODES[move] != table.moves[state]:
+                return False
+            update_histories(clone, opponent, move, opponent_move)
+            state = table.next_state(
+                state, _CODES[move], _CODES[opponent_move])
+    return True
+
+
+def play_tables(player1, player2, table1, table2, turns):
+    """
+    Plays a match of the given number of turns between two players with the
+    given tables, which should start with empty histories. The moves are
+    added to the histories (and counts of cooperations and defections) of
+    the players, whose strategy methods are not called.
+
+    Once the pair of table entries repeats, so does the play in between, and
+    the remaining turns are filled in by repeating it.
+    """
+    moves1, moves2 = table1.moves, table2.moves
+    transitions1, transitions2 = table1.transitions, table2.transitions
+    state1, state2 = 0, 0
+    played1, played2 = [], []
+    seen = {}
+    turn = 0
+    while turn < turns:
+        pair = (state1, state2)
+        if pair in seen:
+            break
+        seen[pair] = turn
+        move1, move2 = moves1[state1], moves2[state2]
+        played1.append(_MOVES[move1])
+        played2.append(_MOVES[move2])
+        state1 = transitions1[4 * state1 + 2 * move1 + move2]
+        state2 = transitions2[4 * state2 + 2 * move2 + move1]
+        turn += 1
+    for player, played in ((player1, played1), (player2, played2)):
+        player.history.extend(played)
+        if turn < turns:
+            player.history.repeat_tail(turn - seen[pair], turns - turn)
+        player.cooperations = player.history.count(C)
+        player.defections = player.history.count(D)
+    return turn
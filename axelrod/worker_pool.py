@@ -0,0 +1,86 @@
+from __future__ import absolute_import
+
+import multiprocessing
+
+from .shared_outcome import SharedOutcome, share_resource_tracker
+
+
+class WorkerPool(object):
+    """
+    A set of long lived worker processes which play matches for any number of
+    tournaments.
+
+    The workers are forked once, after all the tournaments have been created,
+    and then take tasks from a single queue. Each task is tagged with the
+    index of its tournament so that tasks from several tournaments can be
+    interleaved and their results routed back to the right tournament.
+    """
+
+    def __init__(self, tournaments, workers):
+        """
+        Parameters
+        ----------
+        tournaments : list
+            The tournaments whose matches may be submitted, indexed by
+            position.
+        workers : integer
+            The number of worker processes.
+        """
+        self.tournaments = tournaments
+        self.workers = workers
+        self._work_queue = multiprocessing.Queue()
+        self._done_queue = multiprocessing.Queue()
+        self._outstanding = 0
+        self._processes = []
+
+    def start(self):
+        # As in Tournament, Processes are used rather than a Pool so that the
+        # target can be an instance method.
+        share_resource_tracker()
+        for worker in range(self.workers):
+            process = multiprocessing.Process(target=self._worker)
+            process.start()
+            self._processes.append(process)
+        return True
+
+    def submit(self, index, chunks, specification=None):
+        """Queues chunks of (repetition, player1, player2) matches for the
+        tournament with the given index, whose results are written into the
+        SharedOutcome with the given specification if there is one."""
+        for chunk in chunks:
+            self._work_queue.put((index, chunk, specification))
+        self._outstanding += len(chunks)
+
+    def results(self):
+        """Yields (index, output) for every submitted chunk as it is
+        played, in the order in which they finish."""
+        while self._outstanding:
+            index, output = self._done_queue.get()
+            self._outstanding -= 1
+            yield index, output
+
+    def close(self):
+        for process in self._processes:
+            self._work_queue.put('STOP')
+        for process in self._processes:
+            process.join()
+        self._processes = []
+        return True
+
+    def _worker(self):
+        round_robins = {}
+        shared_outcomes = {}
+        for index, chunk, specification in iter(self._work_queue.get, 'STOP'):
+            tournament = self.tournaments[index]
+            if index not in round_robins:
+                round_robins[index] = tournament._round_robin(
+                    cache_mutable=False)
+                if specification is not None:
+                    shared_outcomes[index] = SharedOutcome.attach(
+                        specification)
+            output = tournament._play_matches(
+                round_robins[index], chunk, shared_outcomes.get(index))
+            self._done_queue.put((index, output))
+        for shared in shared_outcomes.values():
+            shared.close()
+        return True